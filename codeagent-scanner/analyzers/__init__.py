@@ -1,8 +1,21 @@
 """Initialize analyzers package and register all analyzers."""
 
-# Import all analyzer implementations to register them
-from .semgrep_runner import SemgrepAnalyzer
-from .bandit_runner import BanditAnalyzer
-from .depcheck_runner import DepCheckAnalyzer
+from .base import analyzer_registry
 
-# The analyzers are automatically registered when imported
\ No newline at end of file
+# Analyzer modules are imported on first use rather than at package import
+analyzer_registry.register_lazy("semgrep", ".semgrep_runner:SemgrepAnalyzer")
+analyzer_registry.register_lazy("bandit", ".bandit_runner:BanditAnalyzer")
+analyzer_registry.register_lazy("depcheck", ".depcheck_runner:DepCheckAnalyzer")
+
+_ANALYZER_CLASSES = {
+    "SemgrepAnalyzer": "semgrep",
+    "BanditAnalyzer": "bandit",
+    "DepCheckAnalyzer": "depcheck",
+}
+
+
+def __getattr__(name):
+    """Keep `from analyzers import BanditAnalyzer` working without eager imports."""
+    if name in _ANALYZER_CLASSES:
+        return analyzer_registry._resolve(_ANALYZER_CLASSES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,29 +1,245 @@
 """Bandit security analyzer runner for Python code."""
 
-import json
+import asyncio
+import atexit
+import functools
+import importlib.metadata
+import importlib.util
+import io
 import os
 import subprocess
-import tempfile
+import sys
+import threading
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, FrozenSet, Optional, Tuple
 
-from .base import BaseAnalyzer, AnalyzerResult, Issue, Severity, analyzer_registry
+import ijson
+import orjson
+
+from .base import BaseAnalyzer, AnalyzerResult, Issue, CRITICAL, HIGH, MEDIUM, LOW, analyzer_registry, dumps, run_async, workspace_digest
+
+
+# Persistent workers and in-process scans need Bandit importable by this
+# interpreter; otherwise every scan falls back to the bandit CLI
+BANDIT_IMPORTABLE = importlib.util.find_spec("bandit") is not None
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bandit_worker.py')
+
+
+# Below this many Python files per shard, extra Bandit processes cost more than they save
+MIN_FILES_PER_SHARD: int = 50
+
+
+# Map Bandit severity to our canonical severity strings
+BANDIT_SEVERITY_MAP: Dict[str, str] = {
+    'LOW': LOW,
+    'MEDIUM': MEDIUM,
+    'HIGH': HIGH
+}
+
+# HIGH findings from these tests are escalated to CRITICAL
+CRITICAL_TESTS: FrozenSet[str] = frozenset({
+    'B102',  # exec_used
+    'B103',  # set_bad_file_permissions
+    'B104',  # hardcoded_bind_all_interfaces
+    'B105',  # hardcoded_password_string
+    'B106',  # hardcoded_password_funcarg
+    'B107',  # hardcoded_password_default
+    'B108',  # hardcoded_tmp_directory
+    'B201',  # flask_debug_true
+    'B501',  # request_with_no_cert_validation
+    'B502',  # ssl_with_bad_version
+    'B503',  # ssl_with_bad_defaults
+    'B504',  # ssl_with_no_version
+    'B505',  # weak_cryptographic_key
+    'B506',  # yaml_load
+    'B601',  # paramiko_calls
+    'B602',  # subprocess_popen_with_shell_equals_true
+    'B603',  # subprocess_without_shell_equals_true
+    'B604',  # any_other_function_with_shell_equals_true
+    'B605',  # start_process_with_a_shell
+    'B606',  # start_process_with_no_shell
+    'B607',  # start_process_with_partial_path
+    'B608',  # hardcoded_sql_expressions
+    'B609',  # linux_commands_wildcard_injection
+    'B701',  # jinja2_autoescape_false
+    'B702',  # use_of_mako_templates
+    'B703'   # django_mark_safe
+})
+
+# (test ID, severity) -> escalated severity, so escalation is one dict probe
+SEVERITY_UPGRADE_MAP: Dict[Tuple[str, str], str] = {
+    (test_id, HIGH): CRITICAL for test_id in CRITICAL_TESTS
+}
+
+# Directories that never contain first-party Python sources
+SKIP_DIRS: FrozenSet[str] = frozenset({'__pycache__', 'venv', '.venv'})
+
+# Analyzer confidence level -> Bandit confidence ranking
+CONFIDENCE_LEVELS: Dict[str, str] = {
+    'low': 'LOW',
+    'medium': 'MEDIUM',
+    'high': 'HIGH'
+}
+
+
+@functools.lru_cache(maxsize=128)
+def _workspace_has_python(workspace_path: str, digest: int) -> bool:
+    """Search the workspace for a Python file, stopping at the first hit.
+    
+    ``digest`` is only part of the cache key, so a changed workspace is re-searched.
+    """
+    # Iterative DFS over scandir entries; DirEntry caches its type, so unlike
+    # os.walk there is no extra stat per entry and no listing of unused subtrees
+    stack = [workspace_path]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    # Skip common ignore directories
+                    if not entry.name.startswith('.') and entry.name not in SKIP_DIRS:
+                        stack.append(entry.path)
+                elif entry.name.endswith(('.py', '.pyw')) and entry.is_file():
+                    return True
+    return False
+
+
+class BanditWorker:
+    """A persistent bandit_worker.py process that serves one scan at a time."""
+    
+    def __init__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE
+        )
+    
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+    
+    def scan(self, request: Dict[str, Any], timeout_sec: int) -> bytes:
+        """Send one scan request and return the worker's raw JSON response."""
+        timed_out = threading.Event()
+        
+        def kill():
+            timed_out.set()
+            self.process.kill()
+        
+        # Killing an overrunning worker closes its stdout, which unblocks readline()
+        watchdog = threading.Timer(timeout_sec, kill)
+        watchdog.start()
+        try:
+            self.process.stdin.write(dumps(request) + b"\n")
+            self.process.stdin.flush()
+            response = self.process.stdout.readline()
+        finally:
+            watchdog.cancel()
+        
+        if not response:
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(self.process.args, timeout_sec)
+            raise RuntimeError(f"Bandit worker exited with code {self.process.wait()}")
+        return response
+    
+    def close(self):
+        """Stop the worker, killing it if it doesn't exit promptly."""
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=5)
+        except Exception:
+            self.process.kill()
+            self.process.wait()
+
+
+class BanditWorkerPool:
+    """Pool of persistent Bandit workers shared by all BanditAnalyzer instances.
+    
+    Workers are started on demand, so concurrent scans (e.g. shards) each get
+    their own worker; up to ``max_idle`` are kept alive for later scans.
+    """
+    
+    def __init__(self, max_idle: int):
+        self.max_idle = max_idle
+        self._idle: List[BanditWorker] = []
+        self._lock = threading.Lock()
+    
+    def scan(self, request: Dict[str, Any], timeout_sec: int) -> bytes:
+        """Run a scan on an idle (or new) worker."""
+        worker = self._acquire()
+        try:
+            response = worker.scan(request, timeout_sec)
+        except BaseException:
+            # Never reuse a worker in an unknown state
+            worker.close()
+            raise
+        self._release(worker)
+        return response
+    
+    def close(self):
+        """Stop all idle workers."""
+        with self._lock:
+            workers, self._idle = self._idle, []
+        for worker in workers:
+            worker.close()
+    
+    def _acquire(self) -> BanditWorker:
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.alive:
+                    return worker
+        return BanditWorker()
+    
+    def _release(self, worker: BanditWorker):
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append(worker)
+                return
+        worker.close()
+
+
+_worker_pool: Optional[BanditWorkerPool] = None
+_worker_pool_lock = threading.Lock()
+
+
+def get_worker_pool() -> BanditWorkerPool:
+    """Get the process-wide Bandit worker pool, creating it on first use."""
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is None:
+            _worker_pool = BanditWorkerPool(max_idle=os.cpu_count() or 4)
+            atexit.register(_worker_pool.close)
+        return _worker_pool
 
 
 class BanditAnalyzer(BaseAnalyzer):
     """Bandit static analysis security scanner for Python."""
     
-    def __init__(self, timeout_sec: int = 300, confidence_level: str = "low"):
+    name = "bandit"
+    
+    def __init__(self, timeout_sec: int = 300, confidence_level: str = "low", jobs: Optional[int] = None,
+                 use_workers: bool = True, in_process: bool = False):
         super().__init__(timeout_sec)
         self.confidence_level = confidence_level  # low, medium, high
-        
-    @property
-    def name(self) -> str:
-        return "bandit"
+        self.jobs = jobs or os.cpu_count() or 4  # Parallel Bandit processes
+        self.use_workers = use_workers and BANDIT_IMPORTABLE  # Persistent workers instead of the CLI
+        # Opt-in: unsharded scans via Bandit's Python API in the calling thread,
+        # with no timeout; by default they go to a worker like any shard
+        self.in_process = in_process and BANDIT_IMPORTABLE
     
-    @property 
+    @functools.cached_property
     def version(self) -> str:
-        """Get Bandit version."""
+        """Get Bandit version.
+        
+        Bandit is installed alongside the scanner, so its package metadata is
+        read in-process; ``bandit --version`` is only spawned as a fallback.
+        """
+        try:
+            return importlib.metadata.version("bandit")
+        except importlib.metadata.PackageNotFoundError:
+            pass
+        
         try:
             result = subprocess.run(
                 ["bandit", "--version"],
@@ -41,63 +257,39 @@ class BanditAnalyzer(BaseAnalyzer):
         except Exception:
             return "unknown"
     
-    def is_applicable(self, workspace_path: str) -> bool:
+    def is_applicable(self, workspace_path: str, file_info: Optional[Dict[str, Any]] = None) -> bool:
         """Check if Bandit should run on this workspace."""
-        # Look for Python files
+        # Look for Python files (memoized per workspace state)
         try:
-            for root, dirs, files in os.walk(workspace_path):
-                # Skip common ignore directories
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['__pycache__', 'venv', '.venv']]
-                
-                for file in files:
-                    if file.endswith(('.py', '.pyw')):
-                        return True
-            return False
+            return _workspace_has_python(workspace_path, workspace_digest(workspace_path))
         except Exception as e:
             self.logger.error(f"Error checking workspace applicability: {e}")
             return False
     
-    def run_analysis(self, workspace_path: str, **kwargs) -> AnalyzerResult:
+    def run_analysis(self, workspace_path: str, file_info: Optional[Dict[str, Any]] = None, **kwargs) -> AnalyzerResult:
         """Run Bandit analysis on Python files in the workspace."""
         start_time = time.time()
         issues = []
         error_message = None
         
         try:
-            # Create temporary file for output
-            with tempfile.NamedTemporaryFile(mode='w+', suffix='.json', delete=False) as tmp_file:
-                output_file = tmp_file.name
+            # Bandit itself is single-process, so large workspaces are split
+            # into shards that are scanned by parallel Bandit processes
+            shards = self._shard_python_files(workspace_path)
+            if not shards and self.in_process:
+                # Skips the worker and the JSON round trip, but the scan
+                # can't be timed out; only used when explicitly enabled
+                shard_results = [self._run_bandit_in_process(workspace_path)]
+            else:
+                shard_results = run_async(self._run_bandit_shards(shards, workspace_path))
             
-            # Build Bandit command
-            cmd = [
-                "bandit",
-                "-r",  # Recursive
-                "-f", "json",  # JSON format
-                "-o", output_file,  # Output file
-                "-l",  # Report all severity levels (low, medium, high)
-                workspace_path
-            ]
-            
-            # Add confidence level filter
-            if self.confidence_level in ["medium", "high"]:
-                cmd.extend(["-i", "-I"])  # Include confidence levels
-            
-            self.logger.info(f"Running Bandit with command: {' '.join(cmd)}")
-            
-            # Run Bandit
-            result = self._run_command(cmd, workspace_path, capture_output=True)
-            
-            # Parse results
-            if os.path.exists(output_file):
-                issues = self._parse_bandit_output(output_file, workspace_path)
-                os.unlink(output_file)  # Clean up temp file
-            
-            # Bandit returns 1 when issues are found, which is expected
-            success = result.returncode in [0, 1]  # 0 = no issues, 1 = issues found
-            
-            if result.returncode > 1:
-                error_message = f"Bandit failed with code {result.returncode}: {result.stderr}"
-                success = False
+            success = True
+            for shard_error, shard_issues in shard_results:
+                issues.extend(shard_issues)
+                
+                if shard_error:
+                    error_message = shard_error
+                    success = False
             
         except subprocess.TimeoutExpired:
             error_message = f"Bandit analysis timed out after {self.timeout_sec} seconds"
@@ -105,13 +297,6 @@ class BanditAnalyzer(BaseAnalyzer):
         except Exception as e:
             error_message = f"Bandit analysis failed: {str(e)}"
             success = False
-        finally:
-            # Clean up temp file if it exists
-            if 'output_file' in locals() and os.path.exists(output_file):
-                try:
-                    os.unlink(output_file)
-                except Exception:
-                    pass
         
         duration_ms = int((time.time() - start_time) * 1000)
         
@@ -123,38 +308,171 @@ class BanditAnalyzer(BaseAnalyzer):
             error_message=error_message
         )
     
-    def _parse_bandit_output(self, output_file: str, workspace_path: str) -> List[Issue]:
-        """Parse Bandit JSON output into normalized Issues."""
+    async def _run_bandit_shards(self, shards: List[List[str]], workspace_path: str) -> List[Tuple[Optional[str], List[Issue]]]:
+        """Run one Bandit process per shard concurrently on the current event loop.
+        
+        Returns an (error message or None, issues) pair per shard.
+        """
+        if len(shards) <= 1:
+            return [await self._run_bandit([workspace_path], workspace_path, recursive=True)]
+        
+        self.logger.info(f"Running Bandit in {len(shards)} parallel shards")
+        return await asyncio.gather(*(
+            self._run_bandit(targets, workspace_path, recursive=False)
+            for targets in shards
+        ))
+    
+    async def _run_bandit(self, targets: List[str], workspace_path: str, recursive: bool) -> Tuple[Optional[str], List[Issue]]:
+        """Run a single Bandit scan over the given targets and parse its output."""
+        if self.use_workers:
+            return await self._run_bandit_worker(targets, workspace_path, recursive)
+        
+        # Build Bandit command; the JSON report goes to stdout, so no temp file is needed
+        cmd = ["bandit"]
+        if recursive:
+            cmd.append("-r")  # Recursive
+        cmd.extend([
+            "-q",  # Quiet: keeps the progress bar out of stdout
+            "-f", "json",  # JSON format
+            "-l",  # Report all severity levels (low, medium, high)
+        ])
+        
+        # Add confidence level filter
+        if self.confidence_level in ["medium", "high"]:
+            cmd.extend(["--confidence-level", self.confidence_level])
+        
+        cmd.extend(targets)
+        
+        self.logger.info(f"Running Bandit on {len(targets)} target(s)")
+        self.logger.debug(f"Running Bandit with command: {' '.join(cmd)}")
+        
+        # Run Bandit
+        result = await self._run_command_async(cmd, workspace_path, text=False)
+        
+        # Parse results
         issues = []
+        if result.stdout:
+            issues = self._parse_bandit_stdout(result.stdout, workspace_path)
         
-        try:
-            with open(output_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+        # Bandit returns 1 when issues are found, which is expected
+        # 0 = no issues, 1 = issues found
+        if result.returncode > 1:
+            return f"Bandit failed with code {result.returncode}: {self._decode_output(result.stderr)}", issues
+        
+        return None, issues
+    
+    async def _run_bandit_worker(self, targets: List[str], workspace_path: str, recursive: bool) -> Tuple[Optional[str], List[Issue]]:
+        """Run a Bandit scan on a persistent worker from the shared pool."""
+        request = {
+            "targets": [os.path.abspath(target) for target in targets],
+            "recursive": recursive,
+            "severity": "LOW",  # Report all severity levels (low, medium, high)
+            "confidence": CONFIDENCE_LEVELS.get(self.confidence_level, "LOW")
+        }
+        
+        self.logger.info(f"Running Bandit worker on {len(targets)} target(s)")
+        
+        response = await asyncio.to_thread(get_worker_pool().scan, request, self.timeout_sec)
+        
+        # The worker answers {"error": ...} instead of a report when a scan fails
+        if response.startswith(b'{"error"'):
+            return f"Bandit worker failed: {orjson.loads(response)['error']}", []
+        
+        return None, self._parse_bandit_stdout(response, workspace_path)
+    
+    def _run_bandit_in_process(self, workspace_path: str) -> Tuple[Optional[str], List[Issue]]:
+        """Scan the workspace with Bandit's Python API in this process.
+        
+        Issues are built straight from Bandit's issue objects. The scan can't
+        be interrupted, so ``timeout_sec`` is not enforced in this mode, and
+        Bandit's manager keeps global state, so concurrent in-process scans
+        are not safe; that is why this mode is opt-in (``in_process=True``).
+        """
+        from bandit.core import docs_utils
+        from .bandit_worker import run_manager
+        
+        self.logger.info("Running Bandit in-process")
+        
+        mgr = run_manager({"targets": [os.path.abspath(workspace_path)], "recursive": True})
+        
+        prefix = self._workspace_prefix(workspace_path)
+        issues = []
+        for b_issue in mgr.get_issue_list("LOW", CONFIDENCE_LEVELS.get(self.confidence_level, "LOW")):
+            # test_id is a plugin constant, already shared by every issue of that test
+            issues.append(Issue(
+                tool="bandit",
+                type=b_issue.test_id,
+                message=b_issue.text,
+                severity=self._map_bandit_severity(b_issue.severity, b_issue.test_id),
+                file=self._normalize_file_path(b_issue.fname, workspace_path, prefix),
+                line=b_issue.lineno,
+                rule_id=b_issue.test_id,
+                suggestion=sys.intern(f"See: {docs_utils.get_url(b_issue.test_id)}")
+            ))
+        
+        return None, issues
+    
+    def _shard_python_files(self, workspace_path: str) -> List[List[str]]:
+        """Split the workspace's Python files into one shard per Bandit job.
+        
+        Returns an empty list when the workspace is too small to be worth the
+        extra process start-up cost, in which case a single recursive scan runs.
+        """
+        if self.jobs <= 1:
+            return []
+        
+        python_files = []
+        for root, dirs, files in os.walk(workspace_path):
+            # Mirror Bandit's default recursive excludes
+            dirs[:] = [d for d in dirs if not d.startswith('.') and d != '__pycache__' and not d.endswith('.egg')]
             
+            prefix = os.path.join(root, '')
+            for file in files:
+                if file.endswith(('.py', '.pyw')):
+                    python_files.append(prefix + file)
+        
+        shard_count = min(self.jobs, len(python_files) // MIN_FILES_PER_SHARD)
+        if shard_count <= 1:
+            return []
+        
+        # Round-robin so each shard gets a similar mix of files from every directory
+        return [python_files[i::shard_count] for i in range(shard_count)]
+    
+    def _parse_bandit_stdout(self, stdout: bytes, workspace_path: str) -> List[Issue]:
+        """Parse Bandit JSON output into normalized Issues.
+        
+        Findings are streamed with ijson, so only one parsed finding is held
+        in memory at a time, regardless of how large the 'results' array is.
+        """
+        issues: List[Issue] = []
+        append = issues.append
+        convert = self._convert_bandit_finding
+        # Every finding shares the workspace root, so resolve it once
+        prefix = self._workspace_prefix(workspace_path)
+        
+        try:
             # Bandit JSON format has 'results' array
-            results = data.get('results', [])
-            
-            for finding in results:
+            for finding in ijson.items(io.BytesIO(stdout), 'results.item'):
                 try:
-                    issue = self._convert_bandit_finding(finding, workspace_path)
+                    issue = convert(finding, workspace_path, prefix)
                     if issue:
-                        issues.append(issue)
+                        append(issue)
                 except Exception as e:
                     self.logger.warning(f"Failed to parse Bandit finding: {e}")
                     continue
         
-        except json.JSONDecodeError as e:
+        except ijson.JSONError as e:
             self.logger.error(f"Failed to parse Bandit JSON output: {e}")
         except Exception as e:
             self.logger.error(f"Error reading Bandit output: {e}")
         
         return issues
     
-    def _convert_bandit_finding(self, finding: Dict[str, Any], workspace_path: str) -> Optional[Issue]:
+    def _convert_bandit_finding(self, finding: Dict[str, Any], workspace_path: str, prefix: Optional[str] = None) -> Optional[Issue]:
         """Convert a single Bandit finding to normalized Issue."""
         try:
             # Extract basic information
-            test_id = finding.get('test_id', 'unknown')
+            test_id: str = sys.intern(finding.get('test_id', 'unknown'))
             test_name = finding.get('test_name', 'Security Issue')
             issue_text = finding.get('issue_text', 'Security vulnerability detected')
             
@@ -163,16 +481,16 @@ class BanditAnalyzer(BaseAnalyzer):
             line_number = finding.get('line_number', 1)
             
             # Normalize file path
-            normalized_path = self._normalize_file_path(filename, workspace_path)
+            normalized_path = self._normalize_file_path(filename, workspace_path, prefix)
             
             # Determine severity
             severity = self._determine_bandit_severity(finding)
             
             # Create suggestion from Bandit's more_info if available
-            suggestion = None
+            suggestion: Optional[str] = None
             more_info = finding.get('more_info')
             if more_info:
-                suggestion = f"See: {more_info}"
+                suggestion = sys.intern(f"See: {more_info}")
             
             return Issue(
                 tool="bandit",
@@ -189,55 +507,17 @@ class BanditAnalyzer(BaseAnalyzer):
             self.logger.warning(f"Error converting Bandit finding: {e}")
             return None
     
-    def _determine_bandit_severity(self, finding: Dict[str, Any]) -> Severity:
+    def _determine_bandit_severity(self, finding: Dict[str, Any]) -> str:
         """Determine severity from Bandit finding."""
         # Bandit provides issue_severity
-        raw_severity = finding.get('issue_severity', 'MEDIUM')
-        
-        # Map Bandit severity to our enum
-        severity_map = {
-            'LOW': Severity.LOW,
-            'MEDIUM': Severity.MEDIUM, 
-            'HIGH': Severity.HIGH
-        }
-        
-        severity = severity_map.get(raw_severity.upper(), Severity.MEDIUM)
-        
-        # Check for critical patterns in test IDs
-        test_id = finding.get('test_id', '').upper()
-        critical_tests = {
-            'B102',  # exec_used
-            'B103',  # set_bad_file_permissions  
-            'B104',  # hardcoded_bind_all_interfaces
-            'B105',  # hardcoded_password_string
-            'B106',  # hardcoded_password_funcarg
-            'B107',  # hardcoded_password_default
-            'B108',  # hardcoded_tmp_directory
-            'B201',  # flask_debug_true
-            'B501',  # request_with_no_cert_validation
-            'B502',  # ssl_with_bad_version
-            'B503',  # ssl_with_bad_defaults
-            'B504',  # ssl_with_no_version
-            'B505',  # weak_cryptographic_key
-            'B506',  # yaml_load
-            'B601',  # paramiko_calls
-            'B602',  # subprocess_popen_with_shell_equals_true
-            'B603',  # subprocess_without_shell_equals_true
-            'B604',  # any_other_function_with_shell_equals_true
-            'B605',  # start_process_with_a_shell
-            'B606',  # start_process_with_no_shell
-            'B607',  # start_process_with_partial_path
-            'B608',  # hardcoded_sql_expressions
-            'B609',  # linux_commands_wildcard_injection
-            'B701',  # jinja2_autoescape_false
-            'B702',  # use_of_mako_templates
-            'B703'   # django_mark_safe
-        }
-        
-        if test_id in critical_tests and severity == Severity.HIGH:
-            return Severity.CRITICAL
+        return self._map_bandit_severity(finding.get('issue_severity', 'MEDIUM'), finding.get('test_id', ''))
+    
+    def _map_bandit_severity(self, raw_severity: str, test_id: str) -> str:
+        """Map a Bandit severity and test ID to a canonical severity."""
+        severity = BANDIT_SEVERITY_MAP.get(raw_severity.upper(), MEDIUM)
         
-        return severity
+        # Escalate HIGH findings from critical tests (Bandit always emits uppercase IDs)
+        return SEVERITY_UPGRADE_MAP.get((test_id, severity), severity)
 
 
 # Register the analyzer
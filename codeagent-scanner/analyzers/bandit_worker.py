@@ -0,0 +1,80 @@
+"""Persistent Bandit worker process.
+
+Started by ``BanditWorkerPool`` in bandit_runner.py and kept alive between
+scans, so Python start-up and Bandit's plugin loading are paid once per
+worker instead of once per scan. ``run_manager`` is also used directly by
+``BanditAnalyzer`` for in-process scans.
+
+Protocol: one JSON request per line on stdin, one JSON response per line on
+stdout.
+
+    request:  {"targets": [...], "recursive": true, "severity": "LOW", "confidence": "LOW"}
+    response: Bandit's JSON report ({"errors": [...], "results": [...]}),
+              or {"error": "..."} if the scan could not run
+"""
+
+import functools
+import json
+import logging
+import sys
+from typing import Any, Dict
+
+from bandit.core import config as b_config
+from bandit.core import constants as b_constants
+from bandit.core import docs_utils
+from bandit.core import manager as b_manager
+
+
+# Bandit logs per-file progress at INFO and draws a progress bar on stdout
+# for large scans; stdout is reserved for responses (or for the API server)
+logging.getLogger("bandit").setLevel(logging.WARNING)
+
+
+@functools.lru_cache(maxsize=None)
+def get_config() -> b_config.BanditConfig:
+    """Bandit's default configuration, loaded once per process."""
+    return b_config.BanditConfig()
+
+
+def run_manager(request: Dict[str, Any]) -> b_manager.BanditManager:
+    """Run one Bandit scan and return the manager holding its results."""
+    mgr = b_manager.BanditManager(get_config(), "file", quiet=True)
+    mgr.discover_files(
+        request["targets"],
+        request.get("recursive", False),
+        ",".join(b_constants.EXCLUDE)  # Bandit's default -x excludes
+    )
+    mgr.run_tests()
+    return mgr
+
+
+def run_scan(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one Bandit scan and build the same report as ``bandit -f json``."""
+    mgr = run_manager(request)
+
+    results = []
+    for issue in mgr.get_issue_list(request.get("severity", "LOW"), request.get("confidence", "LOW")):
+        finding = issue.as_dict(with_code=False)
+        finding["more_info"] = docs_utils.get_url(issue.test_id)
+        results.append(finding)
+
+    errors = [{"filename": fname, "reason": reason} for fname, reason in mgr.get_skipped()]
+    return {"errors": errors, "results": results}
+
+
+def main() -> None:
+    """Serve scan requests until stdin is closed."""
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            response = run_scan(json.loads(line))
+        except Exception as e:
+            response = {"error": f"{type(e).__name__}: {e}"}
+
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
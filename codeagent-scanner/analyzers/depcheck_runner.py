@@ -1,32 +1,142 @@
 """Dependency checker analyzer for known vulnerabilities in dependencies."""
 
-import json
+import functools
+import importlib.metadata
+import io
 import os
+import re
+import shutil
 import subprocess
-import tempfile
+import threading
 import time
-from typing import List, Dict, Any, Optional
-import glob
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 
-from .base import BaseAnalyzer, AnalyzerResult, Issue, Severity, analyzer_registry
+import httpx
+import ijson
+import orjson
+from packaging.requirements import InvalidRequirement, Requirement
+
+from .base import BaseAnalyzer, AnalyzerResult, Issue, CRITICAL, HIGH, MEDIUM, analyzer_registry
+from .detect import compile_dep_patterns, find_dependency_files
+
+
+# Upper bound on concurrent per-file audits (each is a network-bound subprocess)
+MAX_AUDIT_WORKERS = 8
+
+# Chunk size for streaming audit reports through ijson
+AUDIT_READ_SIZE = 64 * 1024
+
+# Audit tools resolved once at import; None if not installed. The resolved
+# path is used as argv[0], so subprocess doesn't search PATH again
+TOOL_PATHS: Dict[str, Optional[str]] = {
+    tool: shutil.which(tool) for tool in ('pip-audit', 'npm', 'bundle')
+}
+
+DEP_PATTERNS = [
+    # Python
+    'requirements.txt', 'requirements-*.txt', 'Pipfile', 'pyproject.toml',
+    # JavaScript/Node  
+    'package.json',
+    # Java
+    'pom.xml', 'build.gradle', 'build.gradle.kts',
+    # .NET
+    '*.csproj', '*.fsproj', '*.vbproj', 'packages.config',
+    # Go
+    'go.mod',
+    # Ruby
+    'Gemfile',
+    # PHP
+    'composer.json',
+    # Rust
+    'Cargo.toml'
+]
+
+# Exact-name manifests are only audited at the workspace root
+ROOT_DEP_FILES = frozenset(p for p in DEP_PATTERNS if '*' not in p)
+
+# DEP_PATTERNS compiled for matching file names from a shared workspace scan
+DEP_FILE_RE = compile_dep_patterns(DEP_PATTERNS)
+
+OSV_API_URL = "https://api.osv.dev/v1"
+# OSV accepts at most 1000 queries per querybatch request
+OSV_BATCH_SIZE = 1000
+# Concurrent /vulns/{id} lookups
+MAX_OSV_DETAIL_WORKERS = 16
+# Entries kept in the (ecosystem, name, version) -> vulnerability IDs cache,
+# and how long an entry stays valid before OSV is asked again
+OSV_CACHE_SIZE = 4096
+OSV_CACHE_TTL_SEC = 3600
+
+# Shared by every DepCheckAnalyzer, so TLS handshakes are paid once per
+# connection instead of once per lookup; HTTP/2 multiplexes the detail
+# lookups over those connections
+_osv_client = httpx.Client(
+    http2=True,
+    limits=httpx.Limits(max_keepalive_connections=20),
+    timeout=30
+)
+
+# LRU of OSV batch results shared by every DepCheckAnalyzer, so pins repeated
+# across manifests and scans are looked up once: key -> (fetched at, vuln IDs)
+_osv_query_cache: "OrderedDict[Tuple[str, str, str], Tuple[float, Tuple[str, ...]]]" = OrderedDict()
+_osv_query_cache_lock = threading.Lock()
+
+# Project name at the start of a requirements.txt line ("name[extra]>=1.0; marker")
+REQUIREMENT_NAME_RE = re.compile(r'^\s*([A-Za-z0-9][A-Za-z0-9._-]*)')
+
+# package.json version spec with a concrete version: "1.2.3", "^1.2.3", "~1.2.3", "=v1.2.3"
+NPM_VERSION_RE = re.compile(r'^[\^~=v]*(\d+\.\d+\.\d+(?:-[0-9A-Za-z.-]+)?)$')
+
+# Description keywords that indicate a vulnerability's severity
+CRITICAL_TERMS = ('remote code execution', 'rce', 'critical', 'arbitrary code')
+HIGH_TERMS = ('code injection', 'sql injection', 'xss', 'csrf', 'authentication bypass')
+
+# Matches both keyword lists in one pass over a lowercased description; the
+# lookahead makes every match zero-width so a HIGH term can't hide an
+# overlapping CRITICAL one
+SEVERITY_TERMS_RE = re.compile(
+    '(?=(?P<critical>' + '|'.join(map(re.escape, CRITICAL_TERMS)) + ')'
+    '|(?P<high>' + '|'.join(map(re.escape, HIGH_TERMS)) + '))'
+)
 
 
 class DepCheckAnalyzer(BaseAnalyzer):
     """Dependency vulnerability checker using pip-audit and other tools."""
     
-    def __init__(self, timeout_sec: int = 300):
+    name = "depcheck"
+    
+    def __init__(self, timeout_sec: int = 300, use_osv: bool = True):
         super().__init__(timeout_sec)
-        
-    @property
-    def name(self) -> str:
-        return "depcheck"
+        self.use_osv = use_osv  # Query OSV directly instead of running pip-audit / npm audit
+        # workspace path -> dependency files, shared by is_applicable and run_analysis
+        self._dep_files_cache: Dict[str, List[str]] = {}
     
     @property
+    def _tool_timeout_sec(self) -> int:
+        """Network timeout passed to the audit tools: half of the analyzer's own timeout."""
+        return max(1, self.timeout_sec // 2)
+    
+    @functools.cached_property
     def version(self) -> str:
-        """Get pip-audit version."""
+        """Get pip-audit version.
+        
+        When pip-audit is installed in this environment its package metadata
+        is read in-process; ``pip-audit --version`` is only spawned for a
+        standalone install (e.g. pipx) found on PATH.
+        """
+        try:
+            return importlib.metadata.version("pip-audit")
+        except importlib.metadata.PackageNotFoundError:
+            pass
+        
+        if not TOOL_PATHS['pip-audit']:
+            return "unknown"
+        
         try:
             result = subprocess.run(
-                ["pip-audit", "--version"],
+                [TOOL_PATHS['pip-audit'], "--version"],
                 capture_output=True,
                 text=True,
                 timeout=10
@@ -41,13 +151,13 @@ class DepCheckAnalyzer(BaseAnalyzer):
         except Exception:
             return "unknown"
     
-    def is_applicable(self, workspace_path: str) -> bool:
+    def is_applicable(self, workspace_path: str, file_info: Optional[Dict[str, Any]] = None) -> bool:
         """Check if dependency checking should run on this workspace."""
         # Look for dependency files
-        dep_files = self._find_dependency_files(workspace_path)
+        dep_files = self._find_dependency_files(workspace_path, file_info)
         return len(dep_files) > 0
     
-    def run_analysis(self, workspace_path: str, **kwargs) -> AnalyzerResult:
+    def run_analysis(self, workspace_path: str, file_info: Optional[Dict[str, Any]] = None, **kwargs) -> AnalyzerResult:
         """Run dependency vulnerability analysis."""
         start_time = time.time()
         issues = []
@@ -55,7 +165,7 @@ class DepCheckAnalyzer(BaseAnalyzer):
         
         try:
             # Find all dependency files
-            dep_files = self._find_dependency_files(workspace_path)
+            dep_files = self._find_dependency_files(workspace_path, file_info)
             
             if not dep_files:
                 self.logger.info("No dependency files found, skipping dependency check")
@@ -63,13 +173,28 @@ class DepCheckAnalyzer(BaseAnalyzer):
             else:
                 self.logger.info(f"Found dependency files: {dep_files}")
                 
-                # Run analysis on each type of dependency file
-                for dep_file in dep_files:
-                    try:
-                        file_issues = self._analyze_dependency_file(dep_file, workspace_path)
-                        issues.extend(file_issues)
-                    except Exception as e:
-                        self.logger.warning(f"Failed to analyze {dep_file}: {e}")
+                # All requirements files go to a single pip-audit run, so its
+                # start-up cost is paid once rather than once per file
+                requirement_files = [f for f in dep_files if self._is_requirements_file(f)]
+                jobs = [
+                    (dep_file, functools.partial(self._analyze_dependency_file, dep_file, workspace_path))
+                    for dep_file in dep_files if not self._is_requirements_file(dep_file)
+                ]
+                if requirement_files:
+                    jobs.insert(0, (", ".join(requirement_files),
+                                    functools.partial(self._analyze_python_requirements, requirement_files, workspace_path)))
+                
+                # Audit dependency files concurrently; each audit is dominated by
+                # its tool subprocess and network lookups, so threads suffice
+                with ThreadPoolExecutor(max_workers=min(len(jobs), MAX_AUDIT_WORKERS)) as executor:
+                    futures = [(label, executor.submit(job)) for label, job in jobs]
+                    # Collect in submission order so reports are deterministic;
+                    # each job returns a list, parsed on its own worker thread
+                    for label, future in futures:
+                        try:
+                            issues.extend(future.result())
+                        except Exception as e:
+                            self.logger.warning(f"Failed to analyze {label}: {e}")
                 
                 success = True
             
@@ -87,51 +212,45 @@ class DepCheckAnalyzer(BaseAnalyzer):
             error_message=error_message
         )
     
-    def _find_dependency_files(self, workspace_path: str) -> List[str]:
-        """Find dependency management files in the workspace."""
-        dep_patterns = [
-            # Python
-            'requirements.txt', 'requirements-*.txt', 'Pipfile', 'pyproject.toml',
-            # JavaScript/Node  
-            'package.json',
-            # Java
-            'pom.xml', 'build.gradle', 'build.gradle.kts',
-            # .NET
-            '*.csproj', '*.fsproj', '*.vbproj', 'packages.config',
-            # Go
-            'go.mod',
-            # Ruby
-            'Gemfile',
-            # PHP
-            'composer.json',
-            # Rust
-            'Cargo.toml'
-        ]
+    def _find_dependency_files(self, workspace_path: str, file_info: Optional[Dict[str, Any]] = None) -> List[str]:
+        """Find dependency management files in the workspace.
         
-        found_files = []
-        
-        for pattern in dep_patterns:
-            if '*' in pattern:
-                # Use glob for wildcard patterns
-                matches = glob.glob(os.path.join(workspace_path, '**', pattern), recursive=True)
-                for match in matches:
-                    rel_path = os.path.relpath(match, workspace_path)
-                    found_files.append(rel_path)
-            else:
-                # Check if file exists
-                file_path = os.path.join(workspace_path, pattern)
-                if os.path.exists(file_path):
-                    found_files.append(pattern)
+        With a shared ``file_info`` scan the files are picked out of it
+        without touching the disk. Otherwise results are cached per
+        workspace, so the walk done by is_applicable is reused by run_analysis.
+        """
+        # Exact names only count at the workspace root, glob patterns match at any depth
+        if file_info is not None:
+            dep_match = DEP_FILE_RE.fullmatch
+            return sorted(
+                rel_path for rel_path in file_info['files']
+                if dep_match(os.path.basename(rel_path))
+                and (os.sep not in rel_path or os.path.basename(rel_path) not in ROOT_DEP_FILES)
+            )
         
-        return found_files
+        dep_files = self._dep_files_cache.get(workspace_path)
+        if dep_files is None:
+            # One walk classifies every file
+            dep_files = sorted(
+                rel_path for rel_path in find_dependency_files(workspace_path, DEP_PATTERNS)
+                if os.sep not in rel_path or os.path.basename(rel_path) not in ROOT_DEP_FILES
+            )
+            self._dep_files_cache[workspace_path] = dep_files
+        return dep_files
+    
+    @staticmethod
+    def _is_requirements_file(dep_file_path: str) -> bool:
+        """Check if a dependency file is a pip requirements file."""
+        file_name = os.path.basename(dep_file_path)
+        return file_name.startswith('requirements') and file_name.endswith('.txt')
     
     def _analyze_dependency_file(self, dep_file_path: str, workspace_path: str) -> List[Issue]:
         """Analyze a specific dependency file for vulnerabilities."""
         full_path = os.path.join(workspace_path, dep_file_path)
         file_name = os.path.basename(dep_file_path)
         
-        if file_name.startswith('requirements') and file_name.endswith('.txt'):
-            return self._analyze_python_requirements(full_path, dep_file_path, workspace_path)
+        if self._is_requirements_file(dep_file_path):
+            return self._analyze_python_requirements([dep_file_path], workspace_path)
         elif file_name == 'package.json':
             return self._analyze_npm_package(full_path, dep_file_path, workspace_path)
         elif file_name in ['pom.xml', 'build.gradle', 'build.gradle.kts']:
@@ -142,60 +261,339 @@ class DepCheckAnalyzer(BaseAnalyzer):
             self.logger.debug(f"No specific analyzer for {file_name}")
             return []
     
-    def _analyze_python_requirements(self, file_path: str, rel_path: str, workspace_path: str) -> List[Issue]:
-        """Analyze Python requirements file using pip-audit."""
+    def _analyze_python_requirements(self, rel_paths: List[str], workspace_path: str) -> List[Issue]:
+        """Analyze Python requirements files against OSV advisories (or pip-audit if use_osv is off)."""
+        if not self.use_osv:
+            return self._run_pip_audit(rel_paths, workspace_path)
+        
         issues = []
+        label = ", ".join(rel_paths)
         
         try:
-            # Create temporary file for output
-            with tempfile.NamedTemporaryFile(mode='w+', suffix='.json', delete=False) as tmp_file:
-                output_file = tmp_file.name
-            
-            # Run pip-audit
+            packages_by_file = {
+                rel_path: self._pip_parse_requirements(os.path.join(workspace_path, rel_path))
+                for rel_path in rel_paths
+            }
+            self.logger.info(f"Querying OSV for pinned requirements in {label}")
+            issues = self._osv_issues(packages_by_file, "PyPI")
+        
+        except httpx.HTTPError as e:
+            self.logger.error(f"OSV query failed for {label}: {e}")
+        except Exception as e:
+            self.logger.error(f"Python dependency check failed for {label}: {e}")
+        
+        return issues
+    
+    def _pip_parse_requirements(self, file_path: str) -> List[Tuple[str, str]]:
+        """Extract (name, version) pairs for requirements pinned with '=='.
+        
+        Unpinned requirements are skipped since they don't name a single
+        version to look up.
+        """
+        packages = []
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                # Drop comments, trailing options (--hash) and line continuations
+                line = line.split(' #', 1)[0].split(' --', 1)[0].rstrip(' \\\n').strip()
+                if not line or line.startswith(('#', '-')):
+                    continue
+                
+                try:
+                    requirement = Requirement(line)
+                except InvalidRequirement:
+                    continue
+                
+                specifiers = list(requirement.specifier)
+                if (len(specifiers) == 1 and specifiers[0].operator in ('==', '===')
+                        and '*' not in specifiers[0].version):
+                    packages.append((requirement.name, specifiers[0].version))
+        
+        return packages
+    
+    def _run_pip_audit(self, rel_paths: List[str], workspace_path: str) -> List[Issue]:
+        """Analyze Python requirements files with a single pip-audit run.
+        
+        Each vulnerability is attributed to the requirements files that list
+        the affected package, or to the first file if none of them does
+        (e.g. the package comes from a nested ``-r`` include).
+        """
+        issues = []
+        label = ", ".join(rel_paths)
+        
+        if not TOOL_PATHS['pip-audit']:
+            self.logger.info(f"pip-audit not installed, skipping {label}")
+            return issues
+        
+        try:
+            # Run pip-audit; without --output the report is written to stdout
             cmd = [
-                "pip-audit",
-                "--requirement", file_path,
+                TOOL_PATHS['pip-audit'],
                 "--format=json",
-                f"--output={output_file}",
-                "--no-deps"  # Only check explicit requirements
+                "--no-deps",  # Only check explicit requirements
+                # Per-request network timeout, so a slow index fails inside our own timeout
+                "--timeout", str(self._tool_timeout_sec)
             ]
+            for rel_path in rel_paths:
+                cmd.extend(["--requirement", os.path.join(workspace_path, rel_path)])
             
-            self.logger.info(f"Running pip-audit on {rel_path}")
-            result = self._run_command(cmd, workspace_path, capture_output=True)
+            self.logger.info(f"Running pip-audit on {label}")
+            result = self._run_command(cmd, workspace_path, capture_output=True, text=False)
             
             # Parse results
-            if os.path.exists(output_file):
-                issues = self._parse_pip_audit_output(output_file, rel_path, workspace_path)
-                os.unlink(output_file)
+            if result.stdout:
+                owners = self._requirement_owners(rel_paths, workspace_path)
+                # Drained here, so parsing runs on this audit's worker thread
+                issues = list(self._parse_pip_audit_output(result.stdout, rel_paths[0], workspace_path, owners))
             
         except subprocess.TimeoutExpired:
-            self.logger.error(f"pip-audit timed out for {rel_path}")
+            self.logger.error(f"pip-audit timed out for {label}")
         except Exception as e:
-            self.logger.error(f"pip-audit failed for {rel_path}: {e}")
-        finally:
-            if 'output_file' in locals() and os.path.exists(output_file):
-                try:
-                    os.unlink(output_file)
-                except Exception:
-                    pass
+            self.logger.error(f"pip-audit failed for {label}: {e}")
         
         return issues
     
+    @staticmethod
+    def _canonical_package_name(name: str) -> str:
+        """Normalize a Python project name (PEP 503)."""
+        return re.sub(r'[-_.]+', '-', name).lower()
+    
+    def _requirement_owners(self, rel_paths: List[str], workspace_path: str) -> Dict[str, List[str]]:
+        """Map each canonical package name to the requirements files that list it."""
+        owners: Dict[str, List[str]] = {}
+        for rel_path in rel_paths:
+            try:
+                with open(os.path.join(workspace_path, rel_path), 'r', encoding='utf-8') as f:
+                    for line in f:
+                        # Options (-r, -e, --hash, ...) and comments don't name a package
+                        match = REQUIREMENT_NAME_RE.match(line)
+                        if match:
+                            files = owners.setdefault(self._canonical_package_name(match.group(1)), [])
+                            if rel_path not in files:
+                                files.append(rel_path)
+            except OSError as e:
+                self.logger.warning(f"Could not read {rel_path}: {e}")
+        return owners
+    
     def _analyze_npm_package(self, file_path: str, rel_path: str, workspace_path: str) -> List[Issue]:
+        """Analyze npm package.json against OSV advisories (or npm audit if use_osv is off)."""
+        if not self.use_osv:
+            return self._run_npm_audit(file_path, rel_path, workspace_path)
+        
+        issues = []
+        
+        try:
+            packages = self._collect_npm_deps(file_path)
+            if not packages:
+                return issues
+            
+            self.logger.info(f"Querying OSV for {len(packages)} npm packages from {rel_path}")
+            issues = self._osv_issues({rel_path: packages}, "npm")
+            
+        except httpx.HTTPError as e:
+            self.logger.error(f"OSV query failed for {rel_path}: {e}")
+        except Exception as e:
+            self.logger.error(f"npm dependency check failed for {rel_path}: {e}")
+        
+        return issues
+    
+    def _collect_npm_deps(self, file_path: str) -> List[Tuple[str, str]]:
+        """Collect (name, version) pairs for an npm project.
+        
+        Uses the package-lock.json next to package.json when present, since
+        it pins every transitive dependency. Otherwise falls back to the
+        direct dependencies in package.json, taking the base version of
+        exact, caret and tilde specs and skipping anything else.
+        """
+        packages = set()
+        lock_path = os.path.join(os.path.dirname(file_path), 'package-lock.json')
+        
+        if os.path.exists(lock_path):
+            with open(lock_path, 'rb') as f:
+                lock = orjson.loads(f.read())
+            
+            if lock.get('packages'):
+                # lockfileVersion 2/3: keyed by install path, "" is the project itself
+                for path, info in lock['packages'].items():
+                    if not path or info.get('link') or not info.get('version'):
+                        continue
+                    name = info.get('name') or path.rsplit('node_modules/', 1)[-1]
+                    packages.add((name, info['version']))
+            else:
+                # lockfileVersion 1: nested "dependencies" trees
+                stack = [lock.get('dependencies', {})]
+                while stack:
+                    for name, info in stack.pop().items():
+                        if info.get('version'):
+                            packages.add((name, info['version']))
+                        stack.append(info.get('dependencies', {}))
+        else:
+            with open(file_path, 'rb') as f:
+                manifest = orjson.loads(f.read())
+            
+            for section in ('dependencies', 'devDependencies'):
+                for name, spec in (manifest.get(section) or {}).items():
+                    match = NPM_VERSION_RE.match(spec.strip()) if isinstance(spec, str) else None
+                    if match:
+                        packages.add((name, match.group(1)))
+        
+        return sorted(packages)
+    
+    def _query_osv(self, packages: List[Tuple[str, str]], ecosystem: str,
+                   client: Optional[httpx.Client] = None) -> List[List[str]]:
+        """Look up known vulnerabilities for (name, version) pairs with OSV's batch API.
+        
+        Packages answered recently are served from a process-wide LRU cache;
+        only the rest are sent to OSV.
+        
+        Returns:
+            Vulnerability IDs for each package, in the order given
+        """
+        client = client or _osv_client
+        
+        keys = [(ecosystem, name, version) for name, version in packages]
+        found: Dict[Tuple[str, str, str], Tuple[str, ...]] = {}
+        now = time.monotonic()
+        with _osv_query_cache_lock:
+            for key in keys:
+                entry = _osv_query_cache.get(key)
+                if entry is not None and now - entry[0] < OSV_CACHE_TTL_SEC:
+                    _osv_query_cache.move_to_end(key)
+                    found[key] = entry[1]
+        
+        missing = list(dict.fromkeys(key for key in keys if key not in found))
+        for start in range(0, len(missing), OSV_BATCH_SIZE):
+            batch = missing[start:start + OSV_BATCH_SIZE]
+            queries = [
+                {"package": {"name": name, "ecosystem": ecosystem}, "version": version}
+                for ecosystem, name, version in batch
+            ]
+            response = client.post(f"{OSV_API_URL}/querybatch", json={"queries": queries})
+            response.raise_for_status()
+            
+            results = response.json().get('results', [])
+            fetched = {
+                key: tuple(vuln['id'] for vuln in result.get('vulns') or [])
+                for key, result in zip(batch, results)
+            }
+            found.update(fetched)
+            
+            with _osv_query_cache_lock:
+                for key, vuln_ids in fetched.items():
+                    _osv_query_cache[key] = (now, vuln_ids)
+                    _osv_query_cache.move_to_end(key)
+                while len(_osv_query_cache) > OSV_CACHE_SIZE:
+                    _osv_query_cache.popitem(last=False)
+        
+        return [list(found.get(key, ())) for key in keys]
+    
+    def _fetch_osv_vulns(self, vuln_ids: List[str], client: Optional[httpx.Client] = None) -> Dict[str, Dict[str, Any]]:
+        """Fetch full OSV records for vulnerability IDs concurrently.
+        
+        IDs whose record can't be fetched map to a stub with just the ID.
+        """
+        client = client or _osv_client
+        
+        def fetch(vuln_id: str) -> Dict[str, Any]:
+            try:
+                response = client.get(f"{OSV_API_URL}/vulns/{vuln_id}")
+                response.raise_for_status()
+                return response.json()
+            except httpx.HTTPError as e:
+                self.logger.warning(f"Failed to fetch OSV record {vuln_id}: {e}")
+                return {'id': vuln_id}
+        
+        if not vuln_ids:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(len(vuln_ids), MAX_OSV_DETAIL_WORKERS)) as executor:
+            return dict(zip(vuln_ids, executor.map(fetch, vuln_ids)))
+    
+    def _osv_issues(self, packages_by_file: Dict[str, List[Tuple[str, str]]], ecosystem: str) -> List[Issue]:
+        """Look up packages in OSV and build Issues against the files that declare them.
+        
+        Packages shared by several files are queried once.
+        """
+        unique_packages = sorted({package for packages in packages_by_file.values() for package in packages})
+        if not unique_packages:
+            return []
+        
+        vuln_ids_by_package = dict(zip(unique_packages, self._query_osv(unique_packages, ecosystem)))
+        vulns = self._fetch_osv_vulns(sorted({
+            vuln_id for vuln_ids in vuln_ids_by_package.values() for vuln_id in vuln_ids
+        }))
+        
+        issues = []
+        for rel_path, packages in packages_by_file.items():
+            for package in packages:
+                for vuln_id in vuln_ids_by_package.get(package, []):
+                    issues.append(self._convert_osv_vuln(vulns[vuln_id], package[0], package[1], rel_path))
+        return issues
+    
+    def _convert_osv_vuln(self, vuln: Dict[str, Any], package: str, version: str, dep_file: str) -> Issue:
+        """Convert an OSV vulnerability record to a normalized Issue."""
+        vuln_id = vuln.get('id', 'unknown')
+        description = vuln.get('summary') or vuln.get('details', '').split('\n', 1)[0] or 'Vulnerable dependency detected'
+        
+        # Fixed versions of this package, from the affected ranges' events
+        canonical_name = self._canonical_package_name(package)
+        fix_versions = [
+            event['fixed']
+            for affected in vuln.get('affected', [])
+            if self._canonical_package_name(affected.get('package', {}).get('name', '')) == canonical_name
+            for version_range in affected.get('ranges', [])
+            for event in version_range.get('events', [])
+            if 'fixed' in event
+        ]
+        
+        # GitHub advisories carry a severity rating; otherwise use the heuristics
+        raw_severity = (vuln.get('database_specific') or {}).get('severity')
+        if raw_severity:
+            severity = self._parse_severity(raw_severity)
+        else:
+            severity = self._determine_vulnerability_severity({
+                'id': vuln_id,
+                'aliases': vuln.get('aliases', []),
+                'description': description
+            })
+        
+        if fix_versions:
+            suggestion = f"Upgrade {package} to version {fix_versions[0]} or later"
+        else:
+            suggestion = f"Update {package} to a secure version"
+        
+        return Issue(
+            tool="depcheck",
+            type=vuln_id,
+            message=f"Vulnerable dependency: {package} {version} - {description}",
+            severity=severity,
+            file=dep_file,
+            line=1,  # Dependencies don't have specific line numbers
+            rule_id=vuln_id,
+            suggestion=suggestion
+        )
+    
+    def _run_npm_audit(self, file_path: str, rel_path: str, workspace_path: str) -> List[Issue]:
         """Analyze npm package.json using npm audit."""
         issues = []
         
+        if not TOOL_PATHS['npm']:
+            self.logger.info(f"npm not installed, skipping {rel_path}")
+            return issues
+        
         try:
             # Check if package-lock.json or node_modules exists
             pkg_dir = os.path.dirname(file_path)
             
-            cmd = ["npm", "audit", "--json", "--audit-level=info"]
+            cmd = [
+                TOOL_PATHS['npm'], "audit", "--json", "--audit-level=info",
+                f"--fetch-timeout={self._tool_timeout_sec * 1000}"
+            ]
             
             self.logger.info(f"Running npm audit on {rel_path}")
-            result = self._run_command(cmd, pkg_dir, capture_output=True)
+            result = self._run_command(cmd, pkg_dir, capture_output=True, text=False)
             
             if result.stdout:
-                issues = self._parse_npm_audit_output(result.stdout, rel_path, workspace_path)
+                # Drained here, so parsing runs on this audit's worker thread
+                issues = list(self._parse_npm_audit_output(result.stdout, rel_path, workspace_path))
             
         except subprocess.TimeoutExpired:
             self.logger.error(f"npm audit timed out for {rel_path}")
@@ -215,9 +613,13 @@ class DepCheckAnalyzer(BaseAnalyzer):
         """Analyze Ruby Gemfile using bundler-audit."""
         issues = []
         
+        if not TOOL_PATHS['bundle']:
+            self.logger.info(f"bundle not installed, skipping {rel_path}")
+            return issues
+        
         try:
             gem_dir = os.path.dirname(file_path)
-            cmd = ["bundle", "audit", "--format=json"]
+            cmd = [TOOL_PATHS['bundle'], "audit", "--format=json"]
             
             self.logger.info(f"Running bundler-audit on {rel_path}")
             result = self._run_command(cmd, gem_dir, capture_output=True)
@@ -232,17 +634,18 @@ class DepCheckAnalyzer(BaseAnalyzer):
         
         return issues
     
-    def _parse_pip_audit_output(self, output_file: str, dep_file: str, workspace_path: str) -> List[Issue]:
-        """Parse pip-audit JSON output."""
-        issues = []
+    def _parse_pip_audit_output(self, json_output: bytes, dep_file: str, workspace_path: str,
+                                owners: Optional[Dict[str, List[str]]] = None) -> Iterator[Issue]:
+        """Parse pip-audit JSON output, yielding issues as the report is streamed.
         
+        Args:
+            json_output: pip-audit JSON report
+            dep_file: Requirements file issues are reported against by default
+            workspace_path: Workspace root
+            owners: Canonical package name -> requirements files listing it
+        """
         try:
-            with open(output_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            vulnerabilities = data.get('vulnerabilities', [])
-            
-            for vuln in vulnerabilities:
+            for vuln in self._iter_pip_audit_vulns(io.BytesIO(json_output)):
                 try:
                     package = vuln.get('package', 'unknown')
                     version = vuln.get('installed_version', 'unknown')
@@ -258,38 +661,74 @@ class DepCheckAnalyzer(BaseAnalyzer):
                     if fix_versions:
                         suggestion = f"Upgrade {package} to version {fix_versions[0]} or later"
                     
-                    issue = Issue(
-                        tool="depcheck",
-                        type=vuln_id,
-                        message=f"Vulnerable dependency: {package} {version} - {description}",
-                        severity=severity,
-                        file=dep_file,
-                        line=1,  # Dependencies don't have specific line numbers
-                        rule_id=vuln_id,
-                        suggestion=suggestion
-                    )
-                    
-                    issues.append(issue)
+                    files = (owners or {}).get(self._canonical_package_name(package)) or [dep_file]
+                    for file in files:
+                        issue = Issue(
+                            tool="depcheck",
+                            type=vuln_id,
+                            message=f"Vulnerable dependency: {package} {version} - {description}",
+                            severity=severity,
+                            file=file,
+                            line=1,  # Dependencies don't have specific line numbers
+                            rule_id=vuln_id,
+                            suggestion=suggestion
+                        )
+                        
+                        yield issue
                     
                 except Exception as e:
                     self.logger.warning(f"Failed to parse vulnerability: {e}")
         
-        except json.JSONDecodeError as e:
+        except ijson.JSONError as e:
             self.logger.error(f"Failed to parse pip-audit JSON: {e}")
         except Exception as e:
             self.logger.error(f"Error reading pip-audit output: {e}")
+    
+    @staticmethod
+    def _iter_pip_audit_vulns(stream) -> Iterator[Dict[str, Any]]:
+        """Stream vulnerabilities out of a pip-audit JSON report.
         
-        return issues
+        Handles both the flat ``vulnerabilities`` list and pip-audit 2.x's
+        ``dependencies[].vulns``, in a single pass over the report; only one
+        dependency entry is held in memory at a time.
+        """
+        flat = ijson.sendable_list()
+        dependencies = ijson.sendable_list()
+        parsers = (
+            ijson.items_coro(flat, 'vulnerabilities.item'),
+            ijson.items_coro(dependencies, 'dependencies.item')
+        )
+        
+        while True:
+            chunk = stream.read(AUDIT_READ_SIZE)
+            for parser in parsers:
+                if chunk:
+                    parser.send(chunk)
+                else:
+                    parser.close()
+            
+            yield from flat
+            for dependency in dependencies:
+                for vuln in dependency.get('vulns', []):
+                    yield {
+                        **vuln,
+                        'package': dependency.get('name', 'unknown'),
+                        'installed_version': dependency.get('version', 'unknown')
+                    }
+            del flat[:], dependencies[:]
+            
+            if not chunk:
+                return
     
-    def _parse_npm_audit_output(self, json_output: str, dep_file: str, workspace_path: str) -> List[Issue]:
-        """Parse npm audit JSON output."""
-        issues = []
+    def _parse_npm_audit_output(self, json_output: bytes, dep_file: str, workspace_path: str) -> Iterator[Issue]:
+        """Parse npm audit JSON output.
         
+        Advisories are streamed with ijson and yielded one package at a time.
+        """
         try:
-            data = json.loads(json_output)
-            vulnerabilities = data.get('vulnerabilities', {})
+            vulnerabilities = ijson.kvitems(io.BytesIO(json_output), 'vulnerabilities')
             
-            for package_name, vuln_info in vulnerabilities.items():
+            for package_name, vuln_info in vulnerabilities:
                 try:
                     severity_raw = vuln_info.get('severity', 'moderate')
                     severity = self._parse_severity(severity_raw)
@@ -315,24 +754,22 @@ class DepCheckAnalyzer(BaseAnalyzer):
                         suggestion=f"Update {package_name} to a secure version"
                     )
                     
-                    issues.append(issue)
+                    yield issue
                     
                 except Exception as e:
                     self.logger.warning(f"Failed to parse npm vulnerability for {package_name}: {e}")
         
-        except json.JSONDecodeError as e:
+        except ijson.JSONError as e:
             self.logger.error(f"Failed to parse npm audit JSON: {e}")
         except Exception as e:
             self.logger.error(f"Error parsing npm audit output: {e}")
-        
-        return issues
     
     def _parse_bundler_audit_output(self, json_output: str, dep_file: str, workspace_path: str) -> List[Issue]:
         """Parse bundler-audit JSON output."""
         # Implementation for Ruby bundler-audit would go here
         return []
     
-    def _determine_vulnerability_severity(self, vuln: Dict[str, Any]) -> Severity:
+    def _determine_vulnerability_severity(self, vuln: Dict[str, Any]) -> str:
         """Determine severity from vulnerability data."""
         # Try to get CVSS score
         cvss_score = None
@@ -342,29 +779,27 @@ class DepCheckAnalyzer(BaseAnalyzer):
             for alias in vuln['aliases']:
                 if alias.startswith('GHSA-'):
                     # GitHub Security Advisory - typically high severity
-                    return Severity.HIGH
+                    return HIGH
         
         # Look for CVE severity indicators
         vuln_id = vuln.get('id', '').upper()
         description = vuln.get('description', '').lower()
         
-        # Critical indicators
-        if any(term in description for term in [
-            'remote code execution', 'rce', 'critical', 'arbitrary code'
-        ]):
-            return Severity.CRITICAL
+        # Critical and high severity indicators, found in a single scan
+        has_high_term = False
+        for match in SEVERITY_TERMS_RE.finditer(description):
+            if match.group('critical') is not None:
+                return CRITICAL
+            has_high_term = True
         
-        # High severity indicators
-        if any(term in description for term in [
-            'code injection', 'sql injection', 'xss', 'csrf', 'authentication bypass'
-        ]):
-            return Severity.HIGH
+        if has_high_term:
+            return HIGH
         
         # Default based on vulnerability type
         if vuln_id.startswith('CVE-'):
-            return Severity.HIGH
+            return HIGH
         
-        return Severity.MEDIUM
+        return MEDIUM
 
 
 # Register the analyzer
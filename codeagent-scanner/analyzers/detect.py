@@ -1,21 +1,116 @@
 """Analyzer detection and selection logic."""
 
+import fnmatch
 import os
-import glob
-from typing import List, Set
+import re
+from typing import Callable, Dict, List, Optional, Pattern, Set
 import logging
 
 
 logger = logging.getLogger(__name__)
 
 
-def detect_applicable_analyzers(workspace_path: str, available_analyzers: List[str]) -> List[str]:
+# Directory names (lowercase) skipped by the workspace walk, in addition to hidden directories
+IGNORED_DIRS = frozenset({
+    '.git', '.svn', '.hg', '.bzr',  # VCS
+    'node_modules', 'bower_components',  # JS
+    '__pycache__', '.pytest_cache', 'venv', '.venv', 'env', '.env',  # Python
+    'target', 'build', 'dist', 'out',  # Build outputs
+    '.idea', '.vscode', '.vs',  # IDEs
+    'vendor',  # Dependencies
+    'tmp', 'temp', 'cache', '.cache',  # Temp
+    'logs', 'log',  # Logs
+})
+
+# File extensions (lowercase) of common non-source files
+IGNORED_EXTS = frozenset({
+    '.pyc', '.pyo', '.pyd',  # Python compiled
+    '.class', '.jar',  # Java compiled  
+    '.o', '.so', '.dll', '.dylib',  # Compiled binaries
+    '.exe', '.bin',  # Executables
+    '.zip', '.tar', '.gz', '.bz2', '.xz',  # Archives
+    '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg',  # Images
+    '.mp3', '.mp4', '.avi', '.mov', '.wmv',  # Media
+    '.pdf', '.doc', '.docx', '.xls', '.xlsx',  # Documents
+    '.log', '.tmp', '.temp', '.cache',  # Temp/log files
+})
+
+# Hidden files that are still scanned
+ALLOWED_DOTFILES = frozenset({'.gitignore', '.dockerignore'})
+
+# Dependency management files: exact names, or globs with a single '*'
+DEP_PATTERNS = [
+    # Python
+    'requirements.txt', 'requirements-*.txt', 'Pipfile', 'pyproject.toml', 'setup.py',
+    # JavaScript/Node
+    'package.json', 'package-lock.json', 'yarn.lock', 'npm-shrinkwrap.json',
+    # Java
+    'pom.xml', 'build.gradle', 'build.gradle.kts', 'gradle.properties',
+    # .NET
+    '*.csproj', '*.fsproj', '*.vbproj', 'packages.config', '*.sln',
+    # Go
+    'go.mod', 'go.sum', 'Gopkg.toml', 'Gopkg.lock',
+    # Ruby
+    'Gemfile', 'Gemfile.lock', '*.gemspec',
+    # PHP
+    'composer.json', 'composer.lock',
+    # Rust
+    'Cargo.toml', 'Cargo.lock',
+]
+
+
+def compile_dep_patterns(patterns: List[str]) -> Pattern[str]:
+    """
+    Compile dependency file patterns into one regex.
+    
+    File names are matched with ``fullmatch`` in a single call, instead of
+    testing each pattern in turn.
+    """
+    return re.compile('|'.join(fnmatch.translate(pattern) for pattern in patterns))
+
+
+DEP_FILE_RE = compile_dep_patterns(DEP_PATTERNS)
+
+
+def find_dependency_files(workspace_path: str, patterns: Optional[List[str]] = None) -> List[str]:
+    """
+    Find dependency files in the workspace with a single directory walk.
+    
+    Args:
+        workspace_path: Path to the workspace to scan
+        patterns: Exact file names or single-'*' globs (defaults to DEP_PATTERNS)
+        
+    Returns:
+        Paths of matching files, relative to the workspace
+    """
+    return _scan_workspace(workspace_path, patterns)['dep_files']
+
+
+def scan_workspace(workspace_path: str) -> dict:
+    """
+    Walk the workspace once and collect the file information analyzers share.
+    
+    The result can be passed to detect_applicable_analyzers and to each
+    analyzer's is_applicable / run_analysis as ``file_info``.
+    
+    Args:
+        workspace_path: Path to the workspace to scan
+        
+    Returns:
+        Dict with file extensions, files, basenames, directories and dependency files
+    """
+    return _scan_workspace(workspace_path)
+
+
+def detect_applicable_analyzers(workspace_path: str, available_analyzers: List[str],
+                                file_info: Optional[dict] = None) -> List[str]:
     """
     Detect which analyzers should run based on workspace contents.
     
     Args:
         workspace_path: Path to the workspace to analyze
         available_analyzers: List of available analyzer names
+        file_info: Result of scan_workspace, if the caller already has one
         
     Returns:
         List of analyzer names that should be applied
@@ -23,7 +118,8 @@ def detect_applicable_analyzers(workspace_path: str, available_analyzers: List[s
     applicable = []
     
     # Get file extensions and special files in workspace
-    file_info = _scan_workspace(workspace_path)
+    if file_info is None:
+        file_info = _scan_workspace(workspace_path)
     
     for analyzer in available_analyzers:
         if _is_analyzer_applicable(analyzer, file_info, workspace_path):
@@ -35,44 +131,56 @@ def detect_applicable_analyzers(workspace_path: str, available_analyzers: List[s
     return applicable
 
 
-def _scan_workspace(workspace_path: str) -> dict:
+def _scan_workspace(workspace_path: str, dep_patterns: Optional[List[str]] = None) -> dict:
     """
     Scan workspace to get file type information.
     
+    Dependency files are classified during the same walk, so callers never
+    need a second pass (or a glob per pattern) to find them.
+    
+    Args:
+        workspace_path: Path to the workspace to scan
+        dep_patterns: Dependency file patterns (defaults to DEP_PATTERNS)
+    
     Returns:
-        Dict with file extensions, special files, and other metadata
+        Dict with file extensions, special files, dependency files and other metadata
     """
     file_info = {
         'extensions': set(),
         'files': set(),
+        'basenames': set(),
         'total_files': 0,
-        'directories': set()
+        'directories': set(),
+        'dep_files': []
     }
+    dep_match = (DEP_FILE_RE if dep_patterns is None else compile_dep_patterns(dep_patterns)).fullmatch
     
     try:
-        for root, dirs, files in os.walk(workspace_path):
-            # Skip ignored directories
-            dirs[:] = [d for d in dirs if not _is_ignored_directory(d)]
+        for entry, rel_path in _iter_entries(workspace_path):
+            # DirEntry caches its type, so these checks cost no extra stat
+            if entry.is_dir(follow_symlinks=False):
+                # Track directories
+                file_info['directories'].add(rel_path)
+                continue
+            
+            name = entry.name
+            # Get file extension (a leading dot doesn't start one, as in splitext)
+            dot = name.rfind('.')
+            ext = name[dot:].lower() if dot > 0 else ''
+            
+            # Same rules as _is_ignored_file, inlined for the per-file hot path
+            if (name[0] == '.' and name not in ALLOWED_DOTFILES) or ext in IGNORED_EXTS or not entry.is_file():
+                continue
+            
+            file_info['files'].add(rel_path)
+            file_info['basenames'].add(name)
+            file_info['total_files'] += 1
             
-            for file in files:
-                if _is_ignored_file(file):
-                    continue
-                    
-                file_path = os.path.join(root, file)
-                rel_path = os.path.relpath(file_path, workspace_path)
-                
-                file_info['files'].add(rel_path)
-                file_info['total_files'] += 1
-                
-                # Get file extension
-                _, ext = os.path.splitext(file)
-                if ext:
-                    file_info['extensions'].add(ext.lower())
+            if dep_match(name):
+                file_info['dep_files'].append(rel_path)
             
-            # Track directories
-            for dir_name in dirs:
-                dir_path = os.path.relpath(os.path.join(root, dir_name), workspace_path)
-                file_info['directories'].add(dir_path)
+            if ext:
+                file_info['extensions'].add(ext)
     
     except Exception as e:
         logger.error(f"Error scanning workspace {workspace_path}: {e}")
@@ -80,6 +188,79 @@ def _scan_workspace(workspace_path: str) -> dict:
     return file_info
 
 
+def _iter_entries(workspace_path: str):
+    """
+    Walk the workspace with os.scandir, skipping ignored directories.
+    
+    Yields:
+        (DirEntry, path relative to the workspace) for every file and
+        non-ignored directory, built from the parent's relative prefix
+        instead of os.path.relpath
+    """
+    stack = [(workspace_path, '')]
+    while stack:
+        dir_path, rel_prefix = stack.pop()
+        try:
+            entries = os.scandir(dir_path)
+        except OSError as e:
+            # os.walk silently skips unreadable directories as well
+            logger.debug(f"Skipping unreadable directory {dir_path}: {e}")
+            continue
+        
+        with entries:
+            for entry in entries:
+                name = entry.name
+                rel_path = rel_prefix + name
+                if entry.is_dir(follow_symlinks=False):
+                    # Same rules as _is_ignored_directory, inlined for the hot path
+                    if name[0] == '.' or name.lower() in IGNORED_DIRS:
+                        continue
+                    stack.append((entry.path, rel_path + os.sep))
+                yield entry, rel_path
+
+
+# Extensions that make each analyzer applicable
+PYTHON_EXTS = frozenset({'.py', '.pyw'})
+SEMGREP_EXTS = frozenset({
+    '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.go', 
+    '.c', '.cpp', '.cc', '.cxx', '.h', '.hpp',
+    '.rb', '.php', '.scala', '.kt', '.swift',
+    '.cs', '.fs', '.vb', '.rs', '.sh', '.bash',
+    '.yaml', '.yml', '.json', '.xml', '.html',
+    '.dockerfile'
+})
+JS_EXTS = frozenset({'.js', '.jsx', '.ts', '.tsx', '.vue'})
+
+
+def _has_python_dependencies(file_info: dict, workspace_path: str) -> bool:
+    """Safety rule: Python sources or a requirements file."""
+    if not file_info['extensions'].isdisjoint(PYTHON_EXTS):
+        return True
+    # Distinct file names are usually far fewer than paths
+    basenames = file_info['basenames']
+    return 'requirements.txt' in basenames or any(
+        name.endswith('requirements.txt') for name in basenames
+    )
+
+
+# Analyzer name -> rule(file_info, workspace_path) deciding whether it should run
+APPLICABILITY_RULES: Dict[str, Callable[[dict, str], bool]] = {
+    # Bandit for Python files
+    'bandit': lambda file_info, _: not file_info['extensions'].isdisjoint(PYTHON_EXTS),
+    # Semgrep supports multiple languages - run if any supported files
+    'semgrep': lambda file_info, _: not file_info['extensions'].isdisjoint(SEMGREP_EXTS),
+    # Dependency check - look for dependency files
+    'depcheck': lambda file_info, workspace_path: bool(_find_dependency_files(workspace_path, file_info)),
+    'dep': lambda file_info, workspace_path: bool(_find_dependency_files(workspace_path, file_info)),
+    # ESLint for JavaScript/TypeScript
+    'eslint': lambda file_info, _: not file_info['extensions'].isdisjoint(JS_EXTS),
+    # GoSec for Go files
+    'gosec': lambda file_info, _: '.go' in file_info['extensions'],
+    # Safety for Python dependencies
+    'safety': _has_python_dependencies,
+}
+
+
 def _is_analyzer_applicable(analyzer_name: str, file_info: dict, workspace_path: str) -> bool:
     """
     Check if a specific analyzer should run based on workspace contents.
@@ -92,47 +273,9 @@ def _is_analyzer_applicable(analyzer_name: str, file_info: dict, workspace_path:
     Returns:
         True if analyzer should run
     """
-    
-    if analyzer_name == "bandit":
-        # Bandit for Python files
-        python_exts = {'.py', '.pyw'}
-        return bool(file_info['extensions'] & python_exts)
-    
-    elif analyzer_name == "semgrep":
-        # Semgrep supports multiple languages - run if any supported files
-        supported_exts = {
-            '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.go', 
-            '.c', '.cpp', '.cc', '.cxx', '.h', '.hpp',
-            '.rb', '.php', '.scala', '.kt', '.swift',
-            '.cs', '.fs', '.vb', '.rs', '.sh', '.bash',
-            '.yaml', '.yml', '.json', '.xml', '.html',
-            '.dockerfile'
-        }
-        return bool(file_info['extensions'] & supported_exts)
-    
-    elif analyzer_name == "depcheck" or analyzer_name == "dep":
-        # Dependency check - look for dependency files
-        dep_files = _find_dependency_files(workspace_path, file_info)
-        return len(dep_files) > 0
-    
-    elif analyzer_name == "eslint":
-        # ESLint for JavaScript/TypeScript
-        js_exts = {'.js', '.jsx', '.ts', '.tsx', '.vue'}
-        return bool(file_info['extensions'] & js_exts)
-    
-    elif analyzer_name == "gosec":
-        # GoSec for Go files
-        return '.go' in file_info['extensions']
-    
-    elif analyzer_name == "safety":
-        # Safety for Python dependencies
-        python_exts = {'.py', '.pyw'}
-        has_python = bool(file_info['extensions'] & python_exts)
-        has_requirements = any(f for f in file_info['files'] if f.endswith('requirements.txt'))
-        return has_python or has_requirements
-    
+    rule = APPLICABILITY_RULES.get(analyzer_name)
     # Default: run analyzer if we don't know better
-    return True
+    return rule is None or rule(file_info, workspace_path)
 
 
 def _find_dependency_files(workspace_path: str, file_info: dict) -> List[str]:
@@ -140,81 +283,27 @@ def _find_dependency_files(workspace_path: str, file_info: dict) -> List[str]:
     Find dependency management files in the workspace.
     
     Returns:
-        List of dependency files found
-    """
-    dep_patterns = [
-        # Python
-        'requirements.txt', 'requirements-*.txt', 'Pipfile', 'pyproject.toml', 'setup.py',
-        # JavaScript/Node
-        'package.json', 'package-lock.json', 'yarn.lock', 'npm-shrinkwrap.json',
-        # Java
-        'pom.xml', 'build.gradle', 'build.gradle.kts', 'gradle.properties',
-        # .NET
-        '*.csproj', '*.fsproj', '*.vbproj', 'packages.config', '*.sln',
-        # Go
-        'go.mod', 'go.sum', 'Gopkg.toml', 'Gopkg.lock',
-        # Ruby
-        'Gemfile', 'Gemfile.lock', '*.gemspec',
-        # PHP
-        'composer.json', 'composer.lock',
-        # Rust
-        'Cargo.toml', 'Cargo.lock',
-    ]
-    
-    found_files = []
-    
-    for pattern in dep_patterns:
-        if '*' in pattern:
-            # Use glob for wildcard patterns
-            matches = glob.glob(os.path.join(workspace_path, '**', pattern), recursive=True)
-            for match in matches:
-                rel_path = os.path.relpath(match, workspace_path)
-                if not _is_ignored_file(os.path.basename(match)):
-                    found_files.append(rel_path)
-        else:
-            # Direct file check
-            if pattern in [os.path.basename(f) for f in file_info['files']]:
-                found_files.append(pattern)
-    
-    return found_files
+        List of dependency files found (collected by _scan_workspace)
+    """
+    if 'dep_files' not in file_info:
+        return find_dependency_files(workspace_path)
+    return file_info['dep_files']
 
 
 def _is_ignored_directory(dir_name: str) -> bool:
     """Check if directory should be ignored."""
-    ignored_dirs = {
-        '.git', '.svn', '.hg', '.bzr',  # VCS
-        'node_modules', 'bower_components',  # JS
-        '__pycache__', '.pytest_cache', 'venv', '.venv', 'env', '.env',  # Python
-        'target', 'build', 'dist', 'out',  # Build outputs
-        '.idea', '.vscode', '.vs',  # IDEs
-        'vendor',  # Dependencies
-        'tmp', 'temp', 'cache', '.cache',  # Temp
-        'logs', 'log',  # Logs
-    }
-    return dir_name.lower() in ignored_dirs or dir_name.startswith('.')
+    return dir_name.startswith('.') or dir_name.lower() in IGNORED_DIRS
 
 
 def _is_ignored_file(file_name: str) -> bool:
     """Check if file should be ignored."""
     # Ignore hidden files, temp files, and large binaries
-    if file_name.startswith('.') and file_name not in ['.gitignore', '.dockerignore']:
+    if file_name.startswith('.') and file_name not in ALLOWED_DOTFILES:
         return True
     
     # Ignore common non-source files
-    ignored_exts = {
-        '.pyc', '.pyo', '.pyd',  # Python compiled
-        '.class', '.jar',  # Java compiled  
-        '.o', '.so', '.dll', '.dylib',  # Compiled binaries
-        '.exe', '.bin',  # Executables
-        '.zip', '.tar', '.gz', '.bz2', '.xz',  # Archives
-        '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.svg',  # Images
-        '.mp3', '.mp4', '.avi', '.mov', '.wmv',  # Media
-        '.pdf', '.doc', '.docx', '.xls', '.xlsx',  # Documents
-        '.log', '.tmp', '.temp', '.cache',  # Temp/log files
-    }
-    
     _, ext = os.path.splitext(file_name)
-    return ext.lower() in ignored_exts
+    return ext.lower() in IGNORED_EXTS
 
 
 def get_analyzer_defaults() -> List[str]:
@@ -1,27 +1,132 @@
 """Semgrep security analyzer runner."""
 
-import json
+import asyncio
+import atexit
+import functools
+import itertools
+import logging
+import multiprocessing
 import os
+import re
 import subprocess
-import tempfile
+import sys
+import threading
 import time
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
 
-from .base import BaseAnalyzer, AnalyzerResult, Issue, Severity, analyzer_registry
+import ijson
+
+from .base import (
+    BaseAnalyzer, AnalyzerResult, Issue, CRITICAL, HIGH, MEDIUM, LOW, SEVERITY_MAP, analyzer_registry,
+    available_cpu_count, run_async
+)
+from .detect import SEMGREP_EXTS
+
+
+# Read size for Semgrep's report on stdout, so ijson is fed large chunks
+OUTPUT_BUFFER_SIZE = 1 << 20
+
+# Semgrep supports many languages; detect.py's list of their source file
+# extensions is shared, so selection and is_applicable agree
+SUPPORTED_EXTENSIONS = SEMGREP_EXTS
+
+# Reports with at least this many findings are converted to Issues in a
+# process pool, in batches; smaller ones aren't worth the IPC
+PARALLEL_CONVERT_MIN_FINDINGS = 1000
+CONVERT_BATCH_SIZE = 500
+
+# Directories skipped when looking for source files, besides hidden ones
+SKIP_DIRS = frozenset({'node_modules', '__pycache__'})
+
+# Semgrep reports severities in upper case ("ERROR", "WARNING", "INFO"); an
+# exact-match lookup skips _parse_severity's lower()/strip() for those
+SEMGREP_SEVERITY_MAP = {raw.upper(): severity for raw, severity in SEVERITY_MAP.items()}
+
+# Rule ID fragments that imply a severity when a finding carries none
+CRITICAL_PATTERNS = ('critical', 'remote-code-execution', 'authentication-bypass')
+HIGH_PATTERNS = (
+    'sql-injection', 'xss', 'command-injection', 'path-traversal',
+    'deserialization', 'crypto', 'hardcoded-password', 'rce'
+)
+LOW_PATTERNS = ('info', 'debug', 'comment', 'todo', 'unused')
+
+# All three groups in one pass over a lowercased rule ID; zero-width matches
+# so a fragment can't hide another one overlapping it
+SEVERITY_PATTERNS_RE = re.compile(
+    '(?=(?P<critical>' + '|'.join(map(re.escape, CRITICAL_PATTERNS)) + ')'
+    '|(?P<high>' + '|'.join(map(re.escape, HIGH_PATTERNS)) + ')'
+    '|(?P<low>' + '|'.join(map(re.escape, LOW_PATTERNS)) + '))'
+)
+
+
+def _workspace_has_supported_file(workspace_path: str) -> bool:
+    """Search the workspace for a file Semgrep can scan, stopping at the first hit."""
+    # Iterative DFS over scandir entries; DirEntry caches its type, so there
+    # is no extra stat per entry
+    stack = [workspace_path]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                name = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if not name.startswith('.') and name not in SKIP_DIRS:
+                        stack.append(entry.path)
+                    continue
+                
+                dot = name.rfind('.')
+                if dot > 0 and name[dot:].lower() in SUPPORTED_EXTENSIONS:
+                    return True
+    return False
+
+
+_convert_pool: Optional[ProcessPoolExecutor] = None
+_convert_pool_lock = threading.Lock()
+
+
+def get_convert_pool() -> ProcessPoolExecutor:
+    """Get the process-wide pool for finding conversion, creating it on first use."""
+    global _convert_pool
+    with _convert_pool_lock:
+        if _convert_pool is None:
+            # Workers are spawned, not forked: the API server has threads running
+            _convert_pool = ProcessPoolExecutor(
+                max_workers=available_cpu_count(),
+                mp_context=multiprocessing.get_context('spawn')
+            )
+            atexit.register(_convert_pool.shutdown)
+        return _convert_pool
+
+
+def _batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield successive lists of up to size items."""
+    items = iter(items)
+    while batch := list(itertools.islice(items, size)):
+        yield batch
+
+
+@functools.lru_cache(maxsize=None)
+def _batch_converter() -> "SemgrepAnalyzer":
+    """Analyzer instance used by conversion workers, one per process."""
+    return SemgrepAnalyzer()
+
+
+def _convert_batch(findings: List[Dict[str, Any]], workspace_path: str) -> List[Issue]:
+    """Convert a batch of Semgrep findings to Issues (runs in a pool worker)."""
+    return _batch_converter()._convert_findings(findings, workspace_path)
 
 
 class SemgrepAnalyzer(BaseAnalyzer):
     """Semgrep static analysis security scanner."""
     
-    def __init__(self, timeout_sec: int = 300, rulesets: Optional[List[str]] = None):
+    name = "semgrep"
+    
+    def __init__(self, timeout_sec: int = 300, rulesets: Optional[List[str]] = None, jobs: Optional[int] = None):
         super().__init__(timeout_sec)
         self.rulesets = rulesets or ["p/owasp-top-ten", "p/security-audit"]
-        
-    @property
-    def name(self) -> str:
-        return "semgrep"
+        self.jobs = jobs or available_cpu_count()  # Semgrep worker processes, split across rulesets
     
-    @property
+    @functools.cached_property
     def version(self) -> str:
         """Get Semgrep version."""
         try:
@@ -39,83 +144,62 @@ class SemgrepAnalyzer(BaseAnalyzer):
         except Exception:
             return "unknown"
     
-    def is_applicable(self, workspace_path: str) -> bool:
+    def is_applicable(self, workspace_path: str, file_info: Optional[Dict[str, Any]] = None) -> bool:
         """Check if Semgrep should run on this workspace."""
-        # Semgrep supports many languages, check for common source file extensions
-        supported_extensions = {
-            '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.go',
-            '.c', '.cpp', '.cc', '.cxx', '.h', '.hpp',
-            '.rb', '.php', '.scala', '.kt', '.swift', '.cs',
-            '.yaml', '.yml', '.json', '.dockerfile'
-        }
+        # A shared workspace scan already knows every extension
+        if file_info is not None:
+            return not file_info['extensions'].isdisjoint(SUPPORTED_EXTENSIONS)
         
         try:
-            for root, dirs, files in os.walk(workspace_path):
-                # Skip common ignore directories
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__']]
-                
-                for file in files:
-                    _, ext = os.path.splitext(file)
-                    if ext.lower() in supported_extensions:
-                        return True
-            return False
+            return _workspace_has_supported_file(workspace_path)
         except Exception as e:
-            self.logger.error(f"Error checking workspace applicability: {e}")
+            self.logger.error("Error checking workspace applicability: %s", e)
             return False
     
-    def run_analysis(self, workspace_path: str, **kwargs) -> AnalyzerResult:
+    def run_analysis(self, workspace_path: str, file_info: Optional[Dict[str, Any]] = None, **kwargs) -> AnalyzerResult:
         """Run Semgrep analysis on the workspace."""
+        return run_async(self.run_analysis_async(workspace_path, file_info, **kwargs))
+    
+    async def run_analysis_async(self, workspace_path: str, file_info: Optional[Dict[str, Any]] = None, **kwargs) -> AnalyzerResult:
+        """Run Semgrep analysis on the workspace without blocking the event loop.
+        
+        Semgrep runs through asyncio's subprocess support, so several scans
+        can share one loop instead of each holding a thread.
+        """
         start_time = time.time()
         issues = []
         error_message = None
         
         try:
-            # Create temporary file for output
-            with tempfile.NamedTemporaryFile(mode='w+', suffix='.json', delete=False) as tmp_file:
-                output_file = tmp_file.name
+            # Several rulesets run as concurrent Semgrep processes, each
+            # with its share of the CPUs; otherwise one process gets them all
+            if len(self.rulesets) > 1:
+                config_groups = [[ruleset] for ruleset in self.rulesets]
+            else:
+                config_groups = [self.rulesets]
+            jobs = max(1, self.jobs // len(config_groups))
             
-            # Build Semgrep command
-            cmd = [
-                "semgrep",
-                "--config=auto",  # Use registry rules
-                "--json",
-                f"--output={output_file}",
-                "--quiet",
-                "--no-git-ignore",  # We handle ignores ourselves
-                workspace_path
-            ]
+            results = await asyncio.gather(*(
+                self._run_semgrep(configs, jobs, workspace_path) for configs in config_groups
+            ))
             
-            # Add custom rulesets if specified
-            if self.rulesets:
-                cmd = [
-                    "semgrep",
-                    "--json", 
-                    f"--output={output_file}",
-                    "--quiet",
-                    "--no-git-ignore"
-                ]
-                
-                for ruleset in self.rulesets:
-                    cmd.extend(["--config", ruleset])
+            success = True
+            # Separate rulesets can share rules, so their findings are merged
+            # by rule, exact location and message; a single run has no overlap
+            seen = set() if len(config_groups) > 1 else None
+            for group_error, group_issues in results:
+                if seen is None:
+                    issues.extend(group_issues)
+                else:
+                    for issue in group_issues:
+                        key = (issue.rule_id, issue.file, issue.line, issue.column, issue.message)
+                        if key not in seen:
+                            seen.add(key)
+                            issues.append(issue)
                 
-                cmd.append(workspace_path)
-            
-            self.logger.info(f"Running Semgrep with command: {' '.join(cmd)}")
-            
-            # Run Semgrep
-            result = self._run_command(cmd, workspace_path, capture_output=True)
-            
-            # Parse results
-            if os.path.exists(output_file):
-                issues = self._parse_semgrep_output(output_file, workspace_path)
-                os.unlink(output_file)  # Clean up temp file
-            
-            # Semgrep returns non-zero when findings are found, which is expected
-            success = result.returncode in [0, 1]  # 0 = no findings, 1 = findings found
-            
-            if result.returncode > 1:
-                error_message = f"Semgrep failed with code {result.returncode}: {result.stderr}"
-                success = False
+                if group_error:
+                    error_message = group_error
+                    success = False
             
         except subprocess.TimeoutExpired:
             error_message = f"Semgrep analysis timed out after {self.timeout_sec} seconds"
@@ -123,13 +207,6 @@ class SemgrepAnalyzer(BaseAnalyzer):
         except Exception as e:
             error_message = f"Semgrep analysis failed: {str(e)}"
             success = False
-        finally:
-            # Clean up temp file if it exists
-            if 'output_file' in locals() and os.path.exists(output_file):
-                try:
-                    os.unlink(output_file)
-                except Exception:
-                    pass
         
         duration_ms = int((time.time() - start_time) * 1000)
         
@@ -141,43 +218,122 @@ class SemgrepAnalyzer(BaseAnalyzer):
             error_message=error_message
         )
     
-    def _parse_semgrep_output(self, output_file: str, workspace_path: str) -> List[Issue]:
-        """Parse Semgrep JSON output into normalized Issues."""
+    async def _run_semgrep(self, configs: List[str], jobs: int,
+                           workspace_path: str) -> Tuple[Optional[str], List[Issue]]:
+        """Run one Semgrep process over the workspace and parse its report.
+        
+        Returns an (error message or None, issues) pair.
+        """
+        # Build Semgrep command
+        cmd = [
+            "semgrep",
+            "--json",
+            "--quiet",
+            "--no-git-ignore",  # We handle ignores ourselves
+            "--metrics=off",  # No usage-metrics upload holding up the scan
+            "--jobs", str(jobs)
+        ]
+        
+        # Configured rulesets, or the registry's auto config without any
+        if configs:
+            for config in configs:
+                cmd.extend(["--config", config])
+        else:
+            cmd.append("--config=auto")
+        
+        cmd.append(workspace_path)
+        
+        # Joining the command is skipped entirely when INFO is off
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Running Semgrep with command: %s", ' '.join(cmd))
+        
+        # Run Semgrep, parsing its JSON report straight off stdout as it is written
+        result, issues = await self._stream_command_async(
+            cmd, workspace_path, lambda stdout: self._parse_semgrep_output(stdout, workspace_path)
+        )
+        
+        # Semgrep returns non-zero when findings are found, which is expected
+        # (0 = no findings, 1 = findings found)
+        if result.returncode > 1:
+            return f"Semgrep failed with code {result.returncode}: {result.stderr}", issues
+        return None, issues
+    
+    async def _parse_semgrep_output(self, stdout: asyncio.StreamReader, workspace_path: str) -> List[Issue]:
+        """Parse Semgrep's JSON report from its stdout into normalized Issues.
+        
+        Findings are streamed with ijson. Small reports are converted inline;
+        large ones are split into batches converted in parallel by the
+        conversion pool, and the batches' Issues are joined in report order.
+        The stream is always read to EOF, so Semgrep never blocks on a full pipe.
+        """
         issues = []
         
         try:
-            with open(output_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
             # Semgrep JSON format has 'results' array
-            results = data.get('results', [])
+            findings = ijson.items_async(stdout, 'results.item', buf_size=OUTPUT_BUFFER_SIZE)
+            head = []
+            async for finding in findings:
+                head.append(finding)
+                if len(head) == PARALLEL_CONVERT_MIN_FINDINGS:
+                    break
             
-            for finding in results:
-                try:
-                    issue = self._convert_semgrep_finding(finding, workspace_path)
-                    if issue:
-                        issues.append(issue)
-                except Exception as e:
-                    self.logger.warning(f"Failed to parse Semgrep finding: {e}")
-                    continue
+            if len(head) < PARALLEL_CONVERT_MIN_FINDINGS:
+                issues = self._convert_findings(head, workspace_path)
+            else:
+                # Batches are submitted as they fill, so conversion overlaps the scan
+                pool = get_convert_pool()
+                futures = [
+                    pool.submit(_convert_batch, batch, workspace_path)
+                    for batch in _batched(head, CONVERT_BATCH_SIZE)
+                ]
+                batch = []
+                async for finding in findings:
+                    batch.append(finding)
+                    if len(batch) == CONVERT_BATCH_SIZE:
+                        futures.append(pool.submit(_convert_batch, batch, workspace_path))
+                        batch = []
+                if batch:
+                    futures.append(pool.submit(_convert_batch, batch, workspace_path))
+                for future in futures:
+                    issues.extend(await asyncio.wrap_future(future))
         
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Failed to parse Semgrep JSON output: {e}")
+        except ijson.IncompleteJSONError as e:
+            # Semgrep exited without a (complete) report; the exit code carries the error
+            self.logger.debug("Semgrep wrote no complete report: %s", e)
+        except ijson.JSONError as e:
+            self.logger.error("Failed to parse Semgrep JSON output: %s", e)
         except Exception as e:
-            self.logger.error(f"Error reading Semgrep output: {e}")
+            self.logger.error("Error reading Semgrep output: %s", e)
         
+        # Drain whatever the parser stopped short of
+        while await stdout.read(OUTPUT_BUFFER_SIZE):
+            pass
+        
+        return issues
+    
+    def _convert_findings(self, findings: Iterable[Dict[str, Any]], workspace_path: str) -> List[Issue]:
+        """Convert Semgrep findings to Issues, skipping any that fail to convert."""
+        issues = []
+        for finding in findings:
+            try:
+                issue = self._convert_semgrep_finding(finding, workspace_path)
+                if issue:
+                    issues.append(issue)
+            except Exception as e:
+                self.logger.warning("Failed to parse Semgrep finding: %s", e)
         return issues
     
     def _convert_semgrep_finding(self, finding: Dict[str, Any], workspace_path: str) -> Optional[Issue]:
         """Convert a single Semgrep finding to normalized Issue."""
         try:
             # Extract basic information
-            check_id = finding.get('check_id', 'unknown')
+            check_id = sys.intern(finding.get('check_id', 'unknown'))
             message = finding.get('message', 'Security issue detected')
             
             # Get file path and line number
             path = finding.get('path', '')
-            start_line = finding.get('start', {}).get('line', 1)
+            start = finding.get('start', {})
+            start_line = start.get('line', 1)
             
             # Normalize file path
             normalized_path = self._normalize_file_path(path, workspace_path)
@@ -199,53 +355,55 @@ class SemgrepAnalyzer(BaseAnalyzer):
                 file=normalized_path,
                 line=start_line,
                 rule_id=check_id,
-                suggestion=suggestion
+                suggestion=suggestion,
+                column=start.get('col')
             )
             
         except Exception as e:
-            self.logger.warning(f"Error converting Semgrep finding: {e}")
+            self.logger.warning("Error converting Semgrep finding: %s", e)
             return None
     
-    def _determine_semgrep_severity(self, finding: Dict[str, Any]) -> Severity:
+    def _semgrep_severity(self, raw_severity: Any) -> str:
+        """Map a raw severity value, trying Semgrep's exact spellings first."""
+        if isinstance(raw_severity, str):
+            severity = SEMGREP_SEVERITY_MAP.get(raw_severity)
+            if severity is not None:
+                return severity
+        return self._parse_severity(str(raw_severity))
+    
+    def _determine_semgrep_severity(self, finding: Dict[str, Any]) -> str:
         """Determine severity from Semgrep finding."""
         # Try to get severity from metadata
         extra = finding.get('extra', {})
         
         # Check for explicit severity
         if 'severity' in extra:
-            raw_severity = extra['severity']
-            return self._parse_severity(str(raw_severity))
+            return self._semgrep_severity(extra['severity'])
         
         # Check metadata for severity indicators
         metadata = extra.get('metadata', {})
         if 'severity' in metadata:
-            raw_severity = metadata['severity']
-            return self._parse_severity(str(raw_severity))
+            return self._semgrep_severity(metadata['severity'])
         
-        # Infer from rule ID patterns
+        # Infer from rule ID patterns; the most severe match wins
         check_id = finding.get('check_id', '').lower()
         
-        # High severity patterns
-        if any(pattern in check_id for pattern in [
-            'sql-injection', 'xss', 'command-injection', 'path-traversal',
-            'deserialization', 'crypto', 'hardcoded-password', 'rce'
-        ]):
-            return Severity.HIGH
-        
-        # Critical patterns
-        if any(pattern in check_id for pattern in [
-            'critical', 'remote-code-execution', 'authentication-bypass'
-        ]):
-            return Severity.CRITICAL
-        
-        # Low severity patterns  
-        if any(pattern in check_id for pattern in [
-            'info', 'debug', 'comment', 'todo', 'unused'
-        ]):
-            return Severity.LOW
+        has_high = has_low = False
+        for match in SEVERITY_PATTERNS_RE.finditer(check_id):
+            if match.group('critical') is not None:
+                return CRITICAL
+            if match.group('high') is not None:
+                has_high = True
+            else:
+                has_low = True
+        
+        if has_high:
+            return HIGH
+        if has_low:
+            return LOW
         
         # Default to medium
-        return Severity.MEDIUM
+        return MEDIUM
 
 
 # Register the analyzer
@@ -1,21 +1,26 @@
 """Main FastAPI application for CodeAgent Vulnerability Scanner."""
 
 import asyncio
-import json
+import concurrent.futures
+import functools
 import logging
 import os
-import hmac
-import hashlib
+import threading
 import uuid
+from dataclasses import asdict, dataclass
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from email.utils import formatdate
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, NamedTuple, Set
 import tempfile
 import shutil
 
+import aiofiles
 import httpx
+import orjson
+from tenacity import AsyncRetrying, retry_if_exception_type, stop_after_attempt, wait_exponential
 from fastapi import FastAPI, HTTPException, BackgroundTasks, Request, Response, File, Form, UploadFile, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.responses import FileResponse, StreamingResponse, ORJSONResponse
 from starlette.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_202_ACCEPTED, HTTP_400_BAD_REQUEST
 import uvicorn
 
@@ -24,37 +29,125 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Import our modules
-from pipeline.orchestrator import get_orchestrator, JobOrchestrator
+from pipeline.orchestrator import get_orchestrator, write_file_atomic, JobOrchestrator
+from pipeline.report_index import ReportIndex, read_report_header
 from pipeline.report_schema import (
-    AnalyzeRequest, AnalyzeResponse, JobInfo, Report, ReportListResponse, 
+    AnalyzeRequest, AnalyzeResponse, JobInfo, JobStatus, Report, ReportListResponse, 
     ReportListItem, ToolsResponse, HealthResponse, ErrorResponse,
     WebhookConfig, WebhookPayload, AnalyzerConfig, SeveritySummary
 )
+# Importing the analyzers package registers every analyzer lazily; runner
+# modules (and the agent stack behind CamelBridge) load on first use
 from analyzers.base import analyzer_registry
-from integration.camel_bridge import CamelBridge
 
-# Register all analyzers
-from analyzers.semgrep_runner import SemgrepAnalyzer
-from analyzers.bandit_runner import BanditAnalyzer
-from analyzers.depcheck_runner import DepCheckAnalyzer
+if TYPE_CHECKING:
+    from integration.camel_bridge import CamelBridge
 
 # Configuration
 STORAGE_BASE = os.getenv("STORAGE_BASE", "./storage")
+REPORTS_DIR = os.path.join(STORAGE_BASE, "reports")
+WORKSPACE_DIR = os.path.join(STORAGE_BASE, "workspace")
 MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE", 50 * 1024 * 1024))  # 50MB
+UPLOAD_CHUNK_SIZE = 1 << 20  # Uploads are copied to disk 1MB at a time
+UPLOAD_FORM_OVERHEAD = 1 << 20  # Allowance for multipart framing and the other form fields
 MAX_CONCURRENT_JOBS = int(os.getenv("MAX_CONCURRENT_JOBS", 2))
+THREAD_POOL_SIZE = int(os.getenv("THREAD_POOL_SIZE", 32))  # asyncio.to_thread workers, per server process
+WEBHOOK_TIMEOUT_SEC = 30.0
+WEBHOOK_MAX_CONNECTIONS = 100
+WEBHOOK_MAX_KEEPALIVE = 20  # Idle connections kept open for reuse
+WEBHOOK_MAX_CONCURRENCY = 10  # Deliveries in flight at once per job
+WEBHOOK_ATTEMPTS = 3  # Tries per delivery on 5xx or connection errors
+WEBHOOK_BACKOFF_SEC = 1.0  # Base of the exponential wait between tries
+# Payloads for one webhook are collected for this long and sent as one JSON
+# array. Off (0) by default, so consumers keep getting one signed object per
+# event unless an operator opts in; 5 is the recommended value when enabled
+WEBHOOK_BATCH_TIMEOUT_SEC = float(os.getenv("WEBHOOK_BATCH_TIMEOUT_SECONDS", 0))
+WEBHOOK_BATCH_SIZE_LIMIT_BYTES = int(os.getenv("WEBHOOK_BATCH_SIZE_LIMIT_BYTES", 1024 * 1024))  # 1MB
+REPORT_CACHE_SIZE = 32  # Encoded enhanced reports kept in memory
+SSE_QUEUE_SIZE = 256  # Events buffered per subscriber before new ones are dropped
+SSE_MAX_JOBS = 10000  # Jobs with SSE subscribers; the oldest is closed beyond this
+SSE_HEARTBEAT_SEC = 30  # Idle time before a comment frame keeps proxies from closing a stream
+SSE_HEARTBEAT_FRAME = b":\n\n"
+TERMINAL_JOB_STATUSES = frozenset({
+    JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELED, JobStatus.EXPIRED
+})
 API_VERSION = "0.1.0"
 
+# ErrorResponse code -> HTTP status
+ERROR_STATUS_CODES = {
+    "INVALID_INPUT": 400,
+    "UNAUTHORIZED": 401,
+    "FORBIDDEN": 403,
+    "NOT_FOUND": 404,
+    "CONFLICT": 409,
+    "PAYLOAD_TOO_LARGE": 413,
+    "RATE_LIMIT": 429,
+    "TIMEOUT": 504,
+    "INTERNAL": 500
+}
+
+AI_MODELS = ("GPT_4", "GPT_3_5_TURBO", "GPT_4_32K")
+AI_SEVERITIES = ("critical", "high", "medium", "low")
+
+# AIConfig field -> environment variable it is read from
+AI_CONFIG_ENV = {
+    "enabled": "ENABLE_AI_ANALYSIS",
+    "model": "AI_MODEL",
+    "min_severity": "AI_ANALYSIS_MIN_SEVERITY",
+    "max_concurrent_reviews": "MAX_CONCURRENT_AI_REVIEWS",
+    "timeout_sec": "AI_ANALYSIS_TIMEOUT_SEC"
+}
+
 # Ensure storage directories exist
 for subdir in ["workspace", "reports", "logs"]:
     os.makedirs(os.path.join(STORAGE_BASE, subdir), exist_ok=True)
 
+
+class APIResponse(ORJSONResponse):
+    """JSON response rendered by orjson, also accepting non-string dict keys."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+class UploadSizeLimit:
+    """ASGI middleware answering 413 for /analyze requests whose Content-Length is too large.
+
+    The check runs before any of the body is received. Requests without a
+    Content-Length (chunked uploads) are still limited while the file is
+    copied to disk, see save_upload.
+    """
+    
+    def __init__(self, app, limit: int):
+        self.app = app
+        self.limit = limit
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith("/analyze"):
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    if value.isdigit() and int(value) > self.limit:
+                        response = error_response(
+                            "PAYLOAD_TOO_LARGE", f"File too large. Max size: {MAX_UPLOAD_SIZE} bytes"
+                        )
+                        await response(scope, receive, send)
+                        return
+                    break
+        await self.app(scope, receive, send)
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="CodeAgent Vulnerability Scanner API",
     version=API_VERSION,
-    description="Security vulnerability scanner for source code repositories"
+    description="Security vulnerability scanner for source code repositories",
+    default_response_class=APIResponse
 )
 
+# Oversized uploads are refused before their body is read (added first, so
+# the CORS middleware still wraps the 413)
+app.add_middleware(UploadSizeLimit, limit=MAX_UPLOAD_SIZE + UPLOAD_FORM_OVERHEAD)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -64,21 +157,121 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@dataclass
+class AIConfig:
+    """AI analysis settings, read from the environment once at import.
+    
+    PATCH /config/ai updates them at runtime and mirrors each change to the
+    environment variable it came from, for code that reads it on its own
+    (such as CamelBridge, for AI_MODEL).
+    """
+    enabled: bool
+    model: str
+    min_severity: str
+    max_concurrent_reviews: int
+    timeout_sec: int
+    
+    @classmethod
+    def from_env(cls) -> "AIConfig":
+        return cls(
+            enabled=os.getenv("ENABLE_AI_ANALYSIS", "true").lower() == "true",
+            model=os.getenv("AI_MODEL", "GPT_4"),
+            min_severity=os.getenv("AI_ANALYSIS_MIN_SEVERITY", "high"),
+            max_concurrent_reviews=int(os.getenv("MAX_CONCURRENT_AI_REVIEWS", "1")),
+            timeout_sec=int(os.getenv("AI_ANALYSIS_TIMEOUT_SEC", "300"))
+        )
+    
+    def update(self, changes: Dict[str, Any]):
+        """Apply validated field changes and mirror them to the environment."""
+        for field_name, value in changes.items():
+            setattr(self, field_name, value)
+            os.environ[AI_CONFIG_ENV[field_name]] = str(value).lower() if isinstance(value, bool) else str(value)
+
+
 # Global state
 orchestrator: Optional[JobOrchestrator] = None
-agent_bridge: Optional[CamelBridge] = None
+agent_bridge: Optional["CamelBridge"] = None
+# The orchestrator's index of stored reports, set at startup; the one
+# instance serves the API's reads and the orchestrator's writes
+report_index: Optional[ReportIndex] = None
+ai_config = AIConfig.from_env()
 webhooks: Dict[str, WebhookConfig] = {}
-sse_clients: Dict[str, List] = {}  # job_id -> list of response objects
+webhook_batches: Dict[str, "WebhookBatch"] = {}  # webhook_id -> payloads waiting to be sent
+sse_queues: Dict[str, List[asyncio.Queue]] = {}  # job_id -> one queue of (event type, frame) per SSE subscriber
+
+
+def read_json_file(path: str) -> Any:
+    """Read and parse a JSON file with orjson."""
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+async def load_json_file(path: str) -> Any:
+    """Read a JSON file (e.g. a stored report) off the event loop.
+    
+    Open, read and parse happen in one worker-thread hop rather than one
+    per file operation.
+    """
+    return await asyncio.to_thread(read_json_file, path)
+
+
+class ReportPaths(NamedTuple):
+    """Where a job's files live under STORAGE_BASE."""
+    report: str
+    enhanced: str
+    workspace: str
+
+
+def report_paths(job_id: str) -> ReportPaths:
+    """Paths of a job's report, AI-enhanced report and workspace."""
+    return ReportPaths(
+        report=f"{REPORTS_DIR}/{job_id}.json",
+        enhanced=f"{REPORTS_DIR}/{job_id}_enhanced.json",
+        workspace=f"{WORKSPACE_DIR}/{job_id}"
+    )
+
+
+def report_cache_headers(st: os.stat_result) -> Dict[str, str]:
+    """ETag and Last-Modified of a stored report file, for conditional GETs."""
+    return {
+        "ETag": f'W/"{st.st_mtime_ns:x}-{st.st_size:x}"',
+        "Last-Modified": formatdate(st.st_mtime, usegmt=True)
+    }
+
+
+def is_not_modified(request: Request, headers: Dict[str, str]) -> bool:
+    """Whether the client's If-None-Match already names the current ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = {tag.strip() for tag in if_none_match.split(",")}
+    return "*" in tags or headers["ETag"] in tags
+
+
+@functools.lru_cache(maxsize=REPORT_CACHE_SIZE)
+def _load_report_bytes(path: str, mtime_ns: int, size: int) -> bytes:
+    """Validated, compact JSON of a report file; the stat fields key out stale entries."""
+    with open(path, "rb") as f:
+        return orjson.dumps(orjson.loads(f.read()))
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize application on startup."""
-    global orchestrator, agent_bridge
+    global orchestrator, agent_bridge, report_index
     orchestrator = get_orchestrator(STORAGE_BASE)
+    report_index = orchestrator.report_index
+    
+    # asyncio.to_thread work (report reads, tool version probes) runs on the
+    # default executor; size it explicitly rather than relying on asyncio's
+    # min(32, cpu_count + 4). The pool is per process, so with uvicorn
+    # --workers N there are N of them.
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=THREAD_POOL_SIZE, thread_name_prefix="api-worker")
+    asyncio.get_running_loop().set_default_executor(executor)
     
     # Initialize AI agent bridge (multi-agent system)
     try:
+        from integration.camel_bridge import CamelBridge
         agent_bridge = CamelBridge()
         logger.info("Multi-Agent Bridge (CAMEL) initialized successfully")
     except Exception as e:
@@ -88,60 +281,107 @@ async def startup_event():
     # Register event callback for webhooks and SSE
     orchestrator.add_event_callback(handle_job_event)
     
+    # One pooled client for all webhook deliveries, so connections (and TLS
+    # sessions) are reused; it is bound to this loop, see process_completed_job
+    app.state.loop = asyncio.get_running_loop()
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        timeout=WEBHOOK_TIMEOUT_SEC,
+        limits=httpx.Limits(
+            max_connections=WEBHOOK_MAX_CONNECTIONS,
+            max_keepalive_connections=WEBHOOK_MAX_KEEPALIVE
+        )
+    )
+    
+    # Tool binaries don't change while the server runs, so their version
+    # commands are run once here rather than on every /tools request
+    app.state.tool_versions = await asyncio.to_thread(analyzer_registry.get_versions)
+    
+    # Completed-job processing (AI analysis) gets its own long-lived loop so
+    # that a slow analysis never stalls request handling
+    app.state.job_loop = asyncio.new_event_loop()
+    app.state.job_loop.set_default_executor(executor)
+    threading.Thread(target=app.state.job_loop.run_forever, name="job-events", daemon=True).start()
+    
     logger.info(f"CodeAgent Scanner API v{API_VERSION} started")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Clean up on shutdown."""
+    app.state.job_loop.call_soon_threadsafe(app.state.job_loop.stop)
+    
+    # Send what is still waiting before the client goes away; the webhooks
+    # are flushed together so one slow endpoint doesn't hold up the rest
+    pending = list(webhook_batches.items())
+    results = await asyncio.gather(*(batch.flush() for _, batch in pending), return_exceptions=True)
+    for (webhook_id, _), result in zip(pending, results):
+        if isinstance(result, Exception):
+            logger.error(f"Failed to flush webhook {webhook_id}: {result}")
+    await app.state.http.aclose()
     logger.info("CodeAgent Scanner API shutting down")
 
 
+@functools.lru_cache(maxsize=None)
+def sse_event_prefix(event_type: str) -> bytes:
+    """Wire-format start of an SSE event of this type, encoded once per type."""
+    return f"event: {event_type}\ndata: ".encode()
+
+
 def handle_job_event(job_id: str, event_type: str, data: Dict[str, Any]):
     """Handle job events for webhooks, SSE, and AI analysis."""
-    # Handle SSE clients
-    if job_id in sse_clients:
-        event_data = f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
-        for response in sse_clients[job_id][:]:  # Copy list to avoid modification during iteration
-            try:
-                # Note: This is simplified - in practice you'd need proper async handling
-                pass  # SSE would be handled differently in real implementation
-            except Exception as e:
-                logger.error(f"Failed to send SSE event: {e}")
-                sse_clients[job_id].remove(response)
+    # Handle SSE clients; events arrive on a job thread, and the queues
+    # belong to the server's event loop. The frame is encoded once here and
+    # the same bytes are written to every subscriber.
+    if sse_queues.get(job_id):
+        frame = sse_event_prefix(event_type) + orjson.dumps(data) + b"\n\n"
+        app.state.loop.call_soon_threadsafe(publish_sse_event, job_id, event_type, frame)
     
     # Handle webhooks and AI analysis for completion events
     if event_type == "finished" and data.get("status") == "completed":
-        # Run async function in background thread since we're in a sync context
-        import threading
-        def run_async_task():
-            try:
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                loop.run_until_complete(process_completed_job(job_id, data))
-                loop.close()
-            except Exception as e:
-                logger.error(f"Error in background AI analysis: {e}", exc_info=True)
-        
-        thread = threading.Thread(target=run_async_task, daemon=True)
-        thread.start()
+        future = asyncio.run_coroutine_threadsafe(process_completed_job(job_id, data), app.state.job_loop)
+        future.add_done_callback(log_job_processing_error)
+
+
+def log_job_processing_error(future: concurrent.futures.Future):
+    """Log a failure of process_completed_job, which has no caller to raise to."""
+    if not future.cancelled() and future.exception() is not None:
+        logger.error(f"Error in background AI analysis: {future.exception()}", exc_info=future.exception())
+
+
+def publish_sse_event(job_id: str, event_type: str, frame: bytes):
+    """Fan an encoded SSE frame out to every subscriber of a job (runs on the event loop)."""
+    if event_type == "finished":
+        # Nothing follows; the entry goes now rather than when the last
+        # subscriber notices, and every stream is made to see the end
+        for queue in sse_queues.pop(job_id, ()):
+            end_sse_stream(queue, event_type, frame)
+        return
+    
+    for queue in sse_queues.get(job_id, ()):
+        try:
+            queue.put_nowait((event_type, frame))
+        except asyncio.QueueFull:
+            # A subscriber that stopped reading must not hold up the others
+            logger.warning(f"SSE queue full for job {job_id}, dropping {event_type} event")
+
+
+def end_sse_stream(queue: asyncio.Queue, event_type: str, frame: bytes):
+    """Queue a stream's last event, discarding the oldest one if the queue is full."""
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait((event_type, frame))
 
 
 async def process_completed_job(job_id: str, data: Dict[str, Any]):
     """Process completed job: run AI analysis and deliver webhooks."""
     # First, trigger AI analysis if enabled
-    enable_ai = os.getenv("ENABLE_AI_ANALYSIS", "true").lower() == "true"
-    
-    if enable_ai and agent_bridge:
+    if ai_config.enabled and agent_bridge:
         try:
             # Get full report
-            report_file = os.path.join(STORAGE_BASE, "reports", f"{job_id}.json")
-            if os.path.exists(report_file):
-                with open(report_file, 'r') as f:
-                    report = json.load(f)
-                
-                # Get workspace path
-                workspace_path = os.path.join(STORAGE_BASE, "workspace", job_id)
+            paths = report_paths(job_id)
+            if os.path.exists(paths.report):
+                report = await load_json_file(paths.report)
                 
                 # Check if there are high/critical issues to analyze
                 summary = report.get('summary', {})
@@ -152,13 +392,12 @@ async def process_completed_job(job_id: str, data: Dict[str, Any]):
                     enhanced_report = await agent_bridge.process_vulnerabilities(
                         job_id=job_id,
                         report=report,
-                        workspace_path=workspace_path
+                        workspace_path=paths.workspace
                     )
                     
                     # Save enhanced report
-                    enhanced_file = os.path.join(STORAGE_BASE, "reports", f"{job_id}_enhanced.json")
-                    with open(enhanced_file, 'w') as f:
-                        json.dump(enhanced_report, f, indent=2)
+                    # Encoding a large report is CPU work; keep it off the loop
+                    await asyncio.to_thread(save_enhanced_report, job_id, paths.enhanced, enhanced_report)
                     
                     logger.info(f"AI analysis completed for job {job_id}")
                 else:
@@ -167,66 +406,166 @@ async def process_completed_job(job_id: str, data: Dict[str, Any]):
         except Exception as e:
             logger.error(f"AI analysis failed for job {job_id}: {e}")
     
-    # Then deliver webhooks
-    await deliver_webhooks(job_id, data)
+    # Then deliver webhooks on the server's loop, which owns the pooled client
+    await asyncio.wrap_future(
+        asyncio.run_coroutine_threadsafe(deliver_webhooks(job_id, data), app.state.loop)
+    )
+
+
+def save_enhanced_report(job_id: str, path: str, enhanced_report: Dict[str, Any]):
+    """Encode an AI-enhanced report and publish it in one step, so /enhanced never serves half a file.
+    
+    The report index is marked afterwards; this runs in a worker thread, as
+    both are blocking disk writes.
+    """
+    write_file_atomic(path, orjson.dumps(enhanced_report, option=orjson.OPT_INDENT_2))
+    report_index.mark_enhanced(job_id)
 
 
 async def deliver_webhooks(job_id: str, data: Dict[str, Any]):
-    """Deliver webhook notifications."""
-    for webhook_id, webhook in webhooks.items():
-        if "report.created" in webhook.events and webhook.active:
-            try:
-                # Get job info for payload
-                job_info = orchestrator.get_job_status(job_id)
-                if not job_info:
-                    continue
-                
-                # Create payload
-                payload = WebhookPayload(
-                    job_id=job_id,
-                    repo=None,  # Would need to get from job
-                    summary=SeveritySummary(),  # Would need to get from report
-                    report_url=f"/reports/{job_id}"
-                )
-                
-                # Send webhook
-                await send_webhook(webhook, payload.to_dict())
-                
-            except Exception as e:
-                logger.error(f"Failed to deliver webhook {webhook_id}: {e}")
+    """Deliver webhook notifications concurrently."""
+    targets = [
+        (webhook_id, webhook) for webhook_id, webhook in webhooks.items()
+        if "report.created" in webhook.events and webhook.active
+    ]
+    if not targets:
+        return
+    
+    # Get job info for payload (may be read from disk)
+    job_info = await asyncio.to_thread(orchestrator.get_job_status, job_id)
+    if not job_info:
+        return
+    
+    # Create payload
+    payload = WebhookPayload(
+        job_id=job_id,
+        repo=None,  # Would need to get from job
+        summary=SeveritySummary(),  # Would need to get from report
+        report_url=f"/reports/{job_id}"
+    ).to_dict()
+    
+    if WEBHOOK_BATCH_TIMEOUT_SEC > 0:
+        body = orjson.dumps(payload)
+        for webhook_id, webhook in targets:
+            batch = webhook_batches.get(webhook_id)
+            if batch is None:
+                batch = webhook_batches[webhook_id] = WebhookBatch(webhook)
+            batch.add(job_id, body)
+        return
+    
+    # Fan out so total time is the slowest endpoint, not the sum of all
+    semaphore = asyncio.Semaphore(WEBHOOK_MAX_CONCURRENCY)
+    
+    async def deliver(webhook: WebhookConfig):
+        async with semaphore:
+            await send_webhook(webhook, payload)
+    
+    results = await asyncio.gather(*(deliver(webhook) for _, webhook in targets), return_exceptions=True)
+    for (webhook_id, _), result in zip(targets, results):
+        if isinstance(result, Exception):
+            logger.error(f"Failed to deliver webhook {webhook_id}: {result}")
+
+
+class WebhookBatch:
+    """Encoded payloads waiting to be POSTed to one webhook as a JSON array.
+
+    Used only on the server's event loop. The batch is sent
+    WEBHOOK_BATCH_TIMEOUT_SEC after its first payload arrives, or as soon as
+    it reaches WEBHOOK_BATCH_SIZE_LIMIT_BYTES. A newer payload for a job that
+    is already waiting replaces the older one.
+    """
+    
+    def __init__(self, webhook: WebhookConfig):
+        self.webhook = webhook
+        self.pending: Dict[str, bytes] = {}  # job_id -> encoded payload
+        self.size = 0
+        self.timer: Optional[asyncio.Task] = None
+        self.sending: Set[asyncio.Task] = set()
+    
+    def add(self, job_id: str, body: bytes):
+        """Queue a job's payload and schedule (or trigger) the send."""
+        previous = self.pending.pop(job_id, None)
+        if previous is not None:
+            self.size -= len(previous) + 1
+        self.pending[job_id] = body
+        self.size += len(body) + 1  # Plus its separator
+        
+        if self.size >= WEBHOOK_BATCH_SIZE_LIMIT_BYTES:
+            self.send_pending()
+        elif self.timer is None:
+            self.timer = asyncio.create_task(self._send_after(WEBHOOK_BATCH_TIMEOUT_SEC))
+    
+    async def _send_after(self, delay: float):
+        await asyncio.sleep(delay)
+        self.timer = None
+        self.send_pending()
+    
+    def send_pending(self):
+        """Start POSTing everything queued so far."""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        if not self.pending:
+            return
+        
+        body = b"[" + b",".join(self.pending.values()) + b"]"
+        self.pending = {}
+        self.size = 0
+        
+        task = asyncio.create_task(post_webhook(self.webhook, body, batch=True))
+        self.sending.add(task)
+        task.add_done_callback(self.sending.discard)
+    
+    async def flush(self):
+        """Send everything queued and wait for all deliveries in flight."""
+        self.send_pending()
+        await asyncio.gather(*self.sending)
+
+
+class WebhookServerError(Exception):
+    """A webhook endpoint answered with a 5xx status; the delivery is retried."""
 
 
 async def send_webhook(webhook: WebhookConfig, payload: Dict[str, Any]):
-    """Send webhook HTTP POST."""
+    """Send a single webhook payload."""
+    await post_webhook(webhook, orjson.dumps(payload))
+
+
+async def post_webhook(webhook: WebhookConfig, payload_body: bytes, batch: bool = False):
+    """Send webhook HTTP POST, retrying with exponential backoff on 5xx or connection errors."""
     try:
         headers = {
             "Content-Type": "application/json",
             "X-Event": "report.created"
         }
-        
-        payload_json = json.dumps(payload)
+        if batch:
+            headers["X-Batch"] = "1"
         
         # Add signature if secret is configured
-        if webhook.secret:
-            signature = hmac.new(
-                webhook.secret.encode(),
-                payload_json.encode(),
-                hashlib.sha256
-            ).hexdigest()
-            headers["X-Signature"] = f"sha256={signature}"
+        signature = webhook.sign(payload_body)
+        if signature:
+            headers["X-Signature"] = signature
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                webhook.url,
-                headers=headers,
-                content=payload_json,
-                timeout=30.0
-            )
-            
-            if response.status_code >= 200 and response.status_code < 300:
-                logger.info(f"Webhook delivered successfully to {webhook.url}")
-            else:
-                logger.warning(f"Webhook delivery failed: {response.status_code}")
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(WEBHOOK_ATTEMPTS),
+            wait=wait_exponential(multiplier=WEBHOOK_BACKOFF_SEC),
+            retry=retry_if_exception_type((httpx.TransportError, WebhookServerError)),
+            reraise=True
+        )
+        async for attempt in retrying:
+            with attempt:
+                response = await app.state.http.post(
+                    webhook.url,
+                    headers=headers,
+                    content=payload_body
+                )
+                if response.status_code >= 500:
+                    raise WebhookServerError(f"{webhook.url} returned {response.status_code}")
+        
+        if response.status_code >= 200 and response.status_code < 300:
+            logger.info(f"Webhook delivered successfully to {webhook.url}")
+        else:
+            logger.warning(f"Webhook delivery failed: {response.status_code}")
                 
     except Exception as e:
         logger.error(f"Webhook delivery error: {e}")
@@ -251,10 +590,39 @@ def validate_analyze_request(
         )
     
     if file and file.size and file.size > MAX_UPLOAD_SIZE:
-        raise HTTPException(
-            status_code=413,
-            detail={"error": {"code": "PAYLOAD_TOO_LARGE", "message": f"File too large. Max size: {MAX_UPLOAD_SIZE} bytes"}}
-        )
+        raise upload_too_large()
+
+
+def upload_too_large() -> HTTPException:
+    """Error for uploads over MAX_UPLOAD_SIZE."""
+    return HTTPException(
+        status_code=413,
+        detail={"error": {"code": "PAYLOAD_TOO_LARGE", "message": f"File too large. Max size: {MAX_UPLOAD_SIZE} bytes"}}
+    )
+
+
+async def save_upload(file: UploadFile) -> str:
+    """Stream an uploaded archive to the workspace disk and return its path.
+    
+    The size limit is enforced while copying, since ``file.size`` is not
+    always known up front; nothing beyond one chunk is held in memory.
+    """
+    fd, upload_path = tempfile.mkstemp(suffix="_upload.zip", dir=WORKSPACE_DIR)
+    os.close(fd)
+    
+    try:
+        written = 0
+        async with aiofiles.open(upload_path, "wb") as out:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                written += len(chunk)
+                if written > MAX_UPLOAD_SIZE:
+                    raise upload_too_large()
+                await out.write(chunk)
+    except BaseException:
+        os.remove(upload_path)
+        raise
+    
+    return upload_path
 
 
 async def create_analyze_request(
@@ -271,15 +639,13 @@ async def create_analyze_request(
     """Create AnalyzeRequest from form data."""
     validate_analyze_request(github_url, file)
     
-    file_bytes = None
-    if file:
-        file_bytes = await file.read()
+    upload_path = await save_upload(file) if file else None
     
     return AnalyzeRequest(
         github_url=github_url,
         ref=ref,
         commit=commit,
-        file=file_bytes,
+        file_path=upload_path,
         include=include,
         exclude=exclude,
         analyzers=analyzers,
@@ -288,22 +654,24 @@ async def create_analyze_request(
     )
 
 
-def error_response(code: str, message: str, details: Optional[Dict] = None) -> JSONResponse:
+def error_response(code: str, message: str, details: Optional[Dict] = None) -> APIResponse:
     """Create standardized error response."""
     error = ErrorResponse(code=code, message=message, details=details)
-    status_code = {
-        "INVALID_INPUT": 400,
-        "UNAUTHORIZED": 401,
-        "FORBIDDEN": 403,
-        "NOT_FOUND": 404,
-        "CONFLICT": 409,
-        "PAYLOAD_TOO_LARGE": 413,
-        "RATE_LIMIT": 429,
-        "TIMEOUT": 504,
-        "INTERNAL": 500
-    }.get(code, 500)
-    
-    return JSONResponse(content=error.to_dict(), status_code=status_code)
+    return APIResponse(content=error.to_dict(), status_code=ERROR_STATUS_CODES.get(code, 500))
+
+
+@functools.lru_cache(maxsize=None)
+def _static_error_body(code: str, message: str) -> bytes:
+    return orjson.dumps(ErrorResponse(code=code, message=message).to_dict())
+
+
+def static_error_response(code: str, message: str) -> Response:
+    """Like error_response, for fixed messages: the body is encoded once and reused."""
+    return Response(
+        content=_static_error_body(code, message),
+        status_code=ERROR_STATUS_CODES.get(code, 500),
+        media_type="application/json"
+    )
 
 
 # API Endpoints
@@ -318,7 +686,9 @@ async def health_check() -> HealthResponse:
 async def get_tools() -> ToolsResponse:
     """Get available analyzers and versions."""
     available = analyzer_registry.list_analyzers()
-    versions = analyzer_registry.get_versions()
+    versions = getattr(app.state, "tool_versions", None)
+    if versions is None:
+        versions = app.state.tool_versions = await asyncio.to_thread(analyzer_registry.get_versions)
     defaults = orchestrator.get_analyzer_config()["defaults"]
     
     return ToolsResponse(
@@ -332,7 +702,7 @@ async def get_tools() -> ToolsResponse:
 async def analyze(request: AnalyzeRequest = Depends(create_analyze_request)) -> AnalyzeResponse:
     """Submit analysis job (sync or async based on estimated time)."""
     if not orchestrator:
-        return error_response("INTERNAL", "Service not initialized")
+        return static_error_response("INTERNAL", "Service not initialized")
     
     try:
         job_id, job_info = orchestrator.submit_job(request, force_async=False)
@@ -349,7 +719,7 @@ async def analyze(request: AnalyzeRequest = Depends(create_analyze_request)) ->
 async def analyze_async(request: AnalyzeRequest = Depends(create_analyze_request)) -> AnalyzeResponse:
     """Submit analysis job (always async)."""
     if not orchestrator:
-        return error_response("INTERNAL", "Service not initialized")
+        return static_error_response("INTERNAL", "Service not initialized")
     
     try:
         job_id, job_info = orchestrator.submit_job(request, force_async=True)
@@ -369,7 +739,8 @@ async def list_jobs(
     if not orchestrator:
         raise HTTPException(status_code=500, detail="Service not initialized")
     
-    jobs = orchestrator.list_all_jobs(limit=limit, status=status)
+    # Finished jobs are loaded from their state files
+    jobs = await asyncio.to_thread(orchestrator.list_all_jobs, limit=limit, status=status)
     return {
         "jobs": jobs,
         "total": len(jobs),
@@ -383,7 +754,7 @@ async def get_job_status(job_id: str) -> JobInfo:
     if not orchestrator:
         raise HTTPException(status_code=500, detail="Service not initialized")
     
-    job_info = orchestrator.get_job_status(job_id)
+    job_info = await asyncio.to_thread(orchestrator.get_job_status, job_id)
     if not job_info:
         raise HTTPException(status_code=404, detail="Job not found")
     
@@ -418,20 +789,22 @@ async def rerun_job(job_id: str) -> AnalyzeResponse:
 
 
 @app.get("/reports/{job_id}")
-async def get_report(job_id: str) -> Report:
+async def get_report(job_id: str, request: Request) -> Report:
     """Get full scan report."""
-    report_file = os.path.join(STORAGE_BASE, "reports", f"{job_id}.json")
+    report_file = report_paths(job_id).report
     
-    if not os.path.exists(report_file):
+    try:
+        st = os.stat(report_file)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Report not found")
     
-    try:
-        with open(report_file, "r", encoding="utf-8") as f:
-            report_data = json.load(f)
-        return report_data
-    except Exception as e:
-        logger.error(f"Failed to load report {job_id}: {e}")
-        raise HTTPException(status_code=500, detail="Failed to load report")
+    headers = report_cache_headers(st)
+    if is_not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+    
+    # The stored file is already the serialized report; stream it back in
+    # chunks instead of parsing and re-encoding the whole issue list
+    return FileResponse(report_file, media_type="application/json", headers=headers, stat_result=st)
 
 
 @app.get("/reports")
@@ -446,62 +819,41 @@ async def list_reports(
     label: Optional[str] = None
 ) -> ReportListResponse:
     """List and filter reports with pagination."""
-    # This is a simplified implementation - would need proper database for filtering
-    reports_dir = os.path.join(STORAGE_BASE, "reports")
-    
-    if not os.path.exists(reports_dir):
-        return ReportListResponse(items=[], page=page, limit=limit, total=0)
-    
-    # Get all report files
-    report_files = [f for f in os.listdir(reports_dir) if f.endswith('.json')]
-    
-    # Load and filter reports (simplified)
-    items = []
-    for report_file in report_files:
-        try:
-            with open(os.path.join(reports_dir, report_file), "r") as f:
-                report_data = json.load(f)
-            
-            # Create list item
-            item = ReportListItem(
-                job_id=report_data["job_id"],
-                repo_url=report_data["meta"]["repo"].get("url"),
-                generated_at=report_data["meta"]["generated_at"],
-                summary=SeveritySummary(**report_data["summary"]),
-                tools=report_data["meta"]["tools"],
-                labels=report_data["meta"]["labels"]
-            )
-            items.append(item)
-        except Exception as e:
-            logger.warning(f"Failed to load report {report_file}: {e}")
-    
-    # Sort by generated_at (newest first)
-    items.sort(key=lambda x: x.generated_at, reverse=True)
+    if not report_index:
+        raise HTTPException(status_code=500, detail="Service not initialized")
     
-    # Paginate
-    start = (page - 1) * limit
-    end = start + limit
-    paginated_items = items[start:end]
+    try:
+        items, total = await asyncio.to_thread(
+            report_index.query,
+            page=page, limit=limit, severity=severity, tool=tool,
+            repo=repo, since=since, until=until, label=label
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return ReportListResponse(
-        items=paginated_items,
+        items=items,
         page=page,
         limit=limit,
-        total=len(items)
+        total=total
     )
 
 
 @app.get("/reports/{job_id}/summary")
 async def get_report_summary(job_id: str) -> Dict[str, Any]:
     """Get lightweight report summary."""
-    report_file = os.path.join(STORAGE_BASE, "reports", f"{job_id}.json")
+    summary = await asyncio.to_thread(report_index.get_summary, job_id) if report_index else None
+    if summary is not None:
+        return {"job_id": job_id, "summary": summary}
+    
+    # Not indexed (e.g. written by another process); fall back to the file
+    report_file = report_paths(job_id).report
     
     if not os.path.exists(report_file):
         raise HTTPException(status_code=404, detail="Report not found")
     
     try:
-        with open(report_file, "r", encoding="utf-8") as f:
-            report_data = json.load(f)
+        report_data = await asyncio.to_thread(read_report_header, report_file)
         
         return {
             "job_id": job_id,
@@ -513,16 +865,22 @@ async def get_report_summary(job_id: str) -> Dict[str, Any]:
 
 
 @app.get("/reports/{job_id}/enhanced")
-async def get_enhanced_report(job_id: str) -> Dict[str, Any]:
+async def get_enhanced_report(job_id: str, request: Request) -> Response:
     """Get AI-enhanced scan report with fixes."""
-    enhanced_file = os.path.join(STORAGE_BASE, "reports", f"{job_id}_enhanced.json")
+    enhanced_file = report_paths(job_id).enhanced
     
-    if not os.path.exists(enhanced_file):
+    try:
+        st = os.stat(enhanced_file)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Enhanced report not available yet")
     
+    headers = report_cache_headers(st)
+    if is_not_modified(request, headers):
+        return Response(status_code=304, headers=headers)
+    
     try:
-        with open(enhanced_file, "r", encoding="utf-8") as f:
-            return json.load(f)
+        content = await asyncio.to_thread(_load_report_bytes, enhanced_file, st.st_mtime_ns, st.st_size)
+        return Response(content=content, media_type="application/json", headers=headers)
     except Exception as e:
         logger.error(f"Failed to load enhanced report {job_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to load enhanced report")
@@ -531,21 +889,41 @@ async def get_enhanced_report(job_id: str) -> Dict[str, Any]:
 @app.get("/events/{job_id}")
 async def get_job_events(job_id: str) -> StreamingResponse:
     """Server-Sent Events stream for job progress."""
-    # This is a simplified SSE implementation
     async def event_generator():
-        # Register client for this job
-        if job_id not in sse_clients:
-            sse_clients[job_id] = []
-        
-        # Send initial status
-        job_info = orchestrator.get_job_status(job_id) if orchestrator else None
-        if job_info:
-            yield f"data: {json.dumps(job_info.to_dict())}\n\n"
-        
-        # Keep connection open for updates
-        # In practice, you'd implement proper SSE with connection management
-        import asyncio
-        await asyncio.sleep(60)  # Keep connection open for 1 minute
+        # Register before reading the status, so no event falls in between
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SSE_QUEUE_SIZE)
+        if job_id not in sse_queues and len(sse_queues) >= SSE_MAX_JOBS:
+            oldest_job_id = next(iter(sse_queues))
+            logger.warning(f"SSE subscriber limit reached, closing streams for job {oldest_job_id}")
+            for oldest_queue in sse_queues.pop(oldest_job_id):
+                end_sse_stream(oldest_queue, "finished", b"")
+        sse_queues.setdefault(job_id, []).append(queue)
+        try:
+            # Send initial status
+            job_info = await asyncio.to_thread(orchestrator.get_job_status, job_id) if orchestrator else None
+            if job_info:
+                yield b"data: " + orjson.dumps(job_info.to_dict()) + b"\n\n"
+                if job_info.status in TERMINAL_JOB_STATUSES:
+                    return
+            
+            # Forward events until the job finishes or the client disconnects
+            while True:
+                try:
+                    event_type, frame = await asyncio.wait_for(queue.get(), SSE_HEARTBEAT_SEC)
+                except asyncio.TimeoutError:
+                    yield SSE_HEARTBEAT_FRAME
+                    continue
+                if frame:
+                    yield frame
+                if event_type == "finished":
+                    return
+        finally:
+            # Already gone if the job finished or the stream was evicted
+            queues = sse_queues.get(job_id)
+            if queues is not None and queue in queues:
+                queues.remove(queue)
+                if not queues:
+                    del sse_queues[job_id]
     
     return StreamingResponse(event_generator(), media_type="text/event-stream")
 
@@ -579,6 +957,11 @@ async def delete_webhook(webhook_id: str) -> Dict[str, str]:
         raise HTTPException(status_code=404, detail="Webhook not found")
     
     del webhooks[webhook_id]
+    
+    # Payloads queued while the webhook was registered are still delivered
+    batch = webhook_batches.pop(webhook_id, None)
+    if batch is not None:
+        batch.send_pending()
     return {"id": webhook_id, "status": "deleted"}
 
 
@@ -606,11 +989,7 @@ async def update_analyzer_config(config: Dict[str, Any]) -> Dict[str, bool]:
 async def get_ai_config() -> Dict[str, Any]:
     """Get AI analysis configuration."""
     return {
-        "enabled": os.getenv("ENABLE_AI_ANALYSIS", "true").lower() == "true",
-        "model": os.getenv("AI_MODEL", "GPT_4"),
-        "min_severity": os.getenv("AI_ANALYSIS_MIN_SEVERITY", "high"),
-        "max_concurrent_reviews": int(os.getenv("MAX_CONCURRENT_AI_REVIEWS", "1")),
-        "timeout_sec": int(os.getenv("AI_ANALYSIS_TIMEOUT_SEC", "300")),
+        **asdict(ai_config),
         "bridge_initialized": agent_bridge is not None
     }
 
@@ -621,32 +1000,27 @@ async def update_ai_config(config: Dict[str, Any]) -> Dict[str, Any]:
     updated = {}
     
     # Note: In production, these should be persisted to a database
-    # For now, we only update environment variables for the current session
+    # For now, we only update the settings (and environment) of this process
     
     if "enabled" in config:
-        os.environ["ENABLE_AI_ANALYSIS"] = str(config["enabled"]).lower()
-        updated["enabled"] = config["enabled"]
+        updated["enabled"] = str(config["enabled"]).lower() == "true"
     
     if "model" in config:
-        valid_models = ["GPT_4", "GPT_3_5_TURBO", "GPT_4_32K"]
-        if config["model"] in valid_models:
-            os.environ["AI_MODEL"] = config["model"]
+        if config["model"] in AI_MODELS:
             updated["model"] = config["model"]
         else:
             raise HTTPException(
                 status_code=400, 
-                detail=f"Invalid model. Must be one of: {', '.join(valid_models)}"
+                detail=f"Invalid model. Must be one of: {', '.join(AI_MODELS)}"
             )
     
     if "min_severity" in config:
-        valid_severities = ["critical", "high", "medium", "low"]
-        if config["min_severity"] in valid_severities:
-            os.environ["AI_ANALYSIS_MIN_SEVERITY"] = config["min_severity"]
+        if config["min_severity"] in AI_SEVERITIES:
             updated["min_severity"] = config["min_severity"]
         else:
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid severity. Must be one of: {', '.join(valid_severities)}"
+                detail=f"Invalid severity. Must be one of: {', '.join(AI_SEVERITIES)}"
             )
     
     if "max_concurrent_reviews" in config:
@@ -654,7 +1028,6 @@ async def update_ai_config(config: Dict[str, Any]) -> Dict[str, Any]:
             value = int(config["max_concurrent_reviews"])
             if value < 1 or value > 10:
                 raise ValueError("Must be between 1 and 10")
-            os.environ["MAX_CONCURRENT_AI_REVIEWS"] = str(value)
             updated["max_concurrent_reviews"] = value
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
@@ -664,11 +1037,14 @@ async def update_ai_config(config: Dict[str, Any]) -> Dict[str, Any]:
             value = int(config["timeout_sec"])
             if value < 60 or value > 600:
                 raise ValueError("Must be between 60 and 600 seconds")
-            os.environ["AI_ANALYSIS_TIMEOUT_SEC"] = str(value)
             updated["timeout_sec"] = value
         except ValueError as e:
             raise HTTPException(status_code=400, detail=str(e))
     
+    # Everything is validated before anything is applied, so a rejected
+    # request changes nothing; there is no await in between, so no lock either
+    ai_config.update(updated)
+    
     logger.info(f"AI configuration updated: {updated}")
     return {
         "ok": True,
@@ -677,11 +1053,14 @@ async def update_ai_config(config: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
+def read_dashboard_index():
+    """Index totals and the 10 most recent scans, read in one worker-thread hop."""
+    return report_index.severity_totals(), report_index.recent(limit=10)
+
+
 @app.get("/dashboard/stats")
 async def get_dashboard_stats() -> Dict[str, Any]:
     """Get overall statistics for dashboard."""
-    reports_dir = os.path.join(STORAGE_BASE, "reports")
-    
     # Initialize stats
     stats = {
         "total_scans": 0,
@@ -697,50 +1076,19 @@ async def get_dashboard_stats() -> Dict[str, Any]:
     }
     
     # Check if reports directory exists
-    if not os.path.exists(reports_dir):
-        os.makedirs(reports_dir, exist_ok=True)
+    if not os.path.exists(REPORTS_DIR):
+        os.makedirs(REPORTS_DIR, exist_ok=True)
+        return stats
+    
+    # Nothing is indexed before startup
+    if not report_index:
         return stats
     
     try:
-        report_files = os.listdir(reports_dir)
-        
-        # Count reports
-        regular_reports = [f for f in report_files if f.endswith('.json') and not f.endswith('_enhanced.json')]
-        enhanced_reports = [f for f in report_files if f.endswith('_enhanced.json')]
-        
-        stats["total_scans"] = len(regular_reports)
-        stats["ai_enhanced_reports"] = len(enhanced_reports)
-        
-        # Calculate severity distribution and collect recent scans
-        recent_scans = []
-        
-        for report_file in regular_reports:
-            try:
-                report_path = os.path.join(reports_dir, report_file)
-                with open(report_path, 'r') as f:
-                    report = json.load(f)
-                
-                # Update severity totals
-                summary = report.get('summary', {})
-                for severity in stats["severity_distribution"]:
-                    stats["severity_distribution"][severity] += summary.get(severity, 0)
-                
-                # Collect recent scan info
-                job_id = report.get('job_id', report_file.replace('.json', ''))
-                recent_scans.append({
-                    'job_id': job_id,
-                    'generated_at': report.get('meta', {}).get('generated_at', ''),
-                    'total_issues': sum(summary.values()),
-                    'has_ai_analysis': f"{job_id}_enhanced.json" in enhanced_reports
-                })
-                
-            except Exception as e:
-                logger.warning(f"Failed to process report {report_file}: {e}")
-                continue
-        
-        # Sort by generated_at and take 10 most recent
-        recent_scans.sort(key=lambda x: x['generated_at'], reverse=True)
-        stats["recent_scans"] = recent_scans[:10]
+        # Totals, AI-enhanced counts and the 10 most recent scans all come
+        # from the report index, so no report file is read or listed
+        totals, stats["recent_scans"] = await asyncio.to_thread(read_dashboard_index)
+        stats["total_scans"], stats["ai_enhanced_reports"], stats["severity_distribution"] = totals
         
         # Get active jobs count
         if orchestrator:
@@ -757,7 +1105,7 @@ async def get_dashboard_stats() -> Dict[str, Any]:
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Handle HTTP exceptions."""
-    return JSONResponse(
+    return APIResponse(
         status_code=exc.status_code,
         content={"error": {"code": "HTTP_ERROR", "message": exc.detail}}
     )
@@ -767,7 +1115,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle general exceptions."""
     logger.error(f"Unhandled exception: {exc}")
-    return JSONResponse(
+    return APIResponse(
         status_code=500,
         content={"error": {"code": "INTERNAL", "message": "Internal server error"}}
     )
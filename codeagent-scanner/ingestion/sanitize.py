@@ -170,13 +170,15 @@ class WorkspaceSanitizer:
         
         removed_count = 0
         
-        # Get all files
+        # Get all files; paths are built from each directory's prefixes, so
+        # there is no join/relpath normalization per file
         all_files = []
         for root, dirs, files in os.walk(workspace_path):
+            abs_prefix = os.path.join(root, '')
+            rel_root = os.path.relpath(root, workspace_path)
+            rel_prefix = '' if rel_root == os.curdir else os.path.join(rel_root, '')
             for file_name in files:
-                file_path = os.path.join(root, file_name)
-                rel_path = os.path.relpath(file_path, workspace_path)
-                all_files.append((file_path, rel_path))
+                all_files.append((abs_prefix + file_name, rel_prefix + file_name))
         
         # Apply filters
         for file_path, rel_path in all_files:
@@ -18,6 +18,10 @@ from codeagent.chat_chain import ChatChain
 from camel.typing import ModelType
 
 
+# Severities sent for AI review
+AI_REVIEW_SEVERITIES = frozenset({'critical', 'high'})
+
+
 class AgentBridge:
     """Connects vulnerability scanner to CodeAgent AI for intelligent analysis."""
     
@@ -66,7 +70,7 @@ class AgentBridge:
                 continue
             
             # Group issues by severity for prioritization
-            critical_high = [i for i in issues if i['severity'] in ['critical', 'high']]
+            critical_high = [i for i in issues if i['severity'] in AI_REVIEW_SEVERITIES]
             
             if critical_high:
                 # Get AI review for critical/high issues
@@ -259,12 +263,14 @@ Focus on providing actionable, production-ready fixes.
         """Create summary of AI-enhanced analysis."""
         
         total_files = len(enhanced_issues)
-        total_issues = sum(len(ei['original_issues']) for ei in enhanced_issues)
         
-        fixes_generated = sum(
-            1 for ei in enhanced_issues 
-            if ei.get('ai_analysis', {}).get('suggested_fix')
-        )
+        # One pass over the analyzed files for both counts
+        total_issues = 0
+        fixes_generated = 0
+        for ei in enhanced_issues:
+            total_issues += len(ei['original_issues'])
+            if ei.get('ai_analysis', {}).get('suggested_fix'):
+                fixes_generated += 1
         
         return {
             'files_analyzed': total_files,
@@ -17,6 +17,9 @@ from codeagent.chat_chain import ChatChain
 
 logger = logging.getLogger(__name__)
 
+# Severities handed to the agents
+AI_REVIEW_SEVERITIES = frozenset({'critical', 'high'})
+
 
 class CamelBridge:
     """
@@ -108,17 +111,20 @@ class CamelBridge:
         logger.info(f"Starting multi-agent analysis for job {job_id}")
         
         enhanced_issues = []
+        files_with_issues = 0
         
-        # Process each file's issues
+        # Process each file's issues; the summary's file counts are taken
+        # in the same pass rather than by walking the files again
         for file_report in report.get('files', []):
             file_path = file_report['path']
             issues = file_report['issues']
             
             if not issues:
                 continue
+            files_with_issues += 1
             
             # Focus on critical and high severity issues
-            critical_high = [i for i in issues if i['severity'] in ['critical', 'high']]
+            critical_high = [i for i in issues if i['severity'] in AI_REVIEW_SEVERITIES]
             
             if critical_high:
                 logger.info(f"Analyzing {len(critical_high)} critical/high issues in {file_path}")
@@ -139,7 +145,7 @@ class CamelBridge:
                 })
         
         # Generate summary
-        summary = self._create_enhanced_summary(enhanced_issues, report)
+        summary = self._create_enhanced_summary(enhanced_issues, report, files_with_issues)
         
         logger.info(f"Multi-agent analysis complete for job {job_id}: {len(enhanced_issues)} files analyzed")
         
@@ -421,7 +427,8 @@ Please work together as a team to provide a comprehensive security review.
     def _create_enhanced_summary(
         self,
         enhanced_issues: List[Dict],
-        original_report: Dict[str, Any]
+        original_report: Dict[str, Any],
+        files_with_issues: int
     ) -> Dict[str, Any]:
         """Create a comprehensive summary of the multi-agent analysis."""
         
@@ -429,18 +436,15 @@ Please work together as a team to provide a comprehensive security review.
         original_summary = original_report.get('summary', {})
         
         total_files_scanned = len(original_report.get('files', []))
-        files_with_issues = len([f for f in original_report.get('files', []) if f.get('issues')])
         files_analyzed = len(enhanced_issues)
         
-        total_issues_analyzed = sum(
-            ei.get('issues_analyzed', 0)
-            for ei in enhanced_issues
-        )
-        
-        fixes_generated = sum(
-            1 for ei in enhanced_issues
-            if ei.get('ai_analysis', {}).get('suggested_fix')
-        )
+        # One pass over the analyzed files for both counts
+        total_issues_analyzed = 0
+        fixes_generated = 0
+        for ei in enhanced_issues:
+            total_issues_analyzed += ei.get('issues_analyzed', 0)
+            if ei.get('ai_analysis', {}).get('suggested_fix'):
+                fixes_generated += 1
         
         return {
             'total_files_scanned': total_files_scanned,
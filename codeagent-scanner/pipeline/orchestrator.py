@@ -1,7 +1,7 @@
 """Job orchestration and management system."""
 
 import asyncio
-import json
+import heapq
 import logging
 import os
 import threading
@@ -12,19 +12,41 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Set, Callable, Any
 from dataclasses import asdict
 
+import orjson
+
 from analyzers.base import analyzer_registry
-from analyzers.detect import detect_applicable_analyzers, get_analyzer_defaults, filter_analyzers_by_config
+from analyzers.detect import detect_applicable_analyzers, get_analyzer_defaults, filter_analyzers_by_config, scan_workspace
 from ingestion.fetch_repo import RepoFetcher, RepoFetchError
 from ingestion.sanitize import WorkspaceSanitizer
 from pipeline.report_schema import (
     JobInfo, JobStatus, JobPhase, JobProgress, Report, ReportBuilder,
     RepoInfo, AnalyzeRequest, SeveritySummary
 )
+from pipeline.report_index import ReportIndex
 
 
 logger = logging.getLogger(__name__)
 
 
+def write_file_atomic(path: str, data: bytes) -> None:
+    """Write a file so readers see either the old contents or all of the new ones.
+
+    The data goes to a temporary file next to ``path``, which is flushed to
+    disk and then renamed over it, so a crash cannot publish a partial file.
+    """
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
 class JobOrchestrator:
     """Orchestrates security scanning jobs from submission to completion."""
     
@@ -40,6 +62,7 @@ class JobOrchestrator:
         # Components
         self.repo_fetcher = RepoFetcher(storage_base)
         self.sanitizer = WorkspaceSanitizer()
+        self.report_index = ReportIndex(os.path.join(storage_base, "reports"))
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
         
         # Configuration
@@ -118,9 +141,15 @@ class JobOrchestrator:
         """List all jobs, optionally filtered by status."""
         jobs = []
         
+        def collect(job_info: JobInfo):
+            # Filter by status while collecting, so no second pass is needed
+            if not status or job_info.status.value == status:
+                jobs.append(job_info)
+        
         # Get active jobs
         with self.job_lock:
-            jobs.extend(self.active_jobs.values())
+            for job_info in self.active_jobs.values():
+                collect(job_info)
         
         # Get jobs from disk (reports directory)
         try:
@@ -131,17 +160,12 @@ class JobOrchestrator:
                     if job_id not in self.active_jobs:
                         job_info = self._load_job_state(job_id)
                         if job_info:
-                            jobs.append(job_info)
+                            collect(job_info)
         except Exception as e:
             logger.warning(f"Error loading job history: {e}")
         
-        # Filter by status if provided
-        if status:
-            jobs = [j for j in jobs if j.status.value == status]
-        
-        # Sort by submitted_at (newest first) and limit
-        jobs.sort(key=lambda j: j.submitted_at, reverse=True)
-        return jobs[:limit]
+        # Newest `limit` jobs by submitted_at, without sorting the rest
+        return heapq.nlargest(limit, jobs, key=lambda j: j.submitted_at)
     
     def cancel_job(self, job_id: str) -> bool:
         """Cancel a running or queued job."""
@@ -225,9 +249,11 @@ class JobOrchestrator:
             self._update_job_progress(job_id, JobPhase.CLONE, 20)
             self._sanitize_workspace(job_id, workspace_path, request)
             
-            # Phase 3: Select and run analyzers
-            analyzers = self._select_analyzers(request, workspace_path)
-            analyzer_results = self._run_analyzers(job_id, analyzers, workspace_path)
+            # Phase 3: Select and run analyzers; the workspace is walked once
+            # and the scan is shared by detection and the analyzers
+            file_info = scan_workspace(workspace_path)
+            analyzers = self._select_analyzers(request, workspace_path, file_info)
+            analyzer_results = self._run_analyzers(job_id, analyzers, workspace_path, file_info)
             
             # Phase 4: Merge results and create report
             self._update_job_progress(job_id, JobPhase.MERGE, 85)
@@ -277,20 +303,13 @@ class JobOrchestrator:
                 ref=request.ref,
                 commit=request.commit
             )
-        elif request.file:
-            # Save uploaded file and extract
-            temp_zip = os.path.join(self.storage_base, "workspace", f"{job_id}_upload.zip")
-            with open(temp_zip, "wb") as f:
-                f.write(request.file)
-            
+        elif request.file_path:
+            # The API streamed the upload to disk; extract it and clean up
             try:
-                workspace_path = self.repo_fetcher.extract_zip_archive(temp_zip, job_id)
-                os.remove(temp_zip)  # Clean up temp file
-                return workspace_path
-            except Exception as e:
-                if os.path.exists(temp_zip):
-                    os.remove(temp_zip)
-                raise e
+                return self.repo_fetcher.extract_zip_archive(request.file_path, job_id)
+            finally:
+                if os.path.exists(request.file_path):
+                    os.remove(request.file_path)
         else:
             raise ValueError("Either github_url or file must be provided")
     
@@ -307,7 +326,8 @@ class JobOrchestrator:
         
         logger.info(f"Job {job_id} workspace sanitization: {stats}")
     
-    def _select_analyzers(self, request: AnalyzeRequest, workspace_path: str) -> List[str]:
+    def _select_analyzers(self, request: AnalyzeRequest, workspace_path: str,
+                          file_info: Optional[Dict[str, Any]] = None) -> List[str]:
         """Select which analyzers to run."""
         # Get requested analyzers or use defaults
         requested = request.get_analyzers_list()
@@ -319,12 +339,13 @@ class JobOrchestrator:
         filtered = filter_analyzers_by_config(requested, allowed)
         
         # Detect applicable analyzers based on workspace content
-        applicable = detect_applicable_analyzers(workspace_path, filtered)
+        applicable = detect_applicable_analyzers(workspace_path, filtered, file_info)
         
         logger.info(f"Selected analyzers: {applicable}")
         return applicable
     
-    def _run_analyzers(self, job_id: str, analyzer_names: List[str], workspace_path: str) -> List[Any]:
+    def _run_analyzers(self, job_id: str, analyzer_names: List[str], workspace_path: str,
+                       file_info: Optional[Dict[str, Any]] = None) -> List[Any]:
         """Run analyzers in parallel."""
         results = []
         
@@ -346,7 +367,7 @@ class JobOrchestrator:
                 continue
             
             # Submit to thread pool
-            future = self.executor.submit(analyzer.run_analysis, workspace_path)
+            future = self.executor.submit(analyzer.run_analysis, workspace_path, file_info=file_info)
             futures.append((analyzer_name, future))
         
         # Collect results
@@ -392,8 +413,10 @@ class JobOrchestrator:
         os.makedirs(reports_dir, exist_ok=True)
         
         report_file = os.path.join(reports_dir, f"{job_id}.json")
-        with open(report_file, "w", encoding="utf-8") as f:
-            f.write(report.to_json())
+        report_data = report.to_dict()
+        write_file_atomic(report_file, orjson.dumps(report_data, option=orjson.OPT_INDENT_2))
+        
+        self.report_index.add_dict(report_data)
     
     def _update_job_status(self, job_id: str, status: JobStatus, **kwargs) -> None:
         """Update job status."""
@@ -431,8 +454,7 @@ class JobOrchestrator:
             os.makedirs(logs_dir, exist_ok=True)
             
             job_file = os.path.join(logs_dir, f"{job_id}.json")
-            with open(job_file, "w", encoding="utf-8") as f:
-                json.dump(job_info.to_dict(), f, indent=2)
+            write_file_atomic(job_file, orjson.dumps(job_info.to_dict(), option=orjson.OPT_INDENT_2))
         except Exception as e:
             logger.error(f"Failed to save job state for {job_id}: {e}")
     
@@ -443,8 +465,8 @@ class JobOrchestrator:
             if not os.path.exists(job_file):
                 return None
             
-            with open(job_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open(job_file, "rb") as f:
+                data = orjson.loads(f.read())
             
             # Convert dict back to JobInfo
             progress_data = data.get("progress")
@@ -0,0 +1,295 @@
+"""SQLite index of stored reports for listing and filtering."""
+
+import functools
+import logging
+import mmap
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+from pipeline.report_schema import Report, ReportListItem, SeveritySummary
+
+
+logger = logging.getLogger(__name__)
+
+REPORT_INDEX_FILE = "index.sqlite"
+ENHANCED_REPORT_SUFFIX = "_enhanced.json"
+REPORT_HEADER_CACHE_SIZE = 1024
+
+# Reports are written with "files" after "job_id", "meta" and "summary"
+FILES_KEY = b'"files":'
+
+# Severity filter value -> summary column
+SEVERITY_COLUMNS = {
+    "critical": "critical",
+    "high": "high",
+    "medium": "medium",
+    "low": "low",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    job_id TEXT PRIMARY KEY,
+    repo_url TEXT,
+    generated_at TEXT NOT NULL,
+    critical INTEGER NOT NULL DEFAULT 0,
+    high INTEGER NOT NULL DEFAULT 0,
+    medium INTEGER NOT NULL DEFAULT 0,
+    low INTEGER NOT NULL DEFAULT 0,
+    tools TEXT NOT NULL DEFAULT '[]',
+    labels TEXT NOT NULL DEFAULT '[]',
+    has_ai INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_reports_generated_at ON reports (generated_at);
+CREATE INDEX IF NOT EXISTS idx_reports_repo_url ON reports (repo_url);
+"""
+
+
+def read_report_header(path: str) -> Dict[str, Any]:
+    """Load a report file's top-level fields other than ``files`` (its issues).
+
+    The file is memory-mapped and only the bytes before the ``"files"`` key
+    are parsed; if that does not yield a usable header the whole file is
+    parsed instead. Results are cached per (mtime, size) of the file.
+    """
+    st = os.stat(path)
+    return _read_report_header(path, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=REPORT_HEADER_CACHE_SIZE)
+def _read_report_header(path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    with open(path, "rb") as f:
+        if not size:
+            return orjson.loads(f.read())  # raises JSONDecodeError
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = mm.find(FILES_KEY)
+            if end != -1:
+                head = mm[:end].rstrip()
+                if head.endswith(b","):
+                    try:
+                        header = orjson.loads(head[:-1] + b"}")
+                    except orjson.JSONDecodeError:
+                        header = None
+                    if isinstance(header, dict):
+                        return header
+            data = orjson.loads(mm[:])
+
+    return {key: value for key, value in data.items() if key != "files"}
+
+
+class ReportIndex:
+    """Listing fields of every stored report, kept next to the report files.
+
+    The orchestrator adds a row when it writes a report, so ``/reports`` can
+    filter and paginate without opening the report files themselves.
+    """
+
+    def __init__(self, reports_dir: str):
+        self.reports_dir = reports_dir
+        self.db_path = os.path.join(reports_dir, REPORT_INDEX_FILE)
+        os.makedirs(reports_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # WAL lets listings read while a report is being added; with NORMAL
+        # only checkpoints fsync, so a power loss can drop the newest rows
+        # (call rebuild() to re-add them) but cannot corrupt the index
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(reports)")}
+            migrated = "has_ai" not in columns
+            if migrated:
+                self._conn.execute("ALTER TABLE reports ADD COLUMN has_ai INTEGER NOT NULL DEFAULT 0")
+            indexed = self._conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+
+        # Reports written before the index existed
+        if not indexed:
+            self.rebuild()
+        elif migrated:
+            self._mark_existing_enhanced()
+
+    def add(self, report: Report) -> None:
+        """Index a report, replacing any previous row for its job."""
+        self.add_dict(report.to_dict())
+
+    def add_dict(self, report_data: Dict[str, Any]) -> None:
+        """Index a report given in its serialized (``Report.to_dict``) form.
+
+        Replacing a row clears its AI flag; the enhanced report is produced
+        from the report, so it is written (and marked) afterwards.
+        """
+        meta = report_data["meta"]
+        summary = report_data["summary"]
+        row = (
+            report_data["job_id"],
+            meta["repo"].get("url"),
+            meta["generated_at"],
+            summary.get("critical", 0),
+            summary.get("high", 0),
+            summary.get("medium", 0),
+            summary.get("low", 0),
+            orjson.dumps(meta.get("tools", [])).decode("utf-8"),
+            orjson.dumps(meta.get("labels", [])).decode("utf-8"),
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO reports "
+                "(job_id, repo_url, generated_at, critical, high, medium, low, tools, labels) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row
+            )
+
+    def mark_enhanced(self, job_id: str) -> None:
+        """Record that an AI-enhanced report exists for a job."""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE reports SET has_ai = 1 WHERE job_id = ?", (job_id,))
+
+    def _scan_reports_dir(self) -> Tuple[List[os.DirEntry], List[str]]:
+        """Split the reports directory, in one pass, into report file entries
+        and the job ids that have an enhanced report."""
+        reports: List[os.DirEntry] = []
+        enhanced_job_ids: List[str] = []
+        with os.scandir(self.reports_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith(ENHANCED_REPORT_SUFFIX):
+                    enhanced_job_ids.append(name[:-len(ENHANCED_REPORT_SUFFIX)])
+                elif name.endswith(".json"):
+                    reports.append(entry)
+        return reports, enhanced_job_ids
+
+    def _mark_existing_enhanced(self, job_ids: Optional[List[str]] = None) -> None:
+        if job_ids is None:
+            _, job_ids = self._scan_reports_dir()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE reports SET has_ai = 1 WHERE job_id = ?", [(job_id,) for job_id in job_ids]
+            )
+
+    def rebuild(self) -> int:
+        """Index every report file in the reports directory; returns the count."""
+        reports, enhanced_job_ids = self._scan_reports_dir()
+        count = 0
+        for entry in reports:
+            try:
+                self.add_dict(read_report_header(entry.path))
+                count += 1
+            except Exception as e:
+                logger.warning(f"Failed to index report {entry.name}: {e}")
+
+        if count:
+            self._mark_existing_enhanced(enhanced_job_ids)
+            logger.info(f"Indexed {count} existing reports")
+        return count
+
+    def get_summary(self, job_id: str) -> Optional[Dict[str, int]]:
+        """Return a report's severity summary, or None if it is not indexed."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT critical, high, medium, low FROM reports WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(SEVERITY_COLUMNS, row))
+
+    def severity_totals(self) -> Tuple[int, int, Dict[str, int]]:
+        """Return the number of indexed reports, how many of them have an
+        AI-enhanced report, and their summed severity counts."""
+        with self._lock:
+            count, enhanced, *sums = self._conn.execute(
+                "SELECT COUNT(*), TOTAL(has_ai), "
+                "TOTAL(critical), TOTAL(high), TOTAL(medium), TOTAL(low) FROM reports"
+            ).fetchone()
+        return count, int(enhanced), {severity: int(total) for severity, total in zip(SEVERITY_COLUMNS, sums)}
+
+    def recent(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Return the newest reports' job id, timestamp, issue total and AI flag."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT job_id, generated_at, critical + high + medium + low, has_ai "
+                "FROM reports ORDER BY generated_at DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [
+            {
+                "job_id": job_id,
+                "generated_at": generated_at,
+                "total_issues": total_issues,
+                "has_ai_analysis": bool(has_ai)
+            }
+            for job_id, generated_at, total_issues, has_ai in rows
+        ]
+
+    def query(
+        self,
+        page: int = 1,
+        limit: int = 20,
+        severity: Optional[str] = None,
+        tool: Optional[str] = None,
+        repo: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        label: Optional[str] = None
+    ) -> Tuple[List[ReportListItem], int]:
+        """Return one page of reports (newest first) and the total match count.
+
+        Raises:
+            ValueError: If ``severity`` is not a known severity level
+        """
+        clauses = []
+        params: List[Any] = []
+
+        if severity:
+            column = SEVERITY_COLUMNS.get(severity.lower())
+            if column is None:
+                raise ValueError(f"Unknown severity: {severity}")
+            clauses.append(f"{column} > 0")
+        if tool:
+            clauses.append("EXISTS (SELECT 1 FROM json_each(reports.tools) WHERE value = ?)")
+            params.append(tool)
+        if repo:
+            clauses.append("repo_url = ?")
+            params.append(repo)
+        if since:
+            clauses.append("generated_at >= ?")
+            params.append(since)
+        if until:
+            clauses.append("generated_at <= ?")
+            params.append(until)
+        if label:
+            clauses.append("EXISTS (SELECT 1 FROM json_each(reports.labels) WHERE value = ?)")
+            params.append(label)
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        offset = max(page - 1, 0) * limit
+
+        with self._lock:
+            total = self._conn.execute(f"SELECT COUNT(*) FROM reports{where}", params).fetchone()[0]
+            rows = self._conn.execute(
+                "SELECT job_id, repo_url, generated_at, critical, high, medium, low, tools, labels "
+                f"FROM reports{where} ORDER BY generated_at DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+
+        items = [
+            ReportListItem(
+                job_id=job_id,
+                repo_url=repo_url,
+                generated_at=generated_at,
+                summary=SeveritySummary(critical=critical, high=high, medium=medium, low=low),
+                tools=orjson.loads(tools),
+                labels=orjson.loads(labels)
+            )
+            for job_id, repo_url, generated_at, critical, high, medium, low, tools, labels in rows
+        ]
+        return items, total
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -1,10 +1,14 @@
 """Data models and schema definitions for reports and API responses."""
 
+import functools
+import hashlib
+import hmac
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass, asdict
 from enum import Enum
-import json
+
+import orjson
 
 
 class JobStatus(str, Enum):
@@ -141,7 +145,7 @@ class Report:
     
     def to_json(self) -> str:
         """Convert to JSON string."""
-        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+        return orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2).decode("utf-8")
 
 
 @dataclass
@@ -184,6 +188,12 @@ class JobInfo:
         return result
 
 
+@functools.lru_cache(maxsize=128)
+def _hmac_template(secret: str) -> hmac.HMAC:
+    """HMAC-SHA256 keyed with a webhook secret, copied for each payload."""
+    return hmac.new(secret.encode(), digestmod=hashlib.sha256)
+
+
 @dataclass
 class WebhookConfig:
     """Webhook configuration."""
@@ -194,6 +204,14 @@ class WebhookConfig:
     created_at: str
     active: bool = True
     
+    def sign(self, body: bytes) -> Optional[str]:
+        """Return the X-Signature header value for body, or None without a secret."""
+        if not self.secret:
+            return None
+        mac = _hmac_template(self.secret).copy()
+        mac.update(body)
+        return f"sha256={mac.hexdigest()}"
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             "id": self.id,
@@ -209,14 +227,14 @@ class WebhookConfig:
 class WebhookPayload:
     """Webhook delivery payload."""
     job_id: str
-    repo: RepoInfo
+    repo: Optional[RepoInfo]
     summary: SeveritySummary
     report_url: str
     
     def to_dict(self) -> Dict[str, Any]:
         return {
             "job_id": self.job_id,
-            "repo": self.repo.to_dict(),
+            "repo": self.repo.to_dict() if self.repo else None,
             "summary": self.summary.to_dict(),
             "report_url": self.report_url
         }
@@ -260,7 +278,7 @@ class AnalyzeRequest:
     github_url: Optional[str] = None
     ref: Optional[str] = None
     commit: Optional[str] = None
-    file: Optional[bytes] = None
+    file_path: Optional[str] = None  # Uploaded ZIP archive, already streamed to disk
     include: Optional[str] = None
     exclude: Optional[str] = None
     analyzers: Optional[str] = None
@@ -407,7 +425,7 @@ class ReportBuilder:
                         tool=analyzer_issue.tool,
                         type=analyzer_issue.type,
                         message=analyzer_issue.message,
-                        severity=Severity(analyzer_issue.severity.value),
+                        severity=Severity(analyzer_issue.severity),
                         file=analyzer_issue.file,
                         line=analyzer_issue.line,
                         rule_id=analyzer_issue.rule_id,
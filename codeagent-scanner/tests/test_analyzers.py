@@ -0,0 +1,1099 @@
+"""
+Unit tests for the security analyzer runners.
+Tests output parsing and severity normalization without invoking the tools.
+"""
+
+import pytest
+import sys
+import os
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analyzers.base import Severity
+from analyzers.bandit_runner import BANDIT_IMPORTABLE, BanditAnalyzer
+
+
+class TestBanditOutputParsing:
+    """Test parsing of Bandit JSON reports."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.analyzer = BanditAnalyzer()
+        self.temp_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _parse(self, data):
+        stdout = json.dumps(data).encode("utf-8")
+        return self.analyzer._parse_bandit_stdout(stdout, self.temp_dir)
+
+    def test_parse_results(self):
+        """Test that each finding in 'results' becomes an Issue."""
+        issues = self._parse({
+            "errors": [],
+            "results": [
+                {
+                    "test_id": "B602",
+                    "issue_text": "subprocess call with shell=True",
+                    "issue_severity": "HIGH",
+                    "filename": os.path.join(self.temp_dir, "app.py"),
+                    "line_number": 12,
+                    "more_info": "https://bandit.readthedocs.io/"
+                },
+                {
+                    "test_id": "B101",
+                    "issue_text": "Use of assert detected",
+                    "issue_severity": "LOW",
+                    "filename": "tests/test_app.py",
+                    "line_number": 3
+                }
+            ]
+        })
+
+        assert len(issues) == 2
+        assert issues[0].file == "app.py"
+        assert issues[0].line == 12
+        assert issues[0].severity == Severity.CRITICAL
+        assert issues[0].suggestion == "See: https://bandit.readthedocs.io/"
+        assert issues[1].severity == Severity.LOW
+        assert issues[1].suggestion is None
+
+    def test_normalize_file_path_with_prefix(self):
+        """Test that the precomputed prefix fast path matches relpath."""
+        prefix = self.analyzer._workspace_prefix(self.temp_dir)
+        nested = os.path.join(self.temp_dir, "pkg", "mod.py")
+        outside = os.path.join(os.path.dirname(self.temp_dir), "other.py")
+
+        for path in (nested, outside, "relative/mod.py"):
+            assert self.analyzer._normalize_file_path(path, self.temp_dir, prefix) == \
+                self.analyzer._normalize_file_path(path, self.temp_dir)
+        assert self.analyzer._normalize_file_path(nested, self.temp_dir, prefix) == os.path.join("pkg", "mod.py")
+
+    def test_repeated_strings_shared(self):
+        """Test that issues from the same file and test share their strings."""
+        finding = {"test_id": "B602", "issue_severity": "HIGH", "more_info": "https://bandit.readthedocs.io/"}
+        issues = self._parse({"results": [
+            dict(finding, filename=os.path.join(self.temp_dir, "pkg", "app.py"), line_number=line)
+            for line in (1, 2)
+        ]})
+
+        assert issues[0].file == os.path.join("pkg", "app.py")
+        assert issues[0].file is issues[1].file
+        assert issues[0].rule_id is issues[1].rule_id
+        assert issues[0].suggestion is issues[1].suggestion
+
+    def test_parse_missing_results(self):
+        """Test that a report without 'results' yields no issues."""
+        assert self._parse({"errors": []}) == []
+
+    def test_parse_invalid_json(self):
+        """Test that malformed output is logged, not raised."""
+        assert self.analyzer._parse_bandit_stdout(b'{"results": [', self.temp_dir) == []
+
+
+class TestSemgrepOutputParsing:
+    """Test parsing of Semgrep JSON reports."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        from analyzers.semgrep_runner import SemgrepAnalyzer
+        self.analyzer = SemgrepAnalyzer()
+        self.temp_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @staticmethod
+    def _stdout(data):
+        """A stream reader already holding data, as Semgrep's stdout would."""
+        import asyncio
+        stream = asyncio.StreamReader()
+        stream.feed_data(data)
+        stream.feed_eof()
+        return stream
+
+    def _parse(self, data):
+        """Parse raw Semgrep stdout bytes."""
+        from analyzers.base import run_async
+
+        async def parse():
+            return await self.analyzer._parse_semgrep_output(self._stdout(data), self.temp_dir)
+
+        return run_async(parse())
+
+    def test_parse_results(self):
+        """Test that each finding in 'results' becomes an Issue."""
+        report = {"results": [
+                {
+                    "check_id": "python.lang.security.audit.eval-detected",
+                    "path": os.path.join(self.temp_dir, "app.py"),
+                    "start": {"line": 7},
+                    "extra": {"severity": "ERROR", "metadata": {"confidence": 0.9}}
+                },
+                {
+                    "check_id": "python.lang.best-practice.unused-variable",
+                    "path": "lib/util.py",
+                    "start": {"line": 2}
+                }
+            ], "errors": []}
+
+        issues = self._parse(json.dumps(report).encode())
+
+        assert [(i.file, i.line, i.severity) for i in issues] == [
+            ("app.py", 7, Severity.HIGH),
+            ("lib/util.py", 2, Severity.LOW)
+        ]
+
+    def test_large_report_converted_in_process_pool(self, monkeypatch):
+        """Test that large reports are converted in pool batches, keeping report order."""
+        from analyzers import semgrep_runner
+
+        monkeypatch.setattr(semgrep_runner, "PARALLEL_CONVERT_MIN_FINDINGS", 4)
+        monkeypatch.setattr(semgrep_runner, "CONVERT_BATCH_SIZE", 3)
+
+        report = {"results": [
+            {"check_id": f"rule-{n}", "path": f"src/mod{n}.py", "start": {"line": n}}
+            for n in range(10)
+        ]}
+
+        issues = self._parse(json.dumps(report).encode())
+
+        assert [(i.rule_id, i.file, i.line) for i in issues] == [
+            (f"rule-{n}", f"src/mod{n}.py", n) for n in range(10)
+        ]
+        assert semgrep_runner._convert_pool is not None
+
+    def test_parse_missing_or_truncated_report(self):
+        """Test that empty or cut-off output yields no issues and is read to EOF."""
+        assert self._parse(b"") == []
+        assert self._parse(b'{"results": [{"check_id": "a"') == []
+
+    def test_severity_inferred_from_rule_id(self):
+        """Test rule ID inference, with critical fragments taking precedence over high ones."""
+        def severity(check_id):
+            return self.analyzer._determine_semgrep_severity({"check_id": check_id})
+
+        assert severity("java.critical.rce-in-template") == Severity.CRITICAL
+        assert severity("generic.remote-code-execution") == Severity.CRITICAL
+        assert severity("python.django.sql-injection.unused-import") == Severity.HIGH
+        assert severity("python.lang.todo-comment") == Severity.LOW
+        assert severity("python.lang.style.naming") == Severity.MEDIUM
+        assert self.analyzer._determine_semgrep_severity(
+            {"check_id": "x.rce", "extra": {"severity": "INFO"}}
+        ) == Severity.LOW
+
+    def test_explicit_severity_spellings(self):
+        """Test Semgrep's own severity spellings and looser ones from rule metadata."""
+        def severity(extra):
+            return self.analyzer._determine_semgrep_severity({"check_id": "x", "extra": extra})
+
+        assert severity({"severity": "ERROR"}) == Severity.HIGH
+        assert severity({"severity": "WARNING"}) == Severity.MEDIUM
+        assert severity({"metadata": {"severity": " Critical "}}) == Severity.CRITICAL
+        assert severity({"metadata": {"severity": 4}}) == Severity.CRITICAL
+        assert severity({"metadata": {"severity": ["odd"]}}) == Severity.MEDIUM
+
+    def test_run_analysis_uses_async_runner(self):
+        """Test that Semgrep runs through the asyncio subprocess runner."""
+        import asyncio
+        import subprocess
+
+        async def fake_stream_command_async(cmd, cwd, consume):
+            commands.append(cmd)
+            await asyncio.sleep(0)
+            report = {"results": [{"check_id": "rce-detected", "path": "app.py", "start": {"line": 1}}]}
+            issues = await consume(self._stdout(json.dumps(report).encode()))
+            return subprocess.CompletedProcess(cmd, 1, None, ""), issues
+
+        commands = []
+        self.analyzer.rulesets = ["p/owasp-top-ten"]
+        self.analyzer._stream_command_async = fake_stream_command_async
+        result = self.analyzer.run_analysis(self.temp_dir)
+
+        assert result.success
+        assert [i.rule_id for i in result.issues] == ["rce-detected"]
+        assert commands[0].count("--config") == 1
+        assert "--config=auto" not in commands[0]
+        assert not any(arg.startswith("--output") for arg in commands[0])
+        assert commands[0][-1] == self.temp_dir
+
+    def test_rulesets_run_concurrently_and_merge(self):
+        """Test that each ruleset gets its own Semgrep process and shared findings are merged."""
+        import asyncio
+        import subprocess
+        from analyzers.semgrep_runner import SemgrepAnalyzer
+
+        barrier = asyncio.Barrier(2)
+        commands = []
+
+        async def fake_stream_command_async(cmd, cwd, consume):
+            commands.append(cmd)
+            # Deadlocks (and times out) unless both processes run at once
+            await asyncio.wait_for(barrier.wait(), timeout=5)
+            config = cmd[cmd.index("--config") + 1]
+            report = {"results": [
+                {"check_id": "shared-rule", "path": "app.py", "start": {"line": 1}},
+                {"check_id": f"{config}-rule", "path": "app.py", "start": {"line": 2}}
+            ]}
+            issues = await consume(self._stdout(json.dumps(report).encode()))
+            return subprocess.CompletedProcess(cmd, 1, None, ""), issues
+
+        analyzer = SemgrepAnalyzer(rulesets=["p/one", "p/two"], jobs=4)
+        analyzer._stream_command_async = fake_stream_command_async
+        result = analyzer.run_analysis(self.temp_dir)
+
+        assert result.success
+        assert [i.rule_id for i in result.issues] == ["shared-rule", "p/one-rule", "p/two-rule"]
+        assert [cmd[cmd.index("--jobs") + 1] for cmd in commands] == ["2", "2"]
+        assert all(cmd.count("--config") == 1 for cmd in commands)
+
+
+    def test_distinct_matches_on_one_line_kept(self):
+        """Test that separate matches of a rule on the same line all survive, with or without merging."""
+        import subprocess
+        from analyzers.semgrep_runner import SemgrepAnalyzer
+
+        async def fake_stream_command_async(cmd, cwd, consume):
+            report = {"results": [
+                {"check_id": "weak-hash", "path": "app.py", "start": {"line": 3, "col": 5}},
+                {"check_id": "weak-hash", "path": "app.py", "start": {"line": 3, "col": 30}}
+            ]}
+            issues = await consume(self._stdout(json.dumps(report).encode()))
+            return subprocess.CompletedProcess(cmd, 1, None, ""), issues
+
+        for rulesets in (["p/one"], ["p/one", "p/two"]):
+            analyzer = SemgrepAnalyzer(rulesets=rulesets)
+            analyzer._stream_command_async = fake_stream_command_async
+            result = analyzer.run_analysis(self.temp_dir)
+
+            assert [i.column for i in result.issues] == [5, 30]
+            assert "column" not in result.issues[0].to_dict()
+
+
+class TestIssueSerialization:
+    """Test JSON serialization of normalized issues."""
+
+    def test_dumps_issue(self):
+        """Test that Issue.to_dict() round-trips through dumps."""
+        from analyzers.base import Issue, dumps
+
+        issue = Issue(
+            tool="bandit",
+            type="B105",
+            message="Possible hardcoded password: 'é'",
+            severity=Severity.HIGH,
+            file="app.py",
+            line=4,
+            rule_id="B105"
+        )
+
+        data = json.loads(dumps(issue.to_dict()))
+
+        assert data["severity"] == "high"
+        assert data["message"] == "Possible hardcoded password: 'é'"
+        assert data["suggestion"] is None
+
+
+    def test_columnar_dict_matches_row_layout(self):
+        """Test that the columnar layout carries the same values as to_dict()."""
+        from analyzers.base import AnalyzerResult, Issue, ISSUE_FIELDS, HIGH, LOW
+
+        result = AnalyzerResult("bandit", True, [
+            Issue("bandit", "B602", "shell", HIGH, "app.py", 3, "B602", "See: docs"),
+            Issue("bandit", "B101", "assert", LOW, "test.py", 7, "B101"),
+        ], 12)
+
+        rows = result.to_dict()["issues"]
+        columns = result.to_columnar_dict()["issues"]
+
+        assert list(columns) == list(ISSUE_FIELDS)
+        for field in ISSUE_FIELDS:
+            assert columns[field] == [row[field] for row in rows]
+        assert AnalyzerResult("bandit", True, [], 0).to_columnar_dict()["issues"]["line"] == []
+
+class TestAnalyzerRegistry:
+    """Test analyzer registry dispatch."""
+
+    def test_run_all_concurrently(self):
+        """Test that run_all runs every requested analyzer in parallel."""
+        import threading
+        from analyzers.base import AnalyzerRegistry, AnalyzerResult, BaseAnalyzer
+
+        barrier = threading.Barrier(2, timeout=5)
+
+        def make_analyzer(analyzer_name):
+            class FakeAnalyzer(BaseAnalyzer):
+                @property
+                def name(self):
+                    return analyzer_name
+
+                @property
+                def version(self):
+                    return "1.0"
+
+                def is_applicable(self, workspace_path):
+                    return True
+
+                def run_analysis(self, workspace_path, **kwargs):
+                    # Deadlocks (and times out) unless both run at once
+                    barrier.wait()
+                    return AnalyzerResult(self.name, True, [], 0)
+
+            return FakeAnalyzer
+
+        registry = AnalyzerRegistry()
+        registry.register(make_analyzer("first"))
+        registry.register(make_analyzer("second"))
+
+        results = registry.run_all("/tmp", names=["first", "second", "missing"])
+
+        assert [r.tool_name for r in results] == ["first", "second"]
+        assert all(r.success for r in results)
+
+
+class TestBanditSharding:
+    """Test splitting large workspaces across parallel Bandit processes."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _create_files(self, count, subdir="pkg"):
+        os.makedirs(os.path.join(self.temp_dir, subdir), exist_ok=True)
+        for i in range(count):
+            with open(os.path.join(self.temp_dir, subdir, f"mod_{i}.py"), "w") as f:
+                f.write("x = 1\n")
+
+    def test_small_workspace_not_sharded(self):
+        """Test that small workspaces use a single recursive scan."""
+        self._create_files(10)
+
+        assert BanditAnalyzer(jobs=8)._shard_python_files(self.temp_dir) == []
+
+    def test_large_workspace_sharded(self):
+        """Test that files are split evenly and hidden dirs are skipped."""
+        from analyzers.bandit_runner import MIN_FILES_PER_SHARD
+
+        self._create_files(MIN_FILES_PER_SHARD * 3)
+        self._create_files(5, subdir=".venv")
+
+        shards = BanditAnalyzer(jobs=2)._shard_python_files(self.temp_dir)
+
+        assert len(shards) == 2
+        assert sum(len(shard) for shard in shards) == MIN_FILES_PER_SHARD * 3
+        assert not any(".venv" in path for shard in shards for path in shard)
+
+    def test_single_job_not_sharded(self):
+        """Test that jobs=1 disables sharding."""
+        from analyzers.bandit_runner import MIN_FILES_PER_SHARD
+
+        self._create_files(MIN_FILES_PER_SHARD * 3)
+
+        assert BanditAnalyzer(jobs=1)._shard_python_files(self.temp_dir) == []
+
+
+@pytest.mark.skipif(not BANDIT_IMPORTABLE, reason="bandit is not installed")
+class TestBanditWorkers:
+    """Test scans served by persistent Bandit workers and Bandit's Python API."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.temp_dir, "app.py"), "w") as f:
+            f.write("import subprocess, sys\nsubprocess.call(sys.argv[1], shell=True)\npassword = 'hunter2'\n")
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @staticmethod
+    def _summary(result):
+        return sorted((i.rule_id, i.severity, i.file, i.line, i.suggestion) for i in result.issues)
+
+    @pytest.mark.skipif(shutil.which("bandit") is None, reason="bandit CLI is not installed")
+    def test_worker_matches_cli(self):
+        """Test that worker scans report the same issues as the bandit CLI."""
+        worker_result = BanditAnalyzer().run_analysis(self.temp_dir)
+        cli_result = BanditAnalyzer(use_workers=False).run_analysis(self.temp_dir)
+
+        assert worker_result.success and cli_result.success
+        assert worker_result.issues
+        assert self._summary(worker_result) == self._summary(cli_result)
+
+    def test_in_process_matches_worker(self):
+        """Test that in-process scans build the same issues as worker scans."""
+        in_process_result = BanditAnalyzer(in_process=True).run_analysis(self.temp_dir)
+        worker_result = BanditAnalyzer().run_analysis(self.temp_dir)
+
+        assert in_process_result.success
+        assert any(i.severity == Severity.CRITICAL for i in in_process_result.issues)
+        assert self._summary(in_process_result) == self._summary(worker_result)
+
+    def test_unsharded_scan_uses_worker_by_default(self, monkeypatch):
+        """Test that unsharded scans go to a worker, which enforces timeout_sec, unless in-process is opted into."""
+        analyzer = BanditAnalyzer()
+
+        def in_process(workspace_path):
+            raise AssertionError("scanned in-process")
+
+        monkeypatch.setattr(analyzer, "_run_bandit_in_process", in_process)
+        result = analyzer.run_analysis(self.temp_dir)
+
+        assert result.success
+        assert result.issues
+
+    def test_pool_reuses_workers(self):
+        """Test that consecutive scans are served by the same worker process."""
+        from analyzers.bandit_runner import BanditWorkerPool
+
+        pool = BanditWorkerPool(max_idle=1)
+        request = {"targets": [self.temp_dir], "recursive": True}
+        try:
+            pool.scan(request, timeout_sec=60)
+            pid = pool._idle[0].process.pid
+            response = pool.scan(request, timeout_sec=60)
+
+            assert pool._idle[0].process.pid == pid
+            assert json.loads(response)["results"]
+        finally:
+            pool.close()
+
+    def test_worker_timeout_kills_worker(self):
+        """Test that an overrunning worker is killed and reported as TimeoutExpired."""
+        import subprocess
+        from analyzers.bandit_runner import BanditWorker
+
+        worker = BanditWorker()
+        with pytest.raises(subprocess.TimeoutExpired):
+            worker.scan({"targets": [self.temp_dir], "recursive": True}, timeout_sec=0.01)
+
+        assert worker.process.wait(timeout=5) is not None
+        assert not worker.alive
+
+class TestApplicabilityCache:
+    """Test memoization of workspace applicability checks."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_bandit_applicability_tracks_workspace_changes(self):
+        """Test that adding a Python file invalidates the cached answer."""
+        analyzer = BanditAnalyzer()
+        with open(os.path.join(self.temp_dir, "README.md"), "w") as f:
+            f.write("docs")
+
+        assert not analyzer.is_applicable(self.temp_dir)
+        assert not analyzer.is_applicable(self.temp_dir)
+
+        with open(os.path.join(self.temp_dir, "main.py"), "w") as f:
+            f.write("print('hi')")
+
+        assert analyzer.is_applicable(self.temp_dir)
+
+    def test_semgrep_applicability_skips_ignored_dirs(self):
+        """Test that Semgrep only counts source files outside skipped directories."""
+        from analyzers.detect import scan_workspace
+        from analyzers.semgrep_runner import SemgrepAnalyzer
+
+        analyzer = SemgrepAnalyzer()
+        for rel_path in ("README.md", "node_modules/lib/index.js", ".cache/app.py"):
+            path = os.path.join(self.temp_dir, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "w").close()
+
+        assert not analyzer.is_applicable(self.temp_dir)
+
+        os.makedirs(os.path.join(self.temp_dir, "src"))
+        open(os.path.join(self.temp_dir, "src", "Main.JAVA"), "w").close()
+
+        assert analyzer.is_applicable(self.temp_dir)
+        assert analyzer.is_applicable(self.temp_dir, scan_workspace(self.temp_dir))
+
+    def test_semgrep_applicability_agrees_with_detection(self):
+        """Test that Semgrep's own check and workspace detection use the same extensions."""
+        from analyzers.detect import detect_applicable_analyzers
+        from analyzers.semgrep_runner import SemgrepAnalyzer
+
+        open(os.path.join(self.temp_dir, "deploy.sh"), "w").close()
+
+        assert SemgrepAnalyzer().is_applicable(self.temp_dir)
+        assert "semgrep" in detect_applicable_analyzers(self.temp_dir, ["semgrep"])
+
+    def test_versions_cached(self):
+        """Test that each analyzer's version command runs once per class."""
+        from analyzers.base import AnalyzerRegistry, BaseAnalyzer
+
+        calls = []
+
+        class FakeAnalyzer(BaseAnalyzer):
+            name = "fake"
+
+            @property
+            def version(self):
+                calls.append(1)
+                return "1.0"
+
+            def is_applicable(self, workspace_path):
+                return True
+
+            def run_analysis(self, workspace_path, **kwargs):
+                return None
+
+        registry = AnalyzerRegistry()
+        registry.register(FakeAnalyzer)
+
+        assert registry.get_versions() == {"fake": "1.0"}
+        assert registry.get_versions() == {"fake": "1.0"}
+        assert len(calls) == 1
+
+    def test_bandit_version_read_without_subprocess(self, monkeypatch):
+        """Test that Bandit's version comes from package metadata and is memoized."""
+        import importlib.metadata
+        import subprocess
+
+        def fail(*args, **kwargs):
+            raise AssertionError("bandit --version should not be spawned")
+
+        monkeypatch.setattr(subprocess, "run", fail)
+        analyzer = BanditAnalyzer()
+
+        assert analyzer.version == importlib.metadata.version("bandit")
+        assert "version" in analyzer.__dict__
+
+    def test_pip_audit_version_read_without_subprocess(self, monkeypatch):
+        """Test that pip-audit's version comes from package metadata when it is installed."""
+        import importlib.metadata
+        import subprocess
+        from analyzers.depcheck_runner import DepCheckAnalyzer
+
+        def fail(*args, **kwargs):
+            raise AssertionError("pip-audit --version should not be spawned")
+
+        real_version = importlib.metadata.version
+        monkeypatch.setattr(importlib.metadata, "version",
+                            lambda name: "2.7.3" if name == "pip-audit" else real_version(name))
+        monkeypatch.setattr(subprocess, "run", fail)
+
+        assert DepCheckAnalyzer().version == "2.7.3"
+
+
+class TestDepCheckAnalyzer:
+    """Test dependency file discovery and audit dispatch."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        from analyzers import depcheck_runner
+        depcheck_runner._osv_query_cache.clear()
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _create(self, rel_path, content=""):
+        path = os.path.join(self.temp_dir, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+
+    def test_dependency_files_audited_concurrently(self):
+        """Test that each dependency file is audited in parallel, in discovery order."""
+        import threading
+        from analyzers.base import Issue, LOW
+        from analyzers.depcheck_runner import DepCheckAnalyzer
+
+        self._create("Gemfile")
+        self._create("package.json", "{}")
+        barrier = threading.Barrier(2, timeout=5)
+
+        def fake_audit(dep_file, workspace_path):
+            # Deadlocks (and times out) unless both run at once
+            barrier.wait()
+            return [Issue("depcheck", "X", "vuln", LOW, dep_file, 1, "X")]
+
+        analyzer = DepCheckAnalyzer()
+        analyzer._analyze_dependency_file = fake_audit
+        result = analyzer.run_analysis(self.temp_dir)
+
+        assert result.success
+        assert [i.file for i in result.issues] == analyzer._find_dependency_files(self.temp_dir)
+
+    def test_collect_npm_deps_prefers_lockfile(self):
+        """Test that package-lock.json pins are used when present."""
+        from analyzers.depcheck_runner import DepCheckAnalyzer
+
+        self._create("package.json", json.dumps({"dependencies": {"lodash": "^4.17.20", "left-pad": "latest"}}))
+        analyzer = DepCheckAnalyzer()
+        manifest = os.path.join(self.temp_dir, "package.json")
+
+        assert analyzer._collect_npm_deps(manifest) == [("lodash", "4.17.20")]
+
+        self._create("package-lock.json", json.dumps({
+            "lockfileVersion": 3,
+            "packages": {
+                "": {"name": "app"},
+                "node_modules/lodash": {"version": "4.17.21"},
+                "node_modules/a/node_modules/@scope/b": {"version": "1.0.0"},
+                "node_modules/local": {"link": True}
+            }
+        }))
+
+        assert analyzer._collect_npm_deps(manifest) == [("@scope/b", "1.0.0"), ("lodash", "4.17.21")]
+
+    def test_npm_packages_checked_against_osv(self):
+        """Test that OSV batch results map back to the queried packages."""
+        import httpx
+        from analyzers.depcheck_runner import DepCheckAnalyzer
+
+        requests = []
+
+        def handler(request):
+            queries = json.loads(request.content)["queries"]
+            requests.append(queries)
+            return httpx.Response(200, json={"results": [
+                {"vulns": [{"id": "GHSA-xxxx-yyyy-zzzz"}]} if q["package"]["name"] == "lodash" else {}
+                for q in queries
+            ]})
+
+        analyzer = DepCheckAnalyzer()
+        packages = [("left-pad", "1.3.0"), ("lodash", "4.17.20")]
+        with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+            assert analyzer._query_osv(packages, "npm", client) == [[], ["GHSA-xxxx-yyyy-zzzz"]]
+
+        assert requests[0][1] == {"package": {"name": "lodash", "ecosystem": "npm"}, "version": "4.17.20"}
+
+    def test_osv_results_cached_across_queries(self):
+        """Test that repeated (package, version) lookups are answered from the cache."""
+        import httpx
+        from analyzers.depcheck_runner import DepCheckAnalyzer
+
+        queried = []
+
+        def handler(request):
+            queries = json.loads(request.content)["queries"]
+            queried.extend(q["package"]["name"] for q in queries)
+            return httpx.Response(200, json={"results": [
+                {"vulns": [{"id": "GHSA-xxxx-yyyy-zzzz"}]} if q["package"] == {"name": "lodash", "ecosystem": "npm"} else {}
+                for q in queries
+            ]})
+
+        analyzer = DepCheckAnalyzer()
+        with httpx.Client(transport=httpx.MockTransport(handler)) as client:
+            assert analyzer._query_osv([("lodash", "4.17.20")], "npm", client) == [["GHSA-xxxx-yyyy-zzzz"]]
+            assert analyzer._query_osv(
+                [("left-pad", "1.3.0"), ("lodash", "4.17.20"), ("left-pad", "1.3.0")], "npm", client
+            ) == [[], ["GHSA-xxxx-yyyy-zzzz"], []]
+            # Same name and version in another ecosystem is a different package
+            assert analyzer._query_osv([("lodash", "4.17.20")], "PyPI", client) == [[]]
+
+        assert queried == ["lodash", "left-pad", "lodash"]
+
+    def test_requirements_checked_against_osv(self, monkeypatch):
+        """Test the OSV lookup of pinned requirements, including advisory details."""
+        import httpx
+        from analyzers import depcheck_runner
+
+        self._create("requirements.txt", "Flask==0.5\nrequests>=2.0\n")
+        self._create("requirements-dev.txt", "flask==0.5  # shared\npytest==7.0\n")
+        queried = []
+
+        def handler(request):
+            if request.url.path == "/v1/querybatch":
+                queries = json.loads(request.content)["queries"]
+                queried.extend((q["package"]["name"], q["version"]) for q in queries)
+                return httpx.Response(200, json={"results": [
+                    {"vulns": [{"id": "GHSA-m2qf-hxjv-5gpq"}]} if q["package"]["name"].lower() == "flask" else {}
+                    for q in queries
+                ]})
+            assert request.url.path == "/v1/vulns/GHSA-m2qf-hxjv-5gpq"
+            return httpx.Response(200, json={
+                "id": "GHSA-m2qf-hxjv-5gpq",
+                "summary": "Flask vulnerable to possible disclosure of permanent session cookie",
+                "database_specific": {"severity": "HIGH"},
+                "affected": [{
+                    "package": {"name": "flask", "ecosystem": "PyPI"},
+                    "ranges": [{"type": "ECOSYSTEM", "events": [{"introduced": "0"}, {"fixed": "2.2.5"}]}]
+                }]
+            })
+
+        monkeypatch.setattr(depcheck_runner, "_osv_client", httpx.Client(transport=httpx.MockTransport(handler)))
+        result = depcheck_runner.DepCheckAnalyzer().run_analysis(self.temp_dir)
+
+        assert sorted(queried) == [("Flask", "0.5"), ("flask", "0.5"), ("pytest", "7.0")]
+        assert sorted((i.file, i.rule_id, i.severity, i.suggestion) for i in result.issues) == [
+            ("requirements-dev.txt", "GHSA-m2qf-hxjv-5gpq", Severity.HIGH, "Upgrade flask to version 2.2.5 or later"),
+            ("requirements.txt", "GHSA-m2qf-hxjv-5gpq", Severity.HIGH, "Upgrade Flask to version 2.2.5 or later"),
+        ]
+
+    def test_requirements_files_audited_in_one_run(self, monkeypatch):
+        """Test that one pip-audit run covers every requirements file and issues are attributed."""
+        import subprocess
+        from analyzers import depcheck_runner
+        from analyzers.depcheck_runner import DepCheckAnalyzer
+
+        monkeypatch.setitem(depcheck_runner.TOOL_PATHS, "pip-audit", "/usr/bin/pip-audit")
+
+        self._create("requirements.txt", "# app\nFlask==0.5\nrequests>=2.0\n")
+        self._create("requirements-dev.txt", "-r requirements.txt\npytest==7.0\n")
+        commands = []
+
+        def fake_run_command(cmd, cwd, **kwargs):
+            commands.append(cmd)
+            stdout = json.dumps({"dependencies": [
+                {"name": "flask", "version": "0.5", "vulns": [
+                    {"id": "PYSEC-2019-179", "fix_versions": ["1.0"], "aliases": [], "description": "DoS"}
+                ]},
+                {"name": "pytest", "version": "7.0", "vulns": []}
+            ]}).encode()
+            return subprocess.CompletedProcess(cmd, 1, stdout, b"")
+
+        analyzer = DepCheckAnalyzer(use_osv=False)
+        analyzer._run_command = fake_run_command
+        result = analyzer.run_analysis(self.temp_dir)
+
+        assert len(commands) == 1
+        assert commands[0].count("--requirement") == 2
+        assert [(i.rule_id, i.file, i.suggestion) for i in result.issues] == [
+            ("PYSEC-2019-179", "requirements.txt", "Upgrade flask to version 1.0 or later")
+        ]
+
+    def test_audit_reports_parsed_on_worker_threads(self, monkeypatch):
+        """Test that audit output is parsed by the audit's worker thread, not when results are collected."""
+        import subprocess
+        import threading
+        from analyzers import depcheck_runner
+        from analyzers.depcheck_runner import DepCheckAnalyzer
+
+        monkeypatch.setitem(depcheck_runner.TOOL_PATHS, "npm", "/usr/bin/npm")
+        self._create("package.json", "{}")
+        npm_output = json.dumps({"vulnerabilities": {
+            "lodash": {"severity": "high", "via": [{"title": "Prototype Pollution", "cwe": ["CWE-1321"]}]}
+        }}).encode()
+        parse_threads = []
+
+        analyzer = DepCheckAnalyzer(use_osv=False)
+        analyzer._run_command = lambda cmd, cwd, **kwargs: subprocess.CompletedProcess(cmd, 1, npm_output, b"")
+        parse = analyzer._parse_npm_audit_output
+
+        def recording_parse(*args):
+            for issue in parse(*args):
+                parse_threads.append(threading.current_thread())
+                yield issue
+
+        analyzer._parse_npm_audit_output = recording_parse
+        result = analyzer.run_analysis(self.temp_dir)
+
+        assert [i.rule_id for i in result.issues] == ["CWE-1321"]
+        assert parse_threads and threading.main_thread() not in parse_threads
+
+    def test_audit_reports_parsed_from_stream(self):
+        """Test that flat pip-audit reports and npm audit output are streamed into issues."""
+        from analyzers.depcheck_runner import DepCheckAnalyzer
+
+        analyzer = DepCheckAnalyzer()
+        report = json.dumps({"vulnerabilities": [
+            {"package": "jinja2", "installed_version": "2.0", "id": "PYSEC-1", "description": "XSS"}
+        ]}).encode()
+        npm_output = json.dumps({"vulnerabilities": {
+            "lodash": {"severity": "high", "via": [{"title": "Prototype Pollution", "cwe": ["CWE-1321"]}]}
+        }}).encode()
+
+        pip_issues = analyzer._parse_pip_audit_output(report, "requirements.txt", self.temp_dir)
+        npm_issues = analyzer._parse_npm_audit_output(npm_output, "package.json", self.temp_dir)
+
+        assert [(i.rule_id, i.severity) for i in pip_issues] == [("PYSEC-1", "high")]
+        assert [(i.rule_id, i.message, i.severity) for i in npm_issues] == [
+            ("CWE-1321", "Prototype Pollution", "high")
+        ]
+
+    def test_missing_audit_tools_skip_subprocess(self, monkeypatch):
+        """Test that audits for tools that aren't installed return without spawning anything."""
+        from analyzers import depcheck_runner
+        from analyzers.depcheck_runner import DepCheckAnalyzer
+
+        self._create("Gemfile")
+        self._create("requirements.txt", "flask==0.5\n")
+        monkeypatch.setitem(depcheck_runner.TOOL_PATHS, "bundle", None)
+        monkeypatch.setitem(depcheck_runner.TOOL_PATHS, "pip-audit", None)
+
+        def fail_run_command(*args, **kwargs):
+            raise AssertionError("audit tool should not be run")
+
+        analyzer = DepCheckAnalyzer(use_osv=False)
+        analyzer._run_command = fail_run_command
+        result = analyzer.run_analysis(self.temp_dir)
+
+        assert result.success
+        assert result.issues == []
+        assert analyzer.version == "unknown"
+
+
+class TestWorkspaceDetection:
+    """Test the single-pass workspace scan used for analyzer selection."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        for rel_path in [
+            "requirements.txt", "requirements-dev.txt", "Gemfile", "main.py",
+            "sub/package.json", "sub/requirements-ci.txt", "src/App/app.csproj",
+            "node_modules/lib/lib.csproj", ".hidden/hidden.csproj", "README.md"
+        ]:
+            path = os.path.join(self.temp_dir, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w") as f:
+                f.write("")
+
+    def teardown_method(self):
+        """Clean up test fixtures."""
+        import shutil
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_scan_collects_dependency_files(self):
+        """Test that dependency files are classified during the workspace walk."""
+        from analyzers.detect import _scan_workspace
+
+        file_info = _scan_workspace(self.temp_dir)
+
+        assert sorted(file_info["dep_files"]) == sorted([
+            "requirements.txt", "requirements-dev.txt", "Gemfile",
+            os.path.join("sub", "package.json"), os.path.join("sub", "requirements-ci.txt"),
+            os.path.join("src", "App", "app.csproj")
+        ])
+        assert {".py", ".md", ".txt"} <= file_info["extensions"]
+        assert {"package.json", "requirements-ci.txt"} <= file_info["basenames"]
+
+    def test_depcheck_uses_root_manifests_and_nested_globs(self):
+        """Test that exact manifest names only count at the workspace root."""
+        from analyzers.depcheck_runner import DepCheckAnalyzer
+
+        assert DepCheckAnalyzer()._find_dependency_files(self.temp_dir) == sorted([
+            "Gemfile", "requirements-dev.txt", "requirements.txt",
+            os.path.join("src", "App", "app.csproj"), os.path.join("sub", "requirements-ci.txt")
+        ])
+
+    def test_depcheck_reuses_applicability_walk(self, monkeypatch):
+        """Test that run_analysis reuses the dependency files found by is_applicable."""
+        from analyzers import depcheck_runner
+
+        walks = []
+        real_find = depcheck_runner.find_dependency_files
+
+        def counting_find(*args, **kwargs):
+            walks.append(args)
+            return real_find(*args, **kwargs)
+
+        monkeypatch.setattr(depcheck_runner, "find_dependency_files", counting_find)
+        analyzer = depcheck_runner.DepCheckAnalyzer()
+        analyzer._analyze_dependency_file = lambda dep_file, workspace_path: []
+
+        assert analyzer.is_applicable(self.temp_dir)
+        assert analyzer.run_analysis(self.temp_dir).success
+        assert len(walks) == 1
+
+    def test_depcheck_uses_shared_scan(self, monkeypatch):
+        """Test that a shared workspace scan is used without walking again."""
+        from analyzers import depcheck_runner
+        from analyzers.detect import scan_workspace
+
+        expected = depcheck_runner.DepCheckAnalyzer()._find_dependency_files(self.temp_dir)
+        file_info = scan_workspace(self.temp_dir)
+
+        def no_walk(*args, **kwargs):
+            raise AssertionError("workspace should not be walked again")
+
+        monkeypatch.setattr(depcheck_runner, "find_dependency_files", no_walk)
+        analyzer = depcheck_runner.DepCheckAnalyzer()
+        analyzer._analyze_dependency_file = lambda dep_file, workspace_path: []
+
+        assert analyzer._find_dependency_files(self.temp_dir, file_info) == expected
+        assert analyzer.is_applicable(self.temp_dir, file_info)
+        assert analyzer.run_analysis(self.temp_dir, file_info=file_info).success
+
+    def test_detect_applicable_analyzers(self):
+        """Test analyzer selection from the scanned workspace."""
+        from analyzers.detect import detect_applicable_analyzers
+
+        assert detect_applicable_analyzers(self.temp_dir, ["bandit", "depcheck", "gosec"]) == ["bandit", "depcheck"]
+
+
+class TestLazyRegistration:
+    """Test deferred import of analyzer modules."""
+
+    def test_lazy_analyzer_resolved_on_first_use(self):
+        """Test that a lazily registered analyzer is listed before import and resolved on demand."""
+        from analyzers.base import AnalyzerRegistry
+
+        registry = AnalyzerRegistry()
+        registry.register_lazy("bandit", ".bandit_runner:BanditAnalyzer")
+
+        assert registry.list_analyzers() == ["bandit"]
+        assert isinstance(registry.get_analyzer("bandit", timeout_sec=10), BanditAnalyzer)
+        assert registry.get_analyzer("missing") is None
+
+    def test_package_exports_analyzer_classes(self):
+        """Test that analyzer classes are still importable from the package."""
+        from analyzers import BanditAnalyzer as Exported
+
+        assert Exported is BanditAnalyzer
+
+
+class TestAsyncCommandRunner:
+    """Test the asyncio-based subprocess runner."""
+
+    def test_run_command_async_captures_output(self):
+        """Test that stdout, stderr and the exit code are captured."""
+        from analyzers.base import run_async
+
+        analyzer = BanditAnalyzer()
+        cmd = [sys.executable, "-c", "import sys; print('out'); sys.stderr.write('err'); sys.exit(3)"]
+
+        result = run_async(analyzer._run_command_async(cmd, os.getcwd()))
+
+        assert result.returncode == 3
+        assert result.stdout.strip() == "out"
+        assert result.stderr == "err"
+
+    def test_run_command_async_discards_stdout(self):
+        """Test that stdout can be discarded while stderr is still captured."""
+        from analyzers.base import run_async
+
+        analyzer = BanditAnalyzer()
+        cmd = [sys.executable, "-c", "import sys; print('x' * 100000); sys.stderr.write('err')"]
+
+        result = run_async(analyzer._run_command_async(cmd, os.getcwd(), capture_stdout=False))
+
+        assert result.returncode == 0
+        assert result.stdout == ""
+        assert result.stderr == "err"
+
+    def test_stream_command_async_consumes_stdout(self):
+        """Test that stdout is handed to the consumer while stderr is drained alongside."""
+        from analyzers.base import run_async
+
+        analyzer = BanditAnalyzer()
+        # Both outputs exceed a pipe buffer, so reading them one after the other would deadlock
+        cmd = [sys.executable, "-c",
+               "import sys; sys.stderr.write('e' * 200000); sys.stderr.flush(); print('x' * 200000)"]
+
+        async def count_bytes(stream):
+            total = 0
+            while chunk := await stream.read(65536):
+                total += len(chunk)
+            return total
+
+        result, consumed = run_async(analyzer._stream_command_async(cmd, os.getcwd(), count_bytes))
+
+        assert result.returncode == 0
+        assert result.stdout is None
+        assert result.stderr == "e" * 200000
+        assert consumed == 200001
+
+    def test_run_command_async_timeout(self):
+        """Test that a hung tool is killed and reported as TimeoutExpired."""
+        import subprocess
+        from analyzers.base import run_async
+
+        analyzer = BanditAnalyzer(timeout_sec=1)
+        cmd = [sys.executable, "-c", "import time; time.sleep(30)"]
+
+        with pytest.raises(subprocess.TimeoutExpired):
+            run_async(analyzer._run_command_async(cmd, os.getcwd()))
+
+    def test_run_command_timeout_kills_child_processes(self):
+        """Test that a timeout also kills processes the tool spawned."""
+        import subprocess
+        import time
+
+        analyzer = BanditAnalyzer(timeout_sec=1)
+        marker = os.path.join(tempfile.mkdtemp(), "grandchild-survived")
+        grandchild = f"import time; time.sleep(2); open({marker!r}, 'w').close()"
+        cmd = [sys.executable, "-c",
+               f"import subprocess, sys; subprocess.Popen([sys.executable, '-c', {grandchild!r}]).wait()"]
+
+        with pytest.raises(subprocess.TimeoutExpired):
+            analyzer._run_command(cmd, os.getcwd())
+
+        time.sleep(2.5)
+        assert not os.path.exists(marker)
+        shutil.rmtree(os.path.dirname(marker), ignore_errors=True)
+
+
+class TestSeverityNormalization:
+    """Test mapping of raw tool severities to canonical strings."""
+
+    def test_parse_severity_returns_canonical_strings(self):
+        """Test that raw severities map to plain strings equal to the enum values."""
+        analyzer = BanditAnalyzer()
+
+        assert analyzer._parse_severity("ERROR") == "high"
+        assert analyzer._parse_severity(" warning ") == Severity.MEDIUM
+        assert analyzer._parse_severity("4") == Severity.CRITICAL
+        assert analyzer._parse_severity("bogus") == "medium"
+        assert type(analyzer._parse_severity("info")) is str
+
+    def test_bandit_severity_upgrades(self):
+        """Test that only HIGH findings from critical tests are escalated."""
+        analyzer = BanditAnalyzer()
+
+        assert analyzer._map_bandit_severity("HIGH", "B602") == Severity.CRITICAL
+        assert analyzer._map_bandit_severity("MEDIUM", "B602") == Severity.MEDIUM
+        assert analyzer._map_bandit_severity("high", "B101") == Severity.HIGH
+        assert analyzer._map_bandit_severity("UNDEFINED", "B602") == Severity.MEDIUM
+
+    def test_vulnerability_severity_from_description(self):
+        """Test that description keywords classify dependency vulnerabilities."""
+        from analyzers.depcheck_runner import DepCheckAnalyzer
+
+        analyzer = DepCheckAnalyzer()
+
+        assert analyzer._determine_vulnerability_severity(
+            {"id": "PYSEC-1", "description": "Stored XSS leading to Remote Code Execution"}
+        ) == Severity.CRITICAL
+        assert analyzer._determine_vulnerability_severity(
+            {"id": "PYSEC-2", "description": "SQL injection in the query builder"}
+        ) == Severity.HIGH
+        assert analyzer._determine_vulnerability_severity(
+            {"id": "PYSEC-3", "description": "Denial of service via crafted input"}
+        ) == Severity.MEDIUM
+        assert analyzer._determine_vulnerability_severity(
+            {"id": "CVE-2024-1", "description": "Denial of service via crafted input"}
+        ) == Severity.HIGH
+
+    def test_report_builder_accepts_canonical_strings(self):
+        """Test that canonical severity strings convert to report severities."""
+        from analyzers.base import AnalyzerResult, Issue, HIGH
+        from pipeline.report_schema import ReportBuilder, Severity as ReportSeverity
+
+        builder = ReportBuilder()
+        builder.add_analyzer_result(AnalyzerResult(
+            tool_name="bandit",
+            success=True,
+            issues=[Issue("bandit", "B602", "shell", HIGH, "app.py", 1, "B602")],
+            duration_ms=0
+        ))
+
+        assert builder.issues[0].severity is ReportSeverity.HIGH
@@ -28,6 +28,25 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """Point the app's storage at tmp_path, with a fresh report index."""
+    from pipeline.report_index import ReportIndex
+    app_module = sys.modules["api.app"]
+    
+    for subdir in ("workspace", "reports", "logs"):
+        (tmp_path / subdir).mkdir()
+    monkeypatch.setenv("STORAGE_BASE", str(tmp_path))
+    monkeypatch.setattr(app_module, "STORAGE_BASE", str(tmp_path))
+    monkeypatch.setattr(app_module, "REPORTS_DIR", str(tmp_path / "reports"))
+    monkeypatch.setattr(app_module, "WORKSPACE_DIR", str(tmp_path / "workspace"))
+    
+    index = ReportIndex(str(tmp_path / "reports"))
+    monkeypatch.setattr(app_module, "report_index", index)
+    yield index
+    index.close()
+
+
 class TestHealthEndpoint:
     """Test health check endpoint."""
     
@@ -41,6 +60,36 @@ class TestHealthEndpoint:
         assert "version" in data
 
 
+class TestToolsEndpoint:
+    """Test /tools endpoint."""
+    
+    def test_tool_versions_looked_up_once(self):
+        """Test that analyzer versions are resolved at startup and then served from app state."""
+        from analyzers.base import analyzer_registry
+        
+        with patch.object(analyzer_registry, "get_versions", return_value={"bandit": "1.0"}) as get_versions:
+            with TestClient(app) as client:
+                for _ in range(3):
+                    response = client.get("/tools")
+                    assert response.status_code == 200
+                    assert response.json()["versions"] == {"bandit": "1.0"}
+        
+        assert get_versions.call_count == 1
+        del app.state.tool_versions
+    
+    def test_non_string_keys_rendered(self):
+        """Test that the default response class serializes non-string dict keys."""
+        from analyzers.base import analyzer_registry
+        
+        with patch.object(analyzer_registry, "get_versions", return_value={1: "x"}):
+            with TestClient(app) as client:
+                response = client.get("/tools")
+        
+        assert response.status_code == 200
+        assert response.json()["versions"] == {"1": "x"}
+        del app.state.tool_versions
+
+
 class TestAIConfigEndpoints:
     """Test AI configuration endpoints (Phase 3)."""
     
@@ -175,6 +224,38 @@ class TestAIConfigEndpoints:
         # Empty payload is now accepted (returns 200 with no changes)
         # or returns 400 - both are acceptable behaviors
         assert response.status_code in [200, 400]
+    
+    def test_patch_ai_config_rejected_update_changes_nothing(self, client):
+        """Test that a PATCH with one invalid field leaves every setting unchanged."""
+        before = client.get("/config/ai").json()
+        
+        response = client.patch("/config/ai", json={"model": "GPT_4_32K", "timeout_sec": 30})
+        
+        assert response.status_code == 400
+        assert client.get("/config/ai").json() == before
+    
+    def test_patch_ai_config_disables_analysis(self, client, storage):
+        """Test that disabling AI analysis at runtime skips the bridge for completed jobs."""
+        import asyncio
+        app_module = sys.modules["api.app"]
+        bridge = Mock()
+        # A report that would be sent for analysis if it were enabled
+        with open(app_module.report_paths("ai_off_job_1").report, "w") as f:
+            json.dump({"job_id": "ai_off_job_1", "summary": {"high": 1}, "files": []}, f)
+        
+        with patch.object(app_module.ai_config, "enabled", True), patch.object(app_module, "agent_bridge", bridge), \
+                patch.dict(os.environ, {"ENABLE_AI_ANALYSIS": "true"}):
+            assert client.patch("/config/ai", json={"enabled": False}).status_code == 200
+            assert client.get("/config/ai").json()["enabled"] is False
+            
+            async def process():
+                app.state.loop = asyncio.get_running_loop()
+                await app_module.process_completed_job("ai_off_job_1", {"status": "completed"})
+            
+            with patch.object(app_module, "deliver_webhooks", AsyncMock()):
+                asyncio.run(process())
+        
+        bridge.process_vulnerabilities.assert_not_called()
 
 
 class TestDashboardEndpoint:
@@ -205,6 +286,69 @@ class TestDashboardEndpoint:
         assert isinstance(data["ai_enhanced_reports"], int)
         assert isinstance(data["active_jobs"], int)
         assert isinstance(data["recent_scans"], list)
+    
+    def test_dashboard_stats_from_report_index(self, client, storage):
+        """Test that dashboard totals and recent scans come from the report index."""
+        before = client.get("/dashboard/stats").json()
+        storage.add_dict({
+            "job_id": "dashboard_job_1",
+            "meta": {"tools": ["bandit"], "repo": {"url": None}, "generated_at": "2099-01-01T00:00:00",
+                     "duration_ms": 1, "labels": []},
+            "summary": {"critical": 1, "high": 2, "medium": 3, "low": 4},
+            "files": []
+        })
+        storage.mark_enhanced("dashboard_job_1")
+        
+        data = client.get("/dashboard/stats").json()
+        
+        assert data["total_scans"] == before["total_scans"] + 1
+        assert data["ai_enhanced_reports"] == before["ai_enhanced_reports"] + 1
+        assert data["severity_distribution"]["low"] == before["severity_distribution"]["low"] + 4
+        assert data["recent_scans"][0] == {
+            "job_id": "dashboard_job_1",
+            "generated_at": "2099-01-01T00:00:00",
+            "total_issues": 10,
+            "has_ai_analysis": True
+        }
+    
+    def test_dashboard_stats_does_not_list_reports_dir(self, client):
+        """Test that dashboard stats are served without scanning the reports directory."""
+        with patch("os.scandir", side_effect=AssertionError("scanned")):
+            response = client.get("/dashboard/stats")
+        
+        assert response.status_code == 200
+    
+    def test_index_migration_marks_existing_enhanced_reports(self):
+        """Test that an index created before the AI flag picks it up from enhanced report files."""
+        import sqlite3
+        from pipeline.report_index import ReportIndex, REPORT_INDEX_FILE
+        
+        reports_dir = tempfile.mkdtemp()
+        conn = sqlite3.connect(os.path.join(reports_dir, REPORT_INDEX_FILE))
+        conn.execute(
+            "CREATE TABLE reports (job_id TEXT PRIMARY KEY, repo_url TEXT, generated_at TEXT NOT NULL, "
+            "critical INTEGER NOT NULL DEFAULT 0, high INTEGER NOT NULL DEFAULT 0, "
+            "medium INTEGER NOT NULL DEFAULT 0, low INTEGER NOT NULL DEFAULT 0, "
+            "tools TEXT NOT NULL DEFAULT '[]', labels TEXT NOT NULL DEFAULT '[]')"
+        )
+        conn.executemany(
+            "INSERT INTO reports (job_id, generated_at) VALUES (?, ?)",
+            [("old_job_1", "2024-01-01T00:00:00"), ("old_job_2", "2024-01-02T00:00:00")]
+        )
+        conn.commit()
+        conn.close()
+        with open(os.path.join(reports_dir, "old_job_1_enhanced.json"), "w") as f:
+            json.dump({"job_id": "old_job_1"}, f)
+        
+        index = ReportIndex(reports_dir)
+        try:
+            count, enhanced, _ = index.severity_totals()
+            recent = index.recent()
+        finally:
+            index.close()
+        
+        assert (count, enhanced) == (2, 1)
+        assert [(r["job_id"], r["has_ai_analysis"]) for r in recent] == [("old_job_2", False), ("old_job_1", True)]
 
 
 class TestAnalyzeEndpoint:
@@ -235,6 +379,62 @@ class TestAnalyzeEndpoint:
             assert "job_id" in data
 
 
+class TestUploadHandling:
+    """Test streaming of uploaded archives to disk."""
+    
+    def test_upload_streamed_to_disk(self):
+        """Test that an upload is copied to the workspace in chunks."""
+        import asyncio
+        import io
+        from fastapi import UploadFile
+        from api.app import save_upload
+        
+        data = b"PK" + os.urandom(3 * 1024 * 1024)
+        with patch("api.app.UPLOAD_CHUNK_SIZE", 64 * 1024):
+            path = asyncio.run(save_upload(UploadFile(file=io.BytesIO(data), filename="src.zip")))
+        
+        try:
+            assert os.path.dirname(path) == os.path.join(os.environ["STORAGE_BASE"], "workspace")
+            with open(path, "rb") as f:
+                assert f.read() == data
+        finally:
+            os.remove(path)
+    
+    def test_oversized_upload_rejected_mid_stream(self):
+        """Test that the size limit applies even when the upload size is unknown."""
+        import asyncio
+        import io
+        from fastapi import HTTPException, UploadFile
+        from api.app import save_upload
+        
+        workspace = os.path.join(os.environ["STORAGE_BASE"], "workspace")
+        before = set(os.listdir(workspace))
+        
+        with patch("api.app.MAX_UPLOAD_SIZE", 1024), patch("api.app.UPLOAD_CHUNK_SIZE", 256):
+            with pytest.raises(HTTPException) as exc_info:
+                asyncio.run(save_upload(UploadFile(file=io.BytesIO(b"x" * 4096), filename="big.zip")))
+        
+        assert exc_info.value.status_code == 413
+        assert set(os.listdir(workspace)) == before
+    
+    def test_oversized_upload_rejected_before_body(self):
+        """Test that a too-large Content-Length on /analyze gets 413 without reaching the app."""
+        from api.app import UploadSizeLimit
+        
+        inner = AsyncMock()
+        client = TestClient(UploadSizeLimit(inner, limit=10))
+        response = client.post("/analyze", content=b"x" * 100)
+        
+        assert response.status_code == 413
+        assert response.json()["error"]["code"] == "PAYLOAD_TOO_LARGE"
+        inner.assert_not_awaited()
+        
+        # Other routes, and bodies within the limit, pass through
+        client = TestClient(UploadSizeLimit(app, limit=10))
+        assert client.post("/health", content=b"x" * 100).status_code == 405
+        assert client.post("/analyze", data={"x": "1"}).status_code != 413
+
+
 class TestReportEndpoints:
     """Test report retrieval endpoints."""
     
@@ -251,6 +451,249 @@ class TestReportEndpoints:
         
         # Should return 404
         assert response.status_code == 404
+    
+    def test_report_files_replaced_atomically(self):
+        """Test that report writes go through a temporary file renamed into place."""
+        from pipeline.orchestrator import write_file_atomic
+        
+        reports_dir = tempfile.mkdtemp()
+        path = os.path.join(reports_dir, "atomic_job_1_enhanced.json")
+        with patch("os.fsync", wraps=os.fsync) as fsync:
+            write_file_atomic(path, b'{"version": 1}')
+        fsync.assert_called_once()
+        
+        with patch("os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                write_file_atomic(path, b'{"version": 2}')
+        
+        with open(path, "rb") as f:
+            assert f.read() == b'{"version": 1}'
+        assert os.listdir(reports_dir) == ["atomic_job_1_enhanced.json"]
+    
+    def test_get_enhanced_report_cached_until_rewritten(self, client):
+        """Test that enhanced reports are parsed once per file version."""
+        api_module = sys.modules["api.app"]
+        enhanced_file = os.path.join(os.environ["STORAGE_BASE"], "reports", "cached_job_1_enhanced.json")
+        with open(enhanced_file, "w") as f:
+            json.dump({"job_id": "cached_job_1", "version": 1}, f)
+        
+        api_module._load_report_bytes.cache_clear()
+        for _ in range(3):
+            response = client.get("/reports/cached_job_1/enhanced")
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/json"
+            assert response.json()["version"] == 1
+        assert api_module._load_report_bytes.cache_info().misses == 1
+        
+        with open(enhanced_file, "w") as f:
+            json.dump({"job_id": "cached_job_1", "version": 22}, f)
+        
+        assert client.get("/reports/cached_job_1/enhanced").json()["version"] == 22
+    
+    def test_get_report_summary_from_stored_report(self, client):
+        """Test GET /reports/{job_id}/summary reads the stored report file."""
+        summary = {"critical": 1, "high": 2, "medium": 0, "low": 3}
+        report_file = os.path.join(os.environ["STORAGE_BASE"], "reports", "stored_job_1.json")
+        with open(report_file, "w") as f:
+            json.dump({"job_id": "stored_job_1", "summary": summary}, f)
+        
+        response = client.get("/reports/stored_job_1/summary")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == {"job_id": "stored_job_1", "summary": summary}
+
+
+class TestReportListing:
+    """Test the indexed /reports listing."""
+    
+    def test_report_index_shared_with_orchestrator(self):
+        """Test that the API reads through the orchestrator's index rather than opening its own."""
+        app_module = sys.modules["api.app"]
+        
+        with TestClient(app):
+            assert app_module.report_index is app_module.orchestrator.report_index
+    
+    @staticmethod
+    def _report(job_id, generated_at, repo_url, summary, tools, labels):
+        return {
+            "job_id": job_id,
+            "meta": {
+                "tools": tools,
+                "repo": {"url": repo_url},
+                "generated_at": generated_at,
+                "duration_ms": 10,
+                "labels": labels
+            },
+            "summary": summary,
+            "files": []
+        }
+    
+    def test_list_reports_filters_and_paginates(self, client, storage):
+        """Test that /reports is served from the index with working filters."""
+        storage.add_dict(self._report(
+            "list_job_1", "2030-01-01T00:00:00", "https://github.com/org/one",
+            {"critical": 0, "high": 1, "medium": 0, "low": 0}, ["bandit"], ["nightly"]
+        ))
+        storage.add_dict(self._report(
+            "list_job_2", "2030-01-02T00:00:00", "https://github.com/org/two",
+            {"critical": 0, "high": 0, "medium": 2, "low": 0}, ["semgrep"], []
+        ))
+        
+        response = client.get("/reports", params={"since": "2030-01-01", "until": "2030-01-31", "limit": 1})
+        data = response.json()
+        assert response.status_code == 200
+        assert data["total"] == 2
+        assert [item["job_id"] for item in data["items"]] == ["list_job_2"]
+        
+        for params in ({"severity": "high"}, {"tool": "bandit"}, {"label": "nightly"},
+                       {"repo": "https://github.com/org/one"}):
+            data = client.get("/reports", params={"since": "2030-01-01", "until": "2030-01-31", **params}).json()
+            assert [item["job_id"] for item in data["items"]] == ["list_job_1"]
+        
+        assert client.get("/reports", params={"severity": "bogus"}).status_code == 400
+    
+    def test_report_and_summary_served_without_parsing(self, client, storage):
+        """Test that /reports/{id} streams the stored file and the summary comes from the index."""
+        report = self._report(
+            "served_job_1", "2030-02-01T00:00:00", None,
+            {"critical": 2, "high": 0, "medium": 1, "low": 0}, ["bandit"], []
+        )
+        report_file = os.path.join(os.environ["STORAGE_BASE"], "reports", "served_job_1.json")
+        with open(report_file, "w") as f:
+            json.dump(report, f)
+        storage.add_dict(report)
+        
+        response = client.get("/reports/served_job_1")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == report
+        
+        # The index, not the file, answers summary requests
+        os.remove(report_file)
+        data = client.get("/reports/served_job_1/summary").json()
+        assert data == {"job_id": "served_job_1", "summary": report["summary"]}
+    
+    def test_report_conditional_get(self, client):
+        """Test that reports carry an ETag and a matching If-None-Match gets a 304."""
+        report_file = os.path.join(os.environ["STORAGE_BASE"], "reports", "etag_job_1.json")
+        enhanced_file = os.path.join(os.environ["STORAGE_BASE"], "reports", "etag_job_1_enhanced.json")
+        for path in (report_file, enhanced_file):
+            with open(path, "w") as f:
+                json.dump({"job_id": "etag_job_1"}, f)
+        
+        for url in ("/reports/etag_job_1", "/reports/etag_job_1/enhanced"):
+            response = client.get(url)
+            etag = response.headers["etag"]
+            assert response.status_code == 200
+            assert etag.startswith('W/"')
+            assert "last-modified" in response.headers
+            
+            cached = client.get(url, headers={"If-None-Match": etag})
+            assert cached.status_code == 304
+            assert cached.content == b""
+            
+            assert client.get(url, headers={"If-None-Match": 'W/"stale"'}).status_code == 200
+    
+    def test_index_backfills_existing_reports(self):
+        """Test that a new index picks up report files written before it existed."""
+        from pipeline.report_index import ReportIndex
+        
+        reports_dir = tempfile.mkdtemp()
+        with open(os.path.join(reports_dir, "old_job.json"), "w") as f:
+            json.dump(self._report(
+                "old_job", "2020-01-01T00:00:00", None,
+                {"critical": 1, "high": 0, "medium": 0, "low": 0}, ["bandit"], []
+            ), f)
+        with open(os.path.join(reports_dir, "old_job_enhanced.json"), "w") as f:
+            json.dump({"job_id": "old_job"}, f)
+        
+        with patch("os.scandir", wraps=os.scandir) as scandir:
+            index = ReportIndex(reports_dir)
+        items, total = index.query()
+        recent = index.recent()
+        index.close()
+        
+        assert total == 1
+        assert items[0].job_id == "old_job"
+        assert items[0].summary.critical == 1
+        assert recent[0]["has_ai_analysis"] is True
+        scandir.assert_called_once_with(reports_dir)
+    
+    def test_report_header_skips_files(self):
+        """Test that only the fields before "files" are parsed, with a full-parse fallback."""
+        import orjson
+        from pipeline.report_index import read_report_header
+        
+        report = self._report(
+            "header_job", "2020-01-01T00:00:00", None,
+            {"critical": 0, "high": 2, "medium": 0, "low": 0}, ["bandit"], []
+        )
+        report["files"] = [{"path": "a.py", "issues": [{"id": "x"}] * 100}]
+        reports_dir = tempfile.mkdtemp()
+        
+        indented = os.path.join(reports_dir, "indented.json")
+        with open(indented, "wb") as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        header = read_report_header(indented)
+        assert "files" not in header
+        assert header["summary"] == report["summary"]
+        
+        # "files" written first leaves nothing to cut; the whole file is parsed
+        reordered = os.path.join(reports_dir, "reordered.json")
+        with open(reordered, "wb") as f:
+            f.write(orjson.dumps({"files": report["files"], **report}))
+        header = read_report_header(reordered)
+        assert header["job_id"] == "header_job"
+        assert "files" not in header
+
+
+class TestJobListing:
+    """Test the /jobs listing."""
+    
+    def test_list_jobs_newest_first_with_status_filter(self, client):
+        """Test that jobs are filtered by status and limited to the newest."""
+        from pipeline.report_schema import JobInfo, JobStatus
+        app_module = sys.modules["api.app"]
+        
+        jobs = {
+            job_id: JobInfo(job_id=job_id, status=status, progress=None, submitted_at=submitted_at,
+                            started_at=None, finished_at=None, error=None)
+            for job_id, status, submitted_at in [
+                ("job_a", JobStatus.QUEUED, "2024-01-01T00:00:01"),
+                ("job_b", JobStatus.RUNNING, "2024-01-01T00:00:03"),
+                ("job_c", JobStatus.QUEUED, "2024-01-01T00:00:02"),
+                ("job_d", JobStatus.QUEUED, "2024-01-01T00:00:04"),
+            ]
+        }
+        with patch.dict(app_module.orchestrator.active_jobs, jobs, clear=True):
+            response = client.get("/jobs", params={"limit": 2, "status": "queued"})
+        
+        assert response.status_code == 200
+        assert [job["job_id"] for job in response.json()["jobs"]] == ["job_d", "job_c"]
+
+
+    def test_job_status_read_off_event_loop(self, client):
+        """Test that job status lookups, which may read state files, run outside the event loop."""
+        import asyncio
+        from pipeline.report_schema import JobInfo, JobStatus
+        app_module = sys.modules["api.app"]
+        on_loop = []
+        
+        def get_job_status(job_id):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(True)
+            except RuntimeError:
+                on_loop.append(False)
+            return JobInfo(job_id=job_id, status=JobStatus.COMPLETED, progress=None,
+                           submitted_at="2024-01-01T00:00:00", started_at=None, finished_at=None, error=None)
+        
+        with patch.object(app_module.orchestrator, "get_job_status", side_effect=get_job_status):
+            response = client.get("/jobs/threaded_job_1")
+        
+        assert response.status_code == 200
+        assert on_loop == [False]
 
 
 class TestEnhancedReportEndpoint:
@@ -267,6 +710,302 @@ class TestEnhancedReportEndpoint:
         assert response.status_code == 404
 
 
+class TestWebhookSigning:
+    """Test webhook payload signatures."""
+    
+    def test_signature_matches_hmac_sha256(self):
+        """Test that the reused HMAC template signs each payload independently."""
+        import hashlib
+        import hmac
+        from pipeline.report_schema import WebhookConfig
+        
+        webhook = WebhookConfig(id="wh_1", url="https://example.com/hook", events=["report.created"],
+                                secret="s3cret", created_at="2024-01-01T00:00:00")
+        for body in (b'{"job_id": "a"}', b'{"job_id": "b"}'):
+            expected = hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+            assert webhook.sign(body) == f"sha256={expected}"
+        
+        unsigned = WebhookConfig(id="wh_2", url="https://example.com/hook", events=["report.created"],
+                                 secret=None, created_at="2024-01-01T00:00:00")
+        assert unsigned.sign(b"{}") is None
+        
+        # The key comes from the current secret, not from the first signature
+        webhook.secret = "rotated"
+        expected = hmac.new(b"rotated", b"{}", hashlib.sha256).hexdigest()
+        assert webhook.sign(b"{}") == f"sha256={expected}"
+    
+    def test_send_webhook_uses_shared_client(self):
+        """Test that deliveries go through the app-scoped pooled client."""
+        import asyncio
+        import httpx
+        from api.app import send_webhook
+        from pipeline.report_schema import WebhookConfig
+        
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(204)
+        
+        webhook = WebhookConfig(id="wh_1", url="https://example.com/hook", events=["report.created"],
+                                secret="s3cret", created_at="2024-01-01T00:00:00")
+        
+        async def deliver_twice():
+            app.state.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            try:
+                await send_webhook(webhook, {"job_id": "a"})
+                await send_webhook(webhook, {"job_id": "b"})
+            finally:
+                await app.state.http.aclose()
+        
+        asyncio.run(deliver_twice())
+        
+        assert [json.loads(r.content) for r in requests] == [{"job_id": "a"}, {"job_id": "b"}]
+        assert all(r.headers["X-Signature"].startswith("sha256=") for r in requests)
+
+
+class TestJobEvents:
+    """Test the /events SSE stream."""
+    
+    def test_events_forwarded_until_finished(self):
+        """Test that job events reach a subscriber and the stream ends on 'finished'."""
+        import asyncio
+        app_module = sys.modules["api.app"]
+        
+        async def subscribe():
+            app.state.loop = asyncio.get_running_loop()
+            response = await app_module.get_job_events("sse_job_1")
+            
+            async def collect():
+                return [chunk async for chunk in response.body_iterator]
+            
+            task = asyncio.create_task(collect())
+            while "sse_job_1" not in app_module.sse_queues:
+                await asyncio.sleep(0)
+            
+            app_module.handle_job_event("sse_job_1", "progress", {"percent": 50})
+            app_module.handle_job_event("sse_job_1", "finished", {"status": "failed"})
+            return await asyncio.wait_for(task, timeout=5)
+        
+        chunks = asyncio.run(subscribe())
+        
+        assert chunks == [
+            b'event: progress\ndata: {"percent":50}\n\n',
+            b'event: finished\ndata: {"status":"failed"}\n\n'
+        ]
+        assert "sse_job_1" not in app_module.sse_queues
+    
+    def test_idle_stream_sends_heartbeat(self):
+        """Test that an idle stream yields comment frames until the next event."""
+        import asyncio
+        app_module = sys.modules["api.app"]
+        
+        async def subscribe():
+            app.state.loop = asyncio.get_running_loop()
+            with patch.object(app_module, "SSE_HEARTBEAT_SEC", 0.01), patch.object(app_module, "orchestrator", None):
+                response = await app_module.get_job_events("sse_idle")
+                stream = response.body_iterator
+                heartbeat = await asyncio.wait_for(stream.__anext__(), timeout=5)
+                app_module.handle_job_event("sse_idle", "finished", {"status": "failed"})
+                return heartbeat, [chunk async for chunk in stream if chunk != app_module.SSE_HEARTBEAT_FRAME]
+        
+        heartbeat, rest = asyncio.run(subscribe())
+        
+        assert heartbeat == b":\n\n"
+        assert rest == [b'event: finished\ndata: {"status":"failed"}\n\n']
+    
+    def test_finished_reaches_full_queue_and_clears_entry(self):
+        """Test that 'finished' is delivered even to a backed-up subscriber and drops the job's entry."""
+        import asyncio
+        app_module = sys.modules["api.app"]
+        
+        async def publish():
+            queue = asyncio.Queue(maxsize=2)
+            with patch.dict(app_module.sse_queues, {"sse_job_2": [queue]}):
+                for percent in (10, 20, 30):
+                    app_module.publish_sse_event("sse_job_2", "progress", f"{percent}".encode())
+                app_module.publish_sse_event("sse_job_2", "finished", b"done")
+                assert "sse_job_2" not in app_module.sse_queues
+            return [queue.get_nowait() for _ in range(queue.qsize())]
+        
+        assert asyncio.run(publish()) == [("progress", b"20"), ("finished", b"done")]
+    
+    def test_oldest_job_evicted_at_limit(self):
+        """Test that subscribing past SSE_MAX_JOBS closes the oldest job's streams."""
+        import asyncio
+        app_module = sys.modules["api.app"]
+        
+        async def subscribe():
+            old_queue = asyncio.Queue()
+            with patch.dict(app_module.sse_queues, {"sse_old": [old_queue]}, clear=True), \
+                    patch.object(app_module, "SSE_MAX_JOBS", 1), patch.object(app_module, "orchestrator", None):
+                response = await app_module.get_job_events("sse_new")
+                stream = response.body_iterator
+                first = asyncio.ensure_future(stream.__anext__())
+                while "sse_new" not in app_module.sse_queues:
+                    await asyncio.sleep(0)
+                assert list(app_module.sse_queues) == ["sse_new"]
+                first.cancel()
+            return old_queue.get_nowait()
+        
+        assert asyncio.run(subscribe()) == ("finished", b"")
+    
+    def test_completed_jobs_processed_on_shared_loop(self):
+        """Test that completion processing runs on one long-lived background loop."""
+        import threading
+        import time
+        app_module = sys.modules["api.app"]
+        threads = []
+        done = threading.Semaphore(0)
+        
+        async def record(job_id, data):
+            threads.append(threading.current_thread().name)
+            done.release()
+        
+        with patch.object(app_module, "process_completed_job", record):
+            with TestClient(app):
+                for job_id in ("loop_job_1", "loop_job_2"):
+                    app_module.handle_job_event(job_id, "finished", {"status": "completed"})
+                for _ in range(2):
+                    assert done.acquire(timeout=5)
+                job_loop = app.state.job_loop
+        
+        assert threads == ["job-events", "job-events"]
+        
+        # Shutdown stops the loop
+        for _ in range(100):
+            if not job_loop.is_running():
+                break
+            time.sleep(0.01)
+        assert not job_loop.is_running()
+
+
+class TestWebhookDelivery:
+    """Test webhook fan-out and retries."""
+    
+    @staticmethod
+    def _webhook(webhook_id):
+        from pipeline.report_schema import WebhookConfig
+        return WebhookConfig(id=webhook_id, url=f"https://example.com/{webhook_id}", events=["report.created"],
+                             secret=None, created_at="2024-01-01T00:00:00")
+    
+    def test_server_errors_retried(self):
+        """Test that a 5xx answer is retried until the endpoint accepts the delivery."""
+        import asyncio
+        import httpx
+        from api.app import send_webhook
+        
+        statuses = [503, 502, 204]
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(statuses[len(requests) - 1])
+        
+        async def deliver():
+            app.state.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            try:
+                await send_webhook(self._webhook("wh_retry"), {"job_id": "a"})
+            finally:
+                await app.state.http.aclose()
+        
+        with patch("api.app.WEBHOOK_BACKOFF_SEC", 0):
+            asyncio.run(deliver())
+        
+        assert len(requests) == 3
+    
+    def test_webhooks_delivered_concurrently(self):
+        """Test that all registered webhooks are sent at once rather than one after another."""
+        import asyncio
+        import httpx
+        from api.app import deliver_webhooks
+        
+        hooks = {webhook_id: self._webhook(webhook_id) for webhook_id in ("wh_a", "wh_b", "wh_c")}
+        urls = []
+        
+        async def deliver():
+            barrier = asyncio.Barrier(len(hooks))
+            
+            async def handler(request):
+                urls.append(str(request.url))
+                # Deadlocks (and times out) unless every delivery is in flight together
+                await asyncio.wait_for(barrier.wait(), timeout=5)
+                return httpx.Response(204)
+            
+            app.state.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            try:
+                await deliver_webhooks("hook_job_1", {"status": "completed"})
+            finally:
+                await app.state.http.aclose()
+        
+        orchestrator = Mock()
+        with patch.dict("api.app.webhooks", hooks, clear=True), patch("api.app.orchestrator", orchestrator), \
+                patch("api.app.WEBHOOK_BATCH_TIMEOUT_SEC", 0):
+            asyncio.run(deliver())
+        
+        assert sorted(urls) == [f"https://example.com/{webhook_id}" for webhook_id in sorted(hooks)]
+    
+    def test_payloads_batched_per_webhook(self):
+        """Test that payloads within the batch window go out as one deduplicated array POST."""
+        import asyncio
+        import httpx
+        from api.app import deliver_webhooks, webhook_batches
+        
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(204)
+        
+        async def deliver():
+            app.state.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            try:
+                for job_id in ("batch_job_1", "batch_job_2", "batch_job_1"):
+                    await deliver_webhooks(job_id, {"status": "completed"})
+                assert requests == []
+                await webhook_batches["wh_batch"].flush()
+            finally:
+                await app.state.http.aclose()
+        
+        hooks = {"wh_batch": self._webhook("wh_batch")}
+        with patch.dict("api.app.webhooks", hooks, clear=True), patch("api.app.orchestrator", Mock()), \
+                patch.dict("api.app.webhook_batches", clear=True), patch("api.app.WEBHOOK_BATCH_TIMEOUT_SEC", 60):
+            asyncio.run(deliver())
+        
+        assert len(requests) == 1
+        assert requests[0].headers["X-Batch"] == "1"
+        assert [payload["job_id"] for payload in json.loads(requests[0].content)] == ["batch_job_2", "batch_job_1"]
+    
+    def test_batch_sent_at_size_limit(self):
+        """Test that a batch is sent without waiting once it reaches the size limit."""
+        import asyncio
+        import httpx
+        from api.app import deliver_webhooks, webhook_batches
+        
+        requests = []
+        
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(204)
+        
+        async def deliver():
+            app.state.http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            try:
+                await deliver_webhooks("limit_job_1", {"status": "completed"})
+                await asyncio.gather(*webhook_batches["wh_limit"].sending)
+            finally:
+                await app.state.http.aclose()
+        
+        hooks = {"wh_limit": self._webhook("wh_limit")}
+        with patch.dict("api.app.webhooks", hooks, clear=True), patch("api.app.orchestrator", Mock()), \
+                patch.dict("api.app.webhook_batches", clear=True), patch("api.app.WEBHOOK_BATCH_TIMEOUT_SEC", 60), \
+                patch("api.app.WEBHOOK_BATCH_SIZE_LIMIT_BYTES", 1):
+            asyncio.run(deliver())
+        
+        assert len(requests) == 1
+        assert json.loads(requests[0].content)[0]["job_id"] == "limit_job_1"
+
+
 class TestCORSHeaders:
     """Test CORS configuration."""
     
@@ -293,6 +1032,16 @@ class TestErrorHandling:
         response = client.post("/health")
         
         assert response.status_code == 405
+    
+    def test_service_not_initialized(self, client):
+        """Test the standard error body when the orchestrator is missing."""
+        with patch("api.app.orchestrator", None):
+            for url in ("/analyze", "/analyze-async"):
+                response = client.post(url, data={"github_url": "https://github.com/org/repo"})
+                
+                assert response.status_code == 500
+                assert response.headers["content-type"] == "application/json"
+                assert response.json() == {"error": {"code": "INTERNAL", "message": "Service not initialized"}}
 
 
 class TestConfigValidation: